@@ -7,10 +7,15 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.http_cache import etag_matches, make_etag, not_modified, set_cache_headers
+from ..db.active_plan import fetch_active_plan_version
 from ..db.session import get_db_session
+from ..queue.task_plan_jobs import get_task_plan_job_queue
 from ..schemas.plan_summary import PlanSummary
 from ..services.llm_client import LlmClient, LlmClientError, get_llm_client
 from ..services.plan_summary_service import (
@@ -29,12 +34,27 @@ logger = logging.getLogger(__name__)
 )
 async def get_plan_summary(
     goal_id: str,
+    request: Request,
+    response: Response,
+    use_cache: bool = Query(True, description="Set false to bypass the LLM response cache."),
     db_session: AsyncSession = Depends(get_db_session),
     llm_client: LlmClient = Depends(get_llm_client),
-) -> PlanSummary:
-    service = PlanSummaryService(llm_client=llm_client, db_session=db_session)
+) -> Union[PlanSummary, Response]:
+    service = PlanSummaryService(
+        llm_client=llm_client,
+        db_session=db_session,
+        task_plan_jobs=get_task_plan_job_queue(),
+    )
     try:
-        return await service.get_or_generate_plan_summary(goal_id)
+        # A stored summary is versioned by its plan row, so a matching If-None-Match
+        # is answered without loading plan_json or building the response model.
+        etag = await _plan_summary_etag(db_session, goal_id)
+        if etag and etag_matches(request, etag):
+            return not_modified(etag)
+        summary = await service.get_or_generate_plan_summary(goal_id, use_cache=use_cache)
+        if etag is None:
+            # Freshly generated: tag the plan row that now backs it.
+            etag = await _plan_summary_etag(db_session, goal_id)
     except GoalNotFoundError as error:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -61,3 +81,12 @@ async def get_plan_summary(
                 "message": "plan summary failed",
             },
         ) from error
+    set_cache_headers(response, etag)
+    return summary
+
+
+async def _plan_summary_etag(db_session: AsyncSession, goal_id: str) -> Optional[str]:
+    plan = await fetch_active_plan_version(db_session, goal_id)
+    if not plan or not plan["has_payload"]:
+        return None
+    return make_etag(plan["id"], plan["version"], plan["updated_at"])
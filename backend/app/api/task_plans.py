@@ -5,19 +5,31 @@
 
 from __future__ import annotations
 
+import json
 import logging
+from typing import AsyncIterator, List, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db.session import get_db_session
-from ..schemas.plan_tasks import TaskPlanResult, TasksForDayResponse
+from ..core.http_cache import etag_matches, make_etag, not_modified, set_cache_headers
+from ..db.session import get_db_session, open_db_session
+from ..queue.task_plan_jobs import get_task_plan_job_queue
+from ..schemas.plan_tasks import (
+    GoalTasksBatchResponse,
+    TaskPlanJobStatus,
+    TaskPlanResult,
+    TasksForDayResponse,
+    TasksForRangeResponse,
+)
 from ..services.llm_client import LlmClient, LlmClientError, get_llm_client
 from ..services.plan_tasks_service import (
     ActivePlanNotFoundError,
     GoalTargetDateMissingError,
     PlanTasksService,
+    PreparedTaskPlan,
     TaskPlanValidationError,
 )
 
@@ -40,6 +52,12 @@ def get_plan_tasks_service(
 )
 async def generate_task_plan(
     goal_id: UUID,
+    use_cache: bool = Query(True, description="Set false to bypass the LLM response cache."),
+    from_day: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Regenerate only from this day_index on; earlier days and completed tasks are kept.",
+    ),
     service: PlanTasksService = Depends(get_plan_tasks_service),
 ) -> TaskPlanResult:
     """
@@ -49,11 +67,21 @@ async def generate_task_plan(
     - fetches goal + active summary,
     - constructs TaskPlanPrompt,
     - calls the LLM,
-    - updates ai_plans.plan_json,
+    - updates ai_plans.plan_json (metadata and day labels; tasks only when
+      PLAN_JSON_STORAGE=full),
     - replaces all rows in `tasks`.
+
+    With `from_day`, only days from_day..end are generated and only their pending
+    tasks and plan_json.days slice are rewritten.
     """
     try:
-        return await service.generate_task_plan_for_goal(str(goal_id))
+        if from_day is not None:
+            return await service.regenerate_task_plan_from_day(
+                str(goal_id),
+                from_day,
+                use_cache=use_cache,
+            )
+        return await service.generate_task_plan_for_goal(str(goal_id), use_cache=use_cache)
     except ActivePlanNotFoundError as error:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -84,19 +112,240 @@ async def generate_task_plan(
         ) from error
 
 
+@router.get(
+    "/{goal_id}/task_plan",
+    response_model=TaskPlanResult,
+    status_code=status.HTTP_200_OK,
+)
+async def get_task_plan(
+    goal_id: UUID,
+    service: PlanTasksService = Depends(get_plan_tasks_service),
+) -> TaskPlanResult:
+    """
+    Return the active plan's stored task plan without calling the LLM.
+
+    Tasks come from the `tasks` table and day labels from ai_plans.plan_json, so the
+    result reflects completions and partial regenerations.
+    """
+    try:
+        return await service.fetch_task_plan(str(goal_id))
+    except ActivePlanNotFoundError as error:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"detail": "plan_not_found", "message": str(error)},
+        ) from error
+    except HTTPException:
+        raise
+    except Exception as error:  # pragma: no cover - safety net
+        logger.exception("Unexpected failure while loading task plan for goal %s", goal_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"detail": "task_plan_fetch_failed", "message": "Could not load the task plan"},
+        ) from error
+
+
+@router.get(
+    "/{goal_id}/task_plan/status",
+    response_model=TaskPlanJobStatus,
+    status_code=status.HTTP_200_OK,
+)
+async def get_task_plan_status(
+    goal_id: UUID,
+    db_session: AsyncSession = Depends(get_db_session),
+) -> TaskPlanJobStatus:
+    """Report the state of the latest background task-plan job for the goal."""
+    task_plan_jobs = get_task_plan_job_queue()
+    if task_plan_jobs is None or not await task_plan_jobs.ready():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"detail": "jobs_disabled", "message": "Background task plans are disabled."},
+        )
+    job = await task_plan_jobs.latest_job(db_session, str(goal_id))
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"detail": "job_not_found", "message": "No task plan job for this goal."},
+        )
+    return TaskPlanJobStatus(
+        goal_id=str(job["goal_id"]),
+        job_id=str(job["id"]),
+        status=job["status"],
+        attempts=job.get("attempts") or 0,
+        error=job.get("error"),
+        created_at=job.get("created_at"),
+        started_at=job.get("started_at"),
+        finished_at=job.get("finished_at"),
+    )
+
+
+@router.post(
+    "/{goal_id}/task_plan/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def stream_task_plan(
+    goal_id: UUID,
+    service: PlanTasksService = Depends(get_plan_tasks_service),
+    llm_client: LlmClient = Depends(get_llm_client),
+) -> StreamingResponse:
+    """
+    Stream the daily tasks as NDJSON while the LLM is still generating.
+
+    Each line is one JSON object:
+    - {"type": "day", "day": TaskPlanDay} once that day's tasks are stored,
+    - {"type": "complete", "goal_id", "plan_id", "time_horizon_days"} at the end,
+    - {"type": "error", "detail", "message"} if generation fails mid-stream; days
+      already sent stay stored.
+    """
+    try:
+        prepared = await service.prepare_task_plan(str(goal_id))
+    except ActivePlanNotFoundError as error:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"detail": "plan_not_found", "message": str(error)},
+        ) from error
+    except GoalTargetDateMissingError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"detail": "missing_target_date", "message": str(error)},
+        ) from error
+    return StreamingResponse(
+        _stream_task_plan_lines(prepared, llm_client),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_task_plan_lines(
+    prepared: PreparedTaskPlan,
+    llm_client: LlmClient,
+) -> AsyncIterator[str]:
+    # The stream outlives the request-scoped session, so it owns its own.
+    async with open_db_session() as db_session:
+        service = PlanTasksService(llm_client=llm_client, db_session=db_session)
+        time_horizon_days = 0
+        try:
+            async for day in service.stream_task_plan(prepared):
+                time_horizon_days += 1
+                # Serialized straight from the model; no intermediate dict per day.
+                yield '{"type": "day", "day": ' + day.model_dump_json() + "}\n"
+        except TaskPlanValidationError as error:
+            yield _ndjson_line(
+                {"type": "error", "detail": "task_plan_invalid", "message": str(error)},
+            )
+            return
+        except LlmClientError as error:
+            yield _ndjson_line(
+                {"type": "error", "detail": "llm_error", "message": error.message},
+            )
+            return
+        except Exception:  # pragma: no cover - safety net
+            logger.exception(
+                "Unexpected failure while streaming task plan for goal %s",
+                prepared.prompt.goal_id,
+            )
+            yield _ndjson_line(
+                {
+                    "type": "error",
+                    "detail": "task_plan_failed",
+                    "message": "task plan generation failed",
+                },
+            )
+            return
+        yield _ndjson_line(
+            {
+                "type": "complete",
+                "goal_id": prepared.prompt.goal_id,
+                "plan_id": prepared.prompt.plan_id,
+                "time_horizon_days": time_horizon_days,
+            },
+        )
+
+
+def _ndjson_line(payload: dict) -> str:
+    return json.dumps(payload) + "\n"
+
+
+MAX_BATCH_GOALS = 50
+
+
+@router.get(
+    "/tasks",
+    response_model=GoalTasksBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_tasks_for_goals(
+    goal_ids: List[UUID] = Query(..., alias="goal_id", min_length=1),
+    from_day: int = Query(..., alias="from", ge=0),
+    to_day: int = Query(..., alias="to", ge=0),
+    service: PlanTasksService = Depends(get_plan_tasks_service),
+) -> GoalTasksBatchResponse:
+    """Expose tasks for a day range across several goals (e.g. a week view)."""
+    requested = list(dict.fromkeys(str(goal_id) for goal_id in goal_ids))
+    if len(requested) > MAX_BATCH_GOALS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "detail": "too_many_goals",
+                "message": f"At most {MAX_BATCH_GOALS} goals per request.",
+            },
+        )
+    try:
+        goals = await service.fetch_tasks_for_goals(requested, from_day, to_day)
+    except TaskPlanValidationError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"detail": "task_plan_invalid", "message": str(error)},
+        ) from error
+    except Exception as error:  # pragma: no cover - safety net
+        logger.exception("Unexpected failure while fetching tasks for %s goals", len(requested))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "detail": "tasks_fetch_failed",
+                "message": "Could not load tasks for these goals",
+            },
+        ) from error
+    found = {response.goal_id for response in goals}
+    return GoalTasksBatchResponse(
+        goals=goals,
+        missing_goal_ids=[goal_id for goal_id in requested if goal_id not in found],
+    )
+
+
 @router.get(
     "/{goal_id}/tasks",
-    response_model=TasksForDayResponse,
+    response_model=Union[TasksForDayResponse, TasksForRangeResponse],
     status_code=status.HTTP_200_OK,
 )
 async def get_tasks_for_day(
     goal_id: UUID,
-    day_index: int = Query(..., ge=0),
+    request: Request,
+    response: Response,
+    day_index: Optional[int] = Query(None, ge=0),
+    from_day: Optional[int] = Query(None, alias="from", ge=0),
+    to_day: Optional[int] = Query(None, alias="to", ge=0),
     service: PlanTasksService = Depends(get_plan_tasks_service),
-) -> TasksForDayResponse:
-    """Expose generated tasks for the selected day."""
+) -> Union[TasksForDayResponse, TasksForRangeResponse, Response]:
+    """
+    Expose generated tasks for the selected day.
+
+    Pass `from`/`to` instead of `day_index` to load a whole range of days in one
+    request; the response then groups tasks per day. Both forms carry an ETag
+    over the returned rows and honour If-None-Match.
+    """
     try:
-        return await service.fetch_tasks_for_day(str(goal_id), day_index)
+        if day_index is not None:
+            payload = await service.load_tasks_for_day(str(goal_id), day_index)
+            response_model = TasksForDayResponse
+        elif from_day is not None:
+            payload = await service.load_tasks_for_range(
+                str(goal_id),
+                from_day,
+                to_day if to_day is not None else from_day,
+            )
+            response_model = TasksForRangeResponse
+        else:
+            raise TaskPlanValidationError("Provide day_index or from/to.")
     except ActivePlanNotFoundError as error:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -111,9 +360,11 @@ async def get_tasks_for_day(
         raise
     except Exception as error:  # pragma: no cover - safety net
         logger.exception(
-            "Unexpected failure while fetching tasks for goal %s day_index=%s",
+            "Unexpected failure while fetching tasks for goal %s day_index=%s from=%s to=%s",
             goal_id,
             day_index,
+            from_day,
+            to_day,
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -122,3 +373,9 @@ async def get_tasks_for_day(
                 "message": "Could not load tasks for this day",
             },
         ) from error
+    # The payload is exactly what gets serialized, so its hash is a strong validator.
+    etag = make_etag(payload)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+    return response_model(**payload)
@@ -0,0 +1,320 @@
+# backend/app/cli/regenerate_plans.py
+# Command-line backfill that regenerates task plans (or whole plans) for goals matching a filter.
+# Exists so a DEEPSEEK_MODEL or prompt change can be rolled out to existing goals in one run.
+# RELEVANT FILES:backend/app/services/plan_tasks_service.py,backend/app/services/plan_summary_service.py,backend/app/services/llm_scheduler.py
+
+"""
+Examples (run from backend/):
+
+    python -m app.cli.regenerate_plans --model-name deepseek-chat --dry-run
+    python -m app.cli.regenerate_plans --updated-before 2026-09-01 --concurrency 8 \\
+        --tokens-per-minute 400000 --checkpoint regen.jsonl
+    python -m app.cli.regenerate_plans --what all --goal-id <uuid> --goal-id <uuid>
+    python -m app.cli.regenerate_plans --what summaries --model-name deepseek-chat
+
+Rerunning with the same --checkpoint skips goals already regenerated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import text
+
+from ..db.session import open_db_session
+from ..services.llm_client import get_llm_client
+from ..services.plan_summary_service import PlanSummaryService
+from ..services.plan_tasks_service import PlanTasksService
+
+logger = logging.getLogger("regenerate_plans")
+
+WHAT_TASKS = "tasks"
+WHAT_SUMMARIES = "summaries"
+WHAT_ALL = "all"
+STAGE_SUMMARY = "summary"
+STAGE_TASKS = "tasks"
+SELECT_PAGE_SIZE = 1000
+
+
+class GoalRegenerationError(Exception):
+    """A goal failed; `stage` says whether the summary or its task plan broke."""
+
+    def __init__(self, stage: str, error: Exception) -> None:
+        super().__init__(f"{stage}: {error}")
+        self.stage = stage
+
+
+@dataclass
+class Progress:
+    total: int
+    started_at: float = field(default_factory=time.monotonic)
+    succeeded: int = 0
+    failed: int = 0
+
+    @property
+    def done(self) -> int:
+        return self.succeeded + self.failed
+
+    def line(self, llm_stats: Dict[str, Any]) -> str:
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        rate = self.done / elapsed * 60
+        remaining = self.total - self.done
+        eta = f"{remaining / (self.done / elapsed) / 60:.1f} min" if self.done else "?"
+        return (
+            f"{self.done}/{self.total} done ({self.succeeded} ok, {self.failed} failed), "
+            f"{rate:.1f} goals/min, ETA {eta}; "
+            f"llm active={llm_stats.get('active')}/{llm_stats.get('max_concurrency')} "
+            f"tokens_available={llm_stats.get('tokens_available')}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Regenerate task plans (or summaries + task plans) for many goals.",
+    )
+    parser.add_argument(
+        "--what",
+        choices=[WHAT_TASKS, WHAT_SUMMARIES, WHAT_ALL],
+        default=WHAT_TASKS,
+        help="'tasks' rewrites the active plan's tasks; 'summaries' writes a new plan "
+        "version (summary) without tasks; 'all' writes a new plan version and its tasks.",
+    )
+    parser.add_argument("--goal-id", action="append", default=[], help="Repeatable.")
+    parser.add_argument("--model-name", help="Active plan was generated by this model.")
+    parser.add_argument("--min-version", type=int)
+    parser.add_argument("--max-version", type=int)
+    parser.add_argument("--updated-before", type=datetime.fromisoformat, help="ISO date/time.")
+    parser.add_argument("--updated-after", type=datetime.fromisoformat, help="ISO date/time.")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--concurrency", type=int, default=4, help="Goals processed at once.")
+    parser.add_argument(
+        "--tokens-per-minute",
+        type=int,
+        help="Global LLM token budget for this run (overrides LLM_TOKENS_PER_MINUTE).",
+    )
+    parser.add_argument(
+        "--max-llm-concurrency",
+        type=int,
+        help="Concurrent DeepSeek calls (overrides LLM_MAX_CONCURRENCY).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache.")
+    parser.add_argument("--checkpoint", type=Path, help="JSON-lines log used to resume.")
+    parser.add_argument("--progress-seconds", type=float, default=15.0)
+    parser.add_argument("--dry-run", action="store_true", help="Only list the selected goals.")
+    return parser.parse_args(argv)
+
+
+def apply_overrides(args: argparse.Namespace) -> None:
+    """Settings are read from the environment once, so overrides go in before first use."""
+    if args.tokens_per_minute is not None:
+        os.environ["LLM_TOKENS_PER_MINUTE"] = str(args.tokens_per_minute)
+    if args.max_llm_concurrency is not None:
+        os.environ["LLM_MAX_CONCURRENCY"] = str(args.max_llm_concurrency)
+    # Generation runs inline here; this process must not start queue workers.
+    os.environ["TASK_PLAN_JOB_WORKERS"] = "0"
+
+
+async def select_goals(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Goals with an active plan that match every given filter, in id order."""
+    conditions = ["TRUE"]
+    params: Dict[str, Any] = {}
+    if args.goal_id:
+        conditions.append("g.id = ANY(CAST(:goal_ids AS uuid[]))")
+        params["goal_ids"] = args.goal_id
+    if args.model_name:
+        conditions.append("ap.model_name = :model_name")
+        params["model_name"] = args.model_name
+    if args.min_version is not None:
+        conditions.append("ap.version >= :min_version")
+        params["min_version"] = args.min_version
+    if args.max_version is not None:
+        conditions.append("ap.version <= :max_version")
+        params["max_version"] = args.max_version
+    if args.updated_before is not None:
+        conditions.append("ap.updated_at < :updated_before")
+        params["updated_before"] = args.updated_before
+    if args.updated_after is not None:
+        conditions.append("ap.updated_at >= :updated_after")
+        params["updated_after"] = args.updated_after
+    query = text(
+        f"""
+        SELECT g.id AS goal_id, ap.id AS plan_id, ap.model_name, ap.version, ap.updated_at
+        FROM goals g
+        JOIN LATERAL (
+            SELECT id, model_name, version, updated_at
+            FROM ai_plans
+            WHERE goal_id = g.id
+            ORDER BY (id = g.current_plan_id) IS TRUE DESC,
+                     is_active DESC,
+                     version DESC,
+                     created_at DESC
+            LIMIT 1
+        ) ap ON true
+        WHERE {" AND ".join(conditions)}
+          AND g.id > CAST(:after_id AS uuid)
+        ORDER BY g.id
+        LIMIT :page_size
+        """,
+    )
+    goals: List[Dict[str, Any]] = []
+    after_id = "00000000-0000-0000-0000-000000000000"
+    async with open_db_session() as db_session:
+        while args.limit is None or len(goals) < args.limit:
+            result = await db_session.execute(
+                query,
+                {**params, "after_id": after_id, "page_size": SELECT_PAGE_SIZE},
+            )
+            page = [dict(row) for row in result.mappings()]
+            goals.extend(page)
+            if len(page) < SELECT_PAGE_SIZE:
+                break
+            after_id = str(page[-1]["goal_id"])
+    return goals[: args.limit] if args.limit is not None else goals
+
+
+def load_checkpoint(path: Optional[Path]) -> Set[str]:
+    """Goal ids already regenerated successfully by an earlier run."""
+    if path is None or not path.exists():
+        return set()
+    done: Set[str] = set()
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            if entry.get("status") == "ok":
+                done.add(entry["goal_id"])
+    return done
+
+
+async def regenerate_goal(goal_id: str, what: str, use_cache: bool) -> None:
+    """Runs each stage directly so a task-plan failure fails the goal instead of being logged."""
+    llm_client = get_llm_client()
+    async with open_db_session() as db_session:
+        if what in (WHAT_SUMMARIES, WHAT_ALL):
+            service = PlanSummaryService(llm_client=llm_client, db_session=db_session)
+            try:
+                await service.regenerate_plan_summary(
+                    goal_id,
+                    use_cache=use_cache,
+                    generate_tasks=False,
+                )
+            except Exception as error:
+                raise GoalRegenerationError(STAGE_SUMMARY, error) from error
+        if what in (WHAT_TASKS, WHAT_ALL):
+            tasks_service = PlanTasksService(llm_client=llm_client, db_session=db_session)
+            try:
+                await tasks_service.generate_task_plan_for_goal(goal_id, use_cache=use_cache)
+            except Exception as error:
+                raise GoalRegenerationError(STAGE_TASKS, error) from error
+
+
+async def run(args: argparse.Namespace) -> int:
+    goals = await select_goals(args)
+    already_done = load_checkpoint(args.checkpoint)
+    pending = [goal for goal in goals if str(goal["goal_id"]) not in already_done]
+    logger.info(
+        "Selected %s goals (%s already done per checkpoint, %s to regenerate: %s)",
+        len(goals),
+        len(goals) - len(pending),
+        len(pending),
+        args.what,
+    )
+    if args.dry_run:
+        for goal in pending[:20]:
+            logger.info(
+                "  goal %s plan %s model=%s version=%s updated_at=%s",
+                goal["goal_id"],
+                goal["plan_id"],
+                goal["model_name"],
+                goal["version"],
+                goal["updated_at"],
+            )
+        if len(pending) > 20:
+            logger.info("  ... and %s more", len(pending) - 20)
+        return 0
+    if not pending:
+        return 0
+
+    llm_client = get_llm_client()
+    llm_client.open()
+    progress = Progress(total=len(pending))
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for goal in pending:
+        queue.put_nowait(str(goal["goal_id"]))
+    checkpoint = args.checkpoint.open("a", encoding="utf-8") if args.checkpoint else None
+
+    def record(
+        goal_id: str,
+        status: str,
+        seconds: float,
+        error: Optional[Exception] = None,
+    ) -> None:
+        if checkpoint is None:
+            return
+        entry = {"goal_id": goal_id, "status": status, "seconds": round(seconds, 3)}
+        if error:
+            if isinstance(error, GoalRegenerationError):
+                entry["stage"] = error.stage
+            entry["error"] = str(error)
+        checkpoint.write(json.dumps(entry) + "\n")
+        checkpoint.flush()
+
+    async def worker() -> None:
+        while True:
+            try:
+                goal_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.monotonic()
+            try:
+                await regenerate_goal(goal_id, args.what, use_cache=not args.no_cache)
+            except Exception as error:
+                progress.failed += 1
+                logger.warning("Goal %s failed: %s", goal_id, error)
+                record(goal_id, "failed", time.monotonic() - started, error)
+            else:
+                progress.succeeded += 1
+                record(goal_id, "ok", time.monotonic() - started)
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(args.progress_seconds)
+            logger.info(progress.line(llm_client.scheduler_stats()))
+
+    reporter = asyncio.create_task(report())
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(args.concurrency, 1))))
+    finally:
+        reporter.cancel()
+        if checkpoint is not None:
+            checkpoint.close()
+        await llm_client.aclose()
+    logger.info("Finished: %s", progress.line(llm_client.scheduler_stats()))
+    logger.info("LLM token usage: %s", json.dumps(llm_client.usage_stats()))
+    return 1 if progress.failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args(argv)
+    apply_overrides(args)
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; rerun with the same --checkpoint to resume.")
+        return 130
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
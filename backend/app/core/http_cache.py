@@ -0,0 +1,49 @@
+# backend/app/core/http_cache.py
+# ETag and conditional-GET helpers shared by the read endpoints.
+# Exists so polling clients get a bodyless 304 when nothing changed.
+# RELEVANT FILES:backend/app/api/plans.py,backend/app/api/task_plans.py,backend/app/db/active_plan.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Clients may keep a copy but must revalidate it (cheaply, via If-None-Match) on every use.
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the JSON form of `parts` (datetimes/UUIDs via str)."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/"x" matches "x" (RFC 9110 13.1.2)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def set_cache_headers(response: Response, etag: Optional[str]) -> None:
+    response.headers["Cache-Control"] = CACHE_CONTROL_REVALIDATE
+    if etag:
+        response.headers["ETag"] = etag
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag)
+    return response
@@ -0,0 +1,257 @@
+# backend/app/core/metrics.py
+# Prometheus metrics (stage timings, LLM calls and queueing, DB queries, caches, in-flight work) and /metrics rendering.
+# Exists so we can see where time goes per request without attaching a profiler.
+# RELEVANT FILES:backend/app/main.py,backend/app/db/session.py,backend/app/services/llm_client.py,backend/app/services/plan_summary_service.py
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+try:  # Optional: without prometheus_client every metric below is a no-op.
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+    )
+except ImportError:  # pragma: no cover - depends on the deployment image
+    CONTENT_TYPE_LATEST = "text/plain; charset=utf-8"
+    Counter = Gauge = Histogram = None  # type: ignore[assignment,misc]
+    generate_latest = None  # type: ignore[assignment]
+
+# Stages range from sub-millisecond parsing to multi-minute windowed generations.
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+COUNT_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+
+class _NullMetric:
+    """Stands in for a metric (or a labelled child) when prometheus_client is missing."""
+
+    def labels(self, *_: Any, **__: Any) -> "_NullMetric":
+        return self
+
+    def observe(self, *_: Any) -> None:
+        pass
+
+    def inc(self, *_: Any) -> None:
+        pass
+
+    def dec(self, *_: Any) -> None:
+        pass
+
+    def set(self, *_: Any) -> None:
+        pass
+
+
+def metrics_available() -> bool:
+    return generate_latest is not None
+
+
+def _histogram(name: str, documentation: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]) -> Any:
+    if Histogram is None:
+        return _NullMetric()
+    return Histogram(name, documentation, labels, buckets=buckets)
+
+
+def _counter(name: str, documentation: str, labels: Tuple[str, ...]) -> Any:
+    if Counter is None:
+        return _NullMetric()
+    return Counter(name, documentation, labels)
+
+
+def _gauge(name: str, documentation: str, labels: Tuple[str, ...]) -> Any:
+    if Gauge is None:
+        return _NullMetric()
+    return Gauge(name, documentation, labels)
+
+
+STAGE_SECONDS = _histogram(
+    "treespora_stage_seconds",
+    "Time spent in one stage of a service call.",
+    ("service", "stage"),
+    STAGE_BUCKETS,
+)
+LLM_REQUEST_SECONDS = _histogram(
+    "treespora_llm_request_seconds",
+    "Chat completion latency per call type, retries and hedges included.",
+    ("kind", "outcome"),
+    STAGE_BUCKETS,
+)
+LLM_TOKENS = _histogram(
+    "treespora_llm_tokens",
+    "Tokens reported by the provider per chat completion; prompt_cache_hit/miss split the prompt.",
+    ("kind", "direction"),
+    TOKEN_BUCKETS,
+)
+LLM_SCHEDULER_QUEUE_SECONDS = _histogram(
+    "treespora_llm_scheduler_queue_seconds",
+    "Time an LLM call waited in the scheduler before being granted a slot.",
+    ("priority",),
+    STAGE_BUCKETS,
+)
+LLM_SCHEDULER_QUEUED = _gauge(
+    "treespora_llm_scheduler_queued",
+    "LLM calls currently waiting in the scheduler for a slot.",
+    ("priority",),
+)
+LLM_TRUNCATIONS = _counter(
+    "treespora_llm_truncations_total",
+    "Completions that were cut off before the JSON closed.",
+    ("kind",),
+)
+DB_QUERY_SECONDS = _histogram(
+    "treespora_db_query_seconds",
+    "Latency of individual SQL statements.",
+    (),
+    DB_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = _histogram(
+    "treespora_db_queries_per_request",
+    "SQL statements issued through one request-scoped session.",
+    (),
+    COUNT_BUCKETS,
+)
+DB_SECONDS_PER_REQUEST = _histogram(
+    "treespora_db_seconds_per_request",
+    "Total SQL time of one request-scoped session.",
+    (),
+    STAGE_BUCKETS,
+)
+CACHE_LOOKUPS = _counter(
+    "treespora_cache_lookups_total",
+    "Cache lookups by cache and result (hit/miss); ratio = hit / total.",
+    ("cache", "result"),
+)
+DB_POOL_CONNECTIONS = _gauge(
+    "treespora_db_pool_connections",
+    "Pooled DB connections by state (checked_out, checked_in, overflow); read at scrape time.",
+    ("state",),
+)
+DB_CONNECTIONS_OPENED = _counter(
+    "treespora_db_connections_opened_total",
+    "New DB connections established by the pool (churn shows up here).",
+    (),
+)
+IN_FLIGHT = _gauge(
+    "treespora_in_flight",
+    "Operations currently running (LLM calls, generations, requests holding a DB session).",
+    ("operation",),
+)
+
+# [statements, seconds] for the request-scoped session currently running, if any.
+_db_request_usage: ContextVar[Optional[List[float]]] = ContextVar("db_request_usage", default=None)
+
+
+@contextmanager
+def stage_timer(service: str, stage: str) -> Iterator[None]:
+    """Times the block into treespora_stage_seconds{service,stage}, even when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(service, stage).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def track_in_flight(operation: str) -> Iterator[None]:
+    gauge = IN_FLIGHT.labels(operation)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_llm_usage(kind: str, tokens: Dict[str, int]) -> None:
+    """`tokens` maps a direction (prompt, completion, prompt_cache_hit, ...) to a count."""
+    for direction, count in tokens.items():
+        LLM_TOKENS.labels(kind, direction).observe(count)
+
+
+@contextmanager
+def track_llm_queued(priority: str) -> Iterator[None]:
+    """Counts the block as one call waiting in treespora_llm_scheduler_queued{priority}."""
+    gauge = LLM_SCHEDULER_QUEUED.labels(priority)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def record_llm_queue_wait(priority: str, seconds: float) -> None:
+    LLM_SCHEDULER_QUEUE_SECONDS.labels(priority).observe(seconds)
+
+
+@contextmanager
+def track_db_request() -> Iterator[None]:
+    """Attributes every statement run inside the block to one request."""
+    usage: List[float] = [0, 0.0]
+    token = _db_request_usage.set(usage)
+    try:
+        with track_in_flight("db_session"):
+            yield
+    finally:
+        _db_request_usage.reset(token)
+        DB_QUERIES_PER_REQUEST.observe(usage[0])
+        DB_SECONDS_PER_REQUEST.observe(usage[1])
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Times each statement; the cost is two perf_counter calls per execute."""
+    if not metrics_available():
+        return
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn: Any, *_: Any) -> None:
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn: Any, *_: Any) -> None:
+        elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+        DB_QUERY_SECONDS.observe(elapsed)
+        usage = _db_request_usage.get()
+        if usage is not None:
+            usage[0] += 1
+            usage[1] += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context: Any) -> None:
+        # after_cursor_execute never fires for a failed statement; drop its start time.
+        conn = context.connection
+        starts = conn.info.get("metrics_query_start") if conn is not None else None
+        if starts:
+            starts.pop()
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Exposes queue-pool occupancy; a NullPool only reports connections opened."""
+    if not metrics_available():
+        return
+    pool = engine.sync_engine.pool
+    event.listen(pool, "connect", lambda *_: DB_CONNECTIONS_OPENED.inc())
+    if not hasattr(pool, "checkedout"):
+        return
+    DB_POOL_CONNECTIONS.labels("checked_out").set_function(pool.checkedout)
+    DB_POOL_CONNECTIONS.labels("checked_in").set_function(pool.checkedin)
+    DB_POOL_CONNECTIONS.labels("overflow").set_function(lambda: max(pool.overflow(), 0))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    if generate_latest is None:
+        return b"# prometheus_client is not installed\n", CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Optional
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -19,6 +20,97 @@ class Settings(BaseSettings):
     deepseek_api_key: str = Field(..., alias="DEEPSEEK_API_KEY")
     deepseek_model: str = Field(..., alias="DEEPSEEK_MODEL")
 
+    # Shared connection pool used by LlmClient for every DeepSeek call.
+    llm_max_connections: int = Field(20, alias="LLM_MAX_CONNECTIONS")
+    llm_max_keepalive_connections: int = Field(10, alias="LLM_MAX_KEEPALIVE_CONNECTIONS")
+    llm_keepalive_expiry_seconds: float = Field(30.0, alias="LLM_KEEPALIVE_EXPIRY_SECONDS")
+    llm_http2: bool = Field(False, alias="LLM_HTTP2")
+
+    # Content-addressed cache of validated LLM results: "memory", "postgres" or "none".
+    llm_cache_backend: str = Field("memory", alias="LLM_CACHE_BACKEND")
+    llm_cache_max_entries: int = Field(512, alias="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_ttl_seconds: float = Field(86400.0, alias="LLM_CACHE_TTL_SECONDS")
+
+    # Generation parameters sent with every chat completion. Task-plan output is
+    # budgeted per day so windows stay bounded; DeepSeek caps output at 8K tokens.
+    llm_json_mode: bool = Field(True, alias="LLM_JSON_MODE")
+    llm_max_output_tokens: int = Field(8192, alias="LLM_MAX_OUTPUT_TOKENS")
+    llm_summary_max_tokens: int = Field(1200, alias="LLM_SUMMARY_MAX_TOKENS")
+    llm_summary_temperature: Optional[float] = Field(0.7, alias="LLM_SUMMARY_TEMPERATURE")
+    llm_task_plan_temperature: Optional[float] = Field(0.3, alias="LLM_TASK_PLAN_TEMPERATURE")
+    llm_task_plan_base_tokens: int = Field(300, alias="LLM_TASK_PLAN_BASE_TOKENS")
+    llm_task_plan_tokens_per_day: int = Field(180, alias="LLM_TASK_PLAN_TOKENS_PER_DAY")
+
+    # Resilience around DeepSeek calls: retries with jittered backoff (Retry-After wins),
+    # optional hedging past the observed p95, and a breaker that fails fast.
+    llm_max_retries: int = Field(2, alias="LLM_MAX_RETRIES")
+    llm_retry_base_delay_seconds: float = Field(0.5, alias="LLM_RETRY_BASE_DELAY_SECONDS")
+    llm_retry_max_delay_seconds: float = Field(10.0, alias="LLM_RETRY_MAX_DELAY_SECONDS")
+    llm_hedge_enabled: bool = Field(False, alias="LLM_HEDGE_ENABLED")
+    llm_hedge_min_samples: int = Field(20, alias="LLM_HEDGE_MIN_SAMPLES")
+    llm_breaker_failure_threshold: int = Field(5, alias="LLM_BREAKER_FAILURE_THRESHOLD")
+    llm_breaker_reset_seconds: float = Field(30.0, alias="LLM_BREAKER_RESET_SECONDS")
+
+    # Per-process admission control; interactive summaries jump ahead of task plans.
+    # LLM_TOKENS_PER_MINUTE=0 disables the token budget.
+    llm_max_concurrency: int = Field(8, alias="LLM_MAX_CONCURRENCY")
+    llm_tokens_per_minute: int = Field(0, alias="LLM_TOKENS_PER_MINUTE")
+
+    # Offline stand-in for DeepSeek (app.services.fake_llm_transport), for local runs
+    # and benchmarks. Never enable in production.
+    llm_fake: bool = Field(False, alias="LLM_FAKE")
+    llm_fake_latency_seconds: float = Field(0.0, alias="LLM_FAKE_LATENCY_SECONDS")
+    llm_fake_latency_jitter_seconds: float = Field(0.0, alias="LLM_FAKE_LATENCY_JITTER_SECONDS")
+    llm_fake_stream_chars_per_second: float = Field(0.0, alias="LLM_FAKE_STREAM_CHARS_PER_SECOND")
+    llm_fake_truncate_rate: float = Field(0.0, alias="LLM_FAKE_TRUNCATE_RATE")
+    llm_fake_error_rate: float = Field(0.0, alias="LLM_FAKE_ERROR_RATE")
+    llm_fake_seed: int = Field(0, alias="LLM_FAKE_SEED")
+
+    # What ai_plans.plan_json keeps of a generated task plan. "metadata" stores the
+    # plan-level fields and each day's label/focus, leaving tasks to the tasks table;
+    # "full" also embeds every day's tasks for consumers that still read them there.
+    plan_json_storage: str = Field("metadata", alias="PLAN_JSON_STORAGE")
+
+    # Long horizons are split into windows generated concurrently.
+    task_plan_window_days: int = Field(14, alias="TASK_PLAN_WINDOW_DAYS")
+    task_plan_window_concurrency: int = Field(4, alias="TASK_PLAN_WINDOW_CONCURRENCY")
+    task_plan_window_retries: int = Field(1, alias="TASK_PLAN_WINDOW_RETRIES")
+
+    # Background task-plan jobs; set TASK_PLAN_JOB_WORKERS=0 to leave them to
+    # `python -m app.queue.task_plan_jobs`.
+    task_plan_jobs_enabled: bool = Field(True, alias="TASK_PLAN_JOBS_ENABLED")
+    task_plan_job_workers: int = Field(2, alias="TASK_PLAN_JOB_WORKERS")
+    task_plan_job_poll_seconds: float = Field(5.0, alias="TASK_PLAN_JOB_POLL_SECONDS")
+    task_plan_job_max_attempts: int = Field(3, alias="TASK_PLAN_JOB_MAX_ATTEMPTS")
+    task_plan_job_stale_seconds: float = Field(900.0, alias="TASK_PLAN_JOB_STALE_SECONDS")
+    task_plan_job_retry_delay_seconds: float = Field(30.0, alias="TASK_PLAN_JOB_RETRY_DELAY_SECONDS")
+
+    # goal_id -> active plan id, so hot task reads skip the ai_plans lookup.
+    active_plan_cache_ttl_seconds: float = Field(60.0, alias="ACTIVE_PLAN_CACHE_TTL_SECONDS")
+    active_plan_cache_max_entries: int = Field(4096, alias="ACTIVE_PLAN_CACHE_MAX_ENTRIES")
+
+    # SQLAlchemy async engine pool. DB_POOL_MODE=null opens a connection per checkout,
+    # for when PgBouncer in transaction mode already pools server connections.
+    # DB_PGBOUNCER keeps asyncpg from caching prepared statements across backends.
+    # Pre-ping costs a round trip per checkout; recycling usually suffices.
+    db_pool_mode: str = Field("queue", alias="DB_POOL_MODE")
+    db_pool_size: int = Field(10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(10.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_recycle_seconds: int = Field(1800, alias="DB_POOL_RECYCLE_SECONDS")
+    db_pool_pre_ping: bool = Field(False, alias="DB_POOL_PRE_PING")
+    db_pool_warmup_connections: int = Field(2, alias="DB_POOL_WARMUP_CONNECTIONS")
+    db_connect_timeout_seconds: float = Field(10.0, alias="DB_CONNECT_TIMEOUT_SECONDS")
+    db_command_timeout_seconds: Optional[float] = Field(60.0, alias="DB_COMMAND_TIMEOUT_SECONDS")
+    db_pgbouncer: bool = Field(True, alias="DB_PGBOUNCER")
+
+    # OpenTelemetry export: "none", "console", "file" (JSON lines) or "otlp".
+    tracing_exporter: str = Field("none", alias="TRACING_EXPORTER")
+    tracing_file_path: str = Field("traces.jsonl", alias="TRACING_FILE_PATH")
+    tracing_otlp_endpoint: Optional[str] = Field(None, alias="TRACING_OTLP_ENDPOINT")
+    tracing_sample_ratio: float = Field(1.0, alias="TRACING_SAMPLE_RATIO")
+    tracing_service_name: str = Field("treespora-backend", alias="TRACING_SERVICE_NAME")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,173 @@
+# backend/app/core/tracing.py
+# OpenTelemetry setup: route spans, one span per SQL statement and spans around every LLM call.
+# Exists so a slow request can be attributed to the specific query or DeepSeek attempt behind it.
+# RELEVANT FILES:backend/app/main.py,backend/app/db/session.py,backend/app/services/llm_client.py,backend/app/core/settings.py
+
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .settings import Settings
+
+try:  # Optional: without opentelemetry-api every span below is a no-op.
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover - depends on the deployment image
+    trace = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = "treespora.backend"
+# Health checks and scrapes would drown out the requests worth looking at.
+EXCLUDED_URLS = "health,metrics"
+# Bulk unnest inserts carry long statements; the head is enough to identify them.
+MAX_STATEMENT_CHARS = 2000
+
+_tracing_enabled = False
+
+
+class _NullSpan:
+    def set_attribute(self, *_: Any) -> None:
+        pass
+
+    def set_attributes(self, *_: Any) -> None:
+        pass
+
+    def record_exception(self, *_: Any, **__: Any) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+def tracing_enabled() -> bool:
+    return _tracing_enabled
+
+
+def configure_tracing(app: FastAPI, settings: Settings) -> None:
+    """Installs the tracer provider and instruments FastAPI; TRACING_EXPORTER=none skips it."""
+    global _tracing_enabled
+    exporter_name = settings.tracing_exporter.strip().lower()
+    if exporter_name in {"", "none"}:
+        return
+    try:
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("TRACING_EXPORTER=%s but opentelemetry-sdk is missing; tracing is off.", exporter_name)
+        return
+    exporter = _build_exporter(exporter_name, settings)
+    if exporter is None:
+        return
+
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracing_enabled = True
+
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    except ImportError:
+        logger.warning("opentelemetry-instrumentation-fastapi is missing; no route spans.")
+    else:
+        FastAPIInstrumentor.instrument_app(app, excluded_urls=EXCLUDED_URLS)
+
+
+def _build_exporter(exporter_name: str, settings: Settings) -> Optional[Any]:
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if exporter_name == "console":
+        return ConsoleSpanExporter()
+    if exporter_name == "file":
+        # One JSON span per line so traces can be grepped or loaded with jq.
+        output = open(settings.tracing_file_path, "a", encoding="utf-8")
+        return ConsoleSpanExporter(
+            out=output,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    if exporter_name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("TRACING_EXPORTER=otlp needs opentelemetry-exporter-otlp-proto-http.")
+            return None
+        # Endpoint falls back to OTEL_EXPORTER_OTLP_ENDPOINT / the collector default.
+        if settings.tracing_otlp_endpoint:
+            return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+        return OTLPSpanExporter()
+    logger.warning("Unknown TRACING_EXPORTER=%s; tracing is off.", exporter_name)
+    return None
+
+
+def trace_engine(engine: AsyncEngine) -> None:
+    """Adds a span (with db.statement) for every SQL statement run through the engine.
+
+    Hooked on engine events rather than opentelemetry-instrumentation-sqlalchemy,
+    which refuses SQLAlchemy 2.1; the parent is whatever span is current.
+    """
+    if not _tracing_enabled:
+        return
+    sync_engine = engine.sync_engine
+    tracer = trace.get_tracer(TRACER_NAME)
+    database = sync_engine.url.database or ""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn: Any, _cursor: Any, statement: str, *_: Any) -> None:
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        span = tracer.start_span(
+            f"{operation} {database}".strip(),
+            kind=trace.SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.name": database,
+                "db.operation": operation,
+                "db.statement": statement[:MAX_STATEMENT_CHARS],
+            },
+        )
+        conn.info.setdefault("tracing_spans", []).append(span)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn: Any, *_: Any) -> None:
+        spans = conn.info.get("tracing_spans")
+        if spans:
+            spans.pop().end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context: Any) -> None:
+        conn = context.connection
+        spans = conn.info.get("tracing_spans") if conn is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(context.original_exception)
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+            span.end()
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Child span of whatever is current; exceptions are recorded on it."""
+    if not _tracing_enabled:
+        yield _NullSpan()
+        return
+    with trace.get_tracer(TRACER_NAME).start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+def start_detached_span(name: str, **attributes: Any) -> Any:
+    """For async generators: the caller ends it, and it never becomes the current span.
+
+    Attaching context inside a generator breaks once iteration hops between tasks.
+    """
+    if not _tracing_enabled:
+        return _NullSpan()
+    return trace.get_tracer(TRACER_NAME).start_span(name, attributes=attributes)
@@ -0,0 +1,100 @@
+# backend/app/db/active_plan.py
+# Resolves a goal's active ai_plans.id (or its version) without loading plan_json.
+# Exists so hot task reads avoid shipping and decoding hundreds of KB per request.
+# RELEVANT FILES:backend/app/services/plan_tasks_service.py,backend/app/services/plan_summary_service.py,backend/app/db/migrations/003_active_plan_indexes.sql
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.metrics import record_cache_lookup
+from ..core.settings import get_settings
+from ..core.ttl_cache import TtlLruCache
+
+# goals.current_plan_id wins (a primary-key probe that also guards against a dangling
+# pointer); otherwise the newest active version, served by ai_plans_goal_active_idx.
+ACTIVE_PLAN_ID_QUERY = text(
+    """
+    SELECT COALESCE(
+        (SELECT cp.id FROM ai_plans cp WHERE cp.id = g.current_plan_id),
+        (
+            SELECT ap.id
+            FROM ai_plans ap
+            WHERE ap.goal_id = g.id
+            ORDER BY ap.is_active DESC, ap.version DESC, ap.created_at DESC
+            LIMIT 1
+        )
+    ) AS plan_id
+    FROM goals g
+    WHERE g.id = :goal_id
+    """,
+)
+
+# Same plan choice as GOAL_CONTEXT_QUERY, but only the columns that version a summary.
+ACTIVE_PLAN_VERSION_QUERY = text(
+    """
+    SELECT ap.id, ap.version, ap.updated_at, ap.has_payload
+    FROM goals g
+    JOIN LATERAL (
+        SELECT id, version, updated_at,
+               COALESCE(plan_json <> '{}'::jsonb, false) AS has_payload
+        FROM ai_plans
+        WHERE goal_id = g.id
+        ORDER BY (id = g.current_plan_id) IS TRUE DESC,
+                 is_active DESC,
+                 version DESC,
+                 created_at DESC
+        LIMIT 1
+    ) ap ON true
+    WHERE g.id = :goal_id
+    """,
+)
+
+
+@lru_cache
+def _active_plan_ids() -> TtlLruCache[str, str]:
+    settings = get_settings()
+    return TtlLruCache(
+        max_entries=settings.active_plan_cache_max_entries,
+        ttl_seconds=settings.active_plan_cache_ttl_seconds,
+    )
+
+
+async def resolve_active_plan_id(db_session: AsyncSession, goal_id: str) -> Optional[str]:
+    """
+    Returns the id of the plan tasks are read from, or None if the goal has none.
+
+    Only hits are cached, so a plan created by another worker shows up as soon
+    as it exists; a plan replaced elsewhere is picked up within the TTL.
+    """
+    cache = _active_plan_ids()
+    plan_id = cache.get(goal_id)
+    record_cache_lookup("active_plan_id", plan_id is not None)
+    if plan_id is not None:
+        return plan_id
+    result = await db_session.execute(ACTIVE_PLAN_ID_QUERY, {"goal_id": goal_id})
+    record = result.mappings().first()
+    if not record or record["plan_id"] is None:
+        return None
+    plan_id = str(record["plan_id"])
+    cache.set(goal_id, plan_id)
+    return plan_id
+
+
+def invalidate_active_plan_id(goal_id: str) -> None:
+    """Call after committing a new plan version for the goal."""
+    _active_plan_ids().delete(goal_id)
+
+
+async def fetch_active_plan_version(
+    db_session: AsyncSession,
+    goal_id: str,
+) -> Optional[Dict[str, Any]]:
+    """Returns id, version, updated_at and has_payload of the goal's plan, or None."""
+    result = await db_session.execute(ACTIVE_PLAN_VERSION_QUERY, {"goal_id": goal_id})
+    record = result.mappings().first()
+    return dict(record) if record else None
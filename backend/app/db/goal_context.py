@@ -0,0 +1,146 @@
+# backend/app/db/goal_context.py
+# Loads a goal, its selected ai_plan and the owner's profile in one SQL round trip.
+# Exists so both plan services share one data-access path instead of 3-5 queries each.
+# RELEVANT FILES:backend/app/services/plan_summary_service.py,backend/app/services/plan_tasks_service.py,backend/app/db/session.py
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ALLOWED_LANGUAGES = {"en", "es", "zh", "hi", "ar", "ro"}
+logger = logging.getLogger(__name__)
+
+# The plan preference mirrors what both services did separately: goals.current_plan_id
+# first, then the newest active version. plan_json comes back without `days`: neither
+# service needs them here and they are the bulk of the value.
+GOAL_CONTEXT_QUERY = text(
+    """
+    SELECT
+        g.id,
+        g.user_id,
+        g.title,
+        g.description,
+        g.target_date,
+        g.start_date,
+        p.age AS profile_age,
+        p.language_code AS profile_language_code,
+        ap.id AS plan_id,
+        ap.version AS plan_version,
+        ap.summary AS plan_summary,
+        ap.plan_json - 'days' AS plan_json,
+        ap.target_date AS plan_target_date,
+        ap.updated_at AS plan_updated_at
+    FROM goals g
+    LEFT JOIN profiles p ON p.id = g.user_id
+    LEFT JOIN LATERAL (
+        SELECT id, version, summary, plan_json, target_date, updated_at
+        FROM ai_plans
+        WHERE goal_id = g.id
+        ORDER BY (id = g.current_plan_id) IS TRUE DESC,
+                 is_active DESC,
+                 version DESC,
+                 created_at DESC
+        LIMIT 1
+    ) ap ON true
+    WHERE g.id = :goal_id
+    LIMIT 1
+    """,
+)
+
+
+async def fetch_goal_context(
+    db_session: AsyncSession,
+    goal_id: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns None when the goal does not exist, otherwise:
+    - goal: id, user_id, title, description, target_date, start_date
+    - plan: id, version, summary, plan_json (decoded dict, no days), target_date, updated_at; or None
+    - user_language: allowed, normalized language code or None
+    - user_context: short "age: .., language: .." string or None
+    """
+    result = await db_session.execute(GOAL_CONTEXT_QUERY, {"goal_id": goal_id})
+    record = result.mappings().first()
+    if not record:
+        return None
+    goal = {
+        "id": record["id"],
+        "user_id": record["user_id"],
+        "title": record["title"],
+        "description": record["description"],
+        "target_date": coerce_date(record["target_date"]),
+        "start_date": coerce_date(record["start_date"]),
+    }
+    plan = None
+    if record["plan_id"] is not None:
+        plan = {
+            "id": record["plan_id"],
+            "version": record["plan_version"],
+            "summary": record["plan_summary"],
+            "plan_json": decode_plan_json(record["plan_json"], record["plan_id"]),
+            "target_date": coerce_date(record["plan_target_date"]),
+            "updated_at": record["plan_updated_at"],
+        }
+    return {
+        "goal": goal,
+        "plan": plan,
+        "user_language": normalize_language(record["profile_language_code"]),
+        "user_context": format_user_context(
+            record["profile_age"],
+            record["profile_language_code"],
+        ),
+    }
+
+
+def decode_plan_json(payload: Any, plan_id: Any = None) -> Dict[str, Any]:
+    """asyncpg hands jsonb back as text unless a codec is registered."""
+    if isinstance(payload, dict):
+        return payload
+    if isinstance(payload, str) and payload:
+        try:
+            decoded = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning("Malformed plan_json for plan %s; defaulting to {}", plan_id)
+            return {}
+        return decoded if isinstance(decoded, dict) else {}
+    return {}
+
+
+def normalize_language(language: Any) -> Optional[str]:
+    if isinstance(language, str) and language.strip():
+        normalized = language.strip().lower()
+        if normalized in ALLOWED_LANGUAGES:
+            return normalized
+    return None
+
+
+def format_user_context(age: Any, language_code: Any) -> Optional[str]:
+    parts = []
+    if age is not None:
+        parts.append(f"age: {age}")
+    if isinstance(language_code, str) and language_code.strip():
+        parts.append(f"language: {language_code.strip().lower()}")
+    if not parts:
+        return None
+    return ", ".join(parts)
+
+
+def coerce_date(value: Any) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).date()
+        except ValueError:
+            return None
+    return None
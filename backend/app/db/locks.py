@@ -0,0 +1,32 @@
+# backend/app/db/locks.py
+# Postgres advisory locks scoped to a dedicated transaction.
+# Exists so several backend workers can agree on who generates a goal's plan.
+# RELEVANT FILES:backend/app/db/session.py,backend/app/services/plan_summary_service.py,backend/app/services/single_flight.py
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+
+from ..core.metrics import stage_timer
+from .session import open_db_session
+
+
+@asynccontextmanager
+async def advisory_xact_lock(namespace: str, key: str) -> AsyncIterator[None]:
+    """
+    Blocks until the cluster-wide lock for `namespace:key` is free, then holds it.
+
+    Uses a transaction-level lock on its own session so it is safe behind
+    PgBouncer in transaction mode; the lock is released when the block exits.
+    """
+    async with open_db_session() as session:
+        async with session.begin():
+            with stage_timer("advisory_lock", namespace):
+                await session.execute(
+                    text("SELECT pg_advisory_xact_lock(hashtextextended(:lock_key, 0))"),
+                    {"lock_key": f"{namespace}:{key}"},
+                )
+            yield
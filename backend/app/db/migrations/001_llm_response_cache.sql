@@ -0,0 +1,14 @@
+-- backend/app/db/migrations/001_llm_response_cache.sql
+-- Storage for the optional Postgres backend of the LLM response cache.
+-- Apply once per database before setting LLM_CACHE_BACKEND=postgres.
+-- RELEVANT FILES:backend/app/services/llm_cache.py,backend/app/core/settings.py
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key text PRIMARY KEY,
+    payload jsonb NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT NOW(),
+    expires_at timestamptz NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS llm_response_cache_expires_at_idx
+    ON llm_response_cache (expires_at);
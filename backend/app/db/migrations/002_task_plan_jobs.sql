@@ -0,0 +1,29 @@
+-- backend/app/db/migrations/002_task_plan_jobs.sql
+-- Durable queue of background task-plan generations.
+-- Apply once per database; both the API workers and app.queue.task_plan_jobs read it.
+-- RELEVANT FILES:backend/app/queue/task_plan_jobs.py,backend/app/api/task_plans.py
+
+CREATE TABLE IF NOT EXISTS task_plan_jobs (
+    id uuid PRIMARY KEY,
+    goal_id uuid NOT NULL,
+    status text NOT NULL DEFAULT 'queued',
+    attempts integer NOT NULL DEFAULT 0,
+    use_cache boolean NOT NULL DEFAULT true,
+    error text,
+    available_at timestamptz NOT NULL DEFAULT NOW(),
+    created_at timestamptz NOT NULL DEFAULT NOW(),
+    started_at timestamptz,
+    finished_at timestamptz,
+    updated_at timestamptz NOT NULL DEFAULT NOW()
+);
+
+-- At most one waiting job per goal; enqueueing again reuses it.
+CREATE UNIQUE INDEX IF NOT EXISTS task_plan_jobs_one_queued_per_goal_idx
+    ON task_plan_jobs (goal_id)
+    WHERE status = 'queued';
+
+CREATE INDEX IF NOT EXISTS task_plan_jobs_claim_idx
+    ON task_plan_jobs (status, created_at);
+
+CREATE INDEX IF NOT EXISTS task_plan_jobs_goal_idx
+    ON task_plan_jobs (goal_id, created_at DESC);
@@ -0,0 +1,12 @@
+-- backend/app/db/migrations/003_active_plan_indexes.sql
+-- Indexes behind the id-only active-plan lookup and per-day task reads.
+-- Run outside a transaction block (CONCURRENTLY), e.g. with plain psql -f.
+-- RELEVANT FILES:backend/app/db/active_plan.py,backend/app/services/plan_tasks_service.py
+
+-- Matches ORDER BY is_active DESC, version DESC, created_at DESC for one goal.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ai_plans_goal_active_idx
+    ON ai_plans (goal_id, is_active DESC, version DESC, created_at DESC);
+
+-- Serves WHERE plan_id = .. AND day_index (= or BETWEEN) .. ORDER BY order_in_day.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS tasks_plan_day_order_idx
+    ON tasks (plan_id, day_index, order_in_day);
@@ -0,0 +1,11 @@
+-- backend/app/db/migrations/004_task_plan_jobs_one_running.sql
+-- Allows at most one running task-plan job per goal.
+-- Exists so two workers can never generate (and overwrite) the same goal's tasks concurrently.
+-- RELEVANT FILES:backend/app/queue/task_plan_jobs.py,backend/app/db/migrations/002_task_plan_jobs.sql
+
+-- The claim query already skips goals with a running job; this closes the race
+-- between two workers claiming at the same instant (the loser's claim fails and
+-- it polls again). Finish or fail duplicate running rows before applying.
+CREATE UNIQUE INDEX IF NOT EXISTS task_plan_jobs_one_running_per_goal_idx
+    ON task_plan_jobs (goal_id)
+    WHERE status = 'running';
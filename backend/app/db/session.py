@@ -1,15 +1,30 @@
 # backend/app/db/session.py
 # Creates async SQLAlchemy sessions wired through our shared settings object.
 # Exists so API endpoints can depend on a consistent DB session provider.
-# RELEVANT FILES:backend/app/api/plans.py,backend/app/services/plan_summary_service.py,backend/app/core/settings.py
+# RELEVANT FILES:backend/app/api/plans.py,backend/app/services/plan_summary_service.py,backend/app/core/settings.py,backend/app/core/metrics.py
 
 from __future__ import annotations
 
-from typing import AsyncGenerator
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
 
-from ..core.settings import get_settings
+from ..core.metrics import instrument_engine, instrument_pool, track_db_request
+from ..core.settings import Settings, get_settings
+from ..core.tracing import trace_engine
+
+logger = logging.getLogger(__name__)
 
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
@@ -22,16 +37,16 @@ def _get_session_factory() -> async_sessionmaker[AsyncSession]:
             raise RuntimeError(
                 "DATABASE_URL must be set to create a database session.",
             )
-        connect_args = {
-            # Disable prepared statements because PgBouncer (transaction mode) rejects them.
-            "statement_cache_size": 0,
-        }
         engine = create_async_engine(
             settings.database_url,
             future=True,
             echo=False,
-            connect_args=connect_args,
+            connect_args=_connect_args(settings),
+            **_pool_options(settings),
         )
+        instrument_engine(engine)
+        instrument_pool(engine)
+        trace_engine(engine)
         _session_factory = async_sessionmaker(
             engine,
             expire_on_commit=False,
@@ -40,8 +55,100 @@ def _get_session_factory() -> async_sessionmaker[AsyncSession]:
     return _session_factory
 
 
+def _connect_args(settings: Settings) -> Dict[str, Any]:
+    connect_args: Dict[str, Any] = {
+        "timeout": settings.db_connect_timeout_seconds,
+        "command_timeout": settings.db_command_timeout_seconds,
+    }
+    if settings.db_pgbouncer:
+        # PgBouncer (transaction mode) may hand each statement a different server
+        # connection, so asyncpg must not cache prepared statements, and names must
+        # be unique so two clients never collide on one backend.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    return connect_args
+
+
+def _pool_options(settings: Settings) -> Dict[str, Any]:
+    mode = settings.db_pool_mode.strip().lower()
+    if mode == "null":
+        return {"poolclass": NullPool}
+    if mode != "queue":
+        logger.warning("Unknown DB_POOL_MODE=%s; using a queue pool.", settings.db_pool_mode)
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def get_engine() -> AsyncEngine:
+    """The engine behind every session (for diagnostics, instrumentation, disposal)."""
+    return _get_session_factory().kw["bind"]
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency that yields an AsyncSession."""
     session_factory = _get_session_factory()
+    with track_db_request():
+        async with session_factory() as session:
+            yield session
+
+
+@asynccontextmanager
+async def open_db_session() -> AsyncIterator[AsyncSession]:
+    """Opens a session outside FastAPI's dependency scope (streams, background work)."""
+    session_factory = _get_session_factory()
     async with session_factory() as session:
         yield session
+
+
+async def warm_up_engine(connections: Optional[int] = None) -> int:
+    """Opens pool connections at boot so the first requests do not pay for connect + TLS.
+
+    Returns how many connections were opened; failures are logged, never raised,
+    so a slow database does not block startup.
+    """
+    settings = get_settings()
+    if settings.db_pool_mode.strip().lower() == "null":
+        return 0
+    target = settings.db_pool_warmup_connections if connections is None else connections
+    target = max(min(target, settings.db_pool_size), 0)
+    if target == 0:
+        return 0
+    engine = get_engine()
+
+    async def open_one() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    # Held concurrently, otherwise the pool would hand the same connection back each time.
+    results = await asyncio.gather(*(open_one() for _ in range(target)), return_exceptions=True)
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures:
+        logger.warning("DB warm-up opened %s/%s connections: %s", target - len(failures), target, failures[0])
+    return target - len(failures)
+
+
+async def dispose_engine() -> None:
+    """Closes pooled connections on shutdown; the engine reconnects if used again."""
+    if _session_factory is not None:
+        await get_engine().dispose()
+
+
+def pool_stats() -> Dict[str, Any]:
+    if _session_factory is None:
+        return {"mode": get_settings().db_pool_mode, "initialized": False}
+    pool = get_engine().pool
+    if isinstance(pool, NullPool):
+        return {"mode": "null", "initialized": True}
+    return {
+        "mode": "queue",
+        "initialized": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
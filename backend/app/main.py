@@ -1,14 +1,22 @@
 # backend/app/main.py
 # Creates the FastAPI application and wires routers plus simple diagnostics.
 # Exists so uvicorn can import a single ASGI callable when booting the backend.
-# RELEVANT FILES:backend/app/api/plans.py,backend/app/core/settings.py,backend/app/db/session.py
+# RELEVANT FILES:backend/app/api/plans.py,backend/app/core/settings.py,backend/app/db/session.py,backend/app/core/metrics.py
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Response
 
 from .api import plans, task_plans
+from .core.metrics import render_metrics
 from .core.settings import get_settings
+from .core.tracing import configure_tracing
+from .db.session import dispose_engine, pool_stats, warm_up_engine
+from .queue.task_plan_jobs import get_task_plan_job_queue
+from .services.llm_client import get_llm_client
 
 settings = get_settings()
 print("=== DB URL USED BY BACKEND ===")
@@ -16,6 +24,22 @@ print(settings.database_url)
 print("================================")
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Opens long-lived outbound pools on boot and releases them on shutdown."""
+    llm_client = get_llm_client()
+    llm_client.open()
+    await warm_up_engine()
+    task_plan_jobs = get_task_plan_job_queue()
+    if task_plan_jobs is not None:
+        task_plan_jobs.start()
+    try:
+        yield
+    finally:
+        if task_plan_jobs is not None:
+            await task_plan_jobs.stop()
+        await llm_client.aclose()
+        await dispose_engine()
 
 
 app = FastAPI(
@@ -23,8 +47,11 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+configure_tracing(app, settings)
+
 app.include_router(plans.router, prefix="/v1")
 app.include_router(task_plans.router, prefix="/v1")
 
@@ -37,3 +64,29 @@ async def healthcheck() -> dict:
         "environment": settings.environment,
         "service": settings.app_name,
     }
+
+
+@app.get("/health/llm", tags=["health"])
+async def llm_healthcheck() -> dict:
+    """Exposes LLM client counters (cache, retries, breaker, queueing, token usage) for quick diagnostics."""
+    llm_client = get_llm_client()
+    return {
+        "model": llm_client.model_name,
+        "cache": llm_client.cache_stats(),
+        "resilience": llm_client.resilience_stats(),
+        "scheduler": llm_client.scheduler_stats(),
+        "usage": llm_client.usage_stats(),
+    }
+
+
+@app.get("/health/db", tags=["health"])
+async def db_healthcheck() -> dict:
+    """Exposes connection pool occupancy without touching the database."""
+    return {"pool": pool_stats()}
+
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint (stage timings, LLM calls, DB queries, caches)."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
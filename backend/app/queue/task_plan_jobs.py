@@ -0,0 +1,349 @@
+# backend/app/queue/task_plan_jobs.py
+# Postgres-backed job queue plus an asyncio worker pool for task-plan generation.
+# Exists so the plan summary endpoint can return before the long task-plan LLM call.
+# RELEVANT FILES:backend/app/services/plan_tasks_service.py,backend/app/services/plan_summary_service.py,backend/app/db/migrations/002_task_plan_jobs.sql
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.settings import get_settings
+from ..db.session import open_db_session
+from ..services.llm_client import LlmClient, get_llm_client
+from ..services.plan_tasks_service import (
+    ActivePlanNotFoundError,
+    GoalTargetDateMissingError,
+    PlanTasksService,
+    TaskPlanValidationError,
+)
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+# Retrying these cannot help until the goal/plan data itself changes.
+PERMANENT_JOB_ERRORS = (
+    ActivePlanNotFoundError,
+    GoalTargetDateMissingError,
+    TaskPlanValidationError,
+)
+logger = logging.getLogger(__name__)
+
+
+class TaskPlanJobQueue:
+    """
+    Enqueues task-plan jobs and runs them on a bounded pool of asyncio workers.
+
+    The table is the source of truth: workers claim rows with SKIP LOCKED, so any
+    number of API processes or standalone workers can share one queue. Local
+    enqueues wake an idle worker immediately; otherwise workers poll.
+    """
+
+    def __init__(
+        self,
+        llm_client: LlmClient,
+        workers: int,
+        poll_seconds: float,
+        max_attempts: int,
+        stale_seconds: float,
+        retry_delay_seconds: float,
+    ) -> None:
+        self._llm_client = llm_client
+        self._worker_count = max(workers, 0)
+        self._poll_seconds = max(poll_seconds, 0.1)
+        self._max_attempts = max(max_attempts, 1)
+        self._stale_seconds = stale_seconds
+        self._retry_delay_seconds = max(retry_delay_seconds, 0.0)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List["asyncio.Task[None]"] = []
+        self._table_ready: Optional[bool] = None
+        self._ready_lock = asyncio.Lock()
+
+    async def ready(self) -> bool:
+        """Whether the task_plan_jobs table exists (migration 002); checked once per process."""
+        if self._table_ready is not None:
+            return self._table_ready
+        async with self._ready_lock:
+            if self._table_ready is None:
+                async with open_db_session() as db_session:
+                    result = await db_session.execute(
+                        text("SELECT to_regclass('task_plan_jobs') IS NOT NULL AS ready"),
+                    )
+                    self._table_ready = bool(result.scalar())
+                if not self._table_ready:
+                    logger.error(
+                        "task_plan_jobs table is missing (apply db/migrations/002_task_plan_jobs.sql); "
+                        "task plans are generated inline until it exists and the process restarts.",
+                    )
+        return self._table_ready
+
+    @property
+    def worker_count(self) -> int:
+        return self._worker_count
+
+    async def enqueue(
+        self,
+        db_session: AsyncSession,
+        goal_id: str,
+        use_cache: bool = True,
+    ) -> str:
+        """Adds (or reuses) the queued job for this goal and commits it."""
+        insert_query = text(
+            """
+            INSERT INTO task_plan_jobs (id, goal_id, status, use_cache, created_at, updated_at)
+            VALUES (:job_id, :goal_id, 'queued', :use_cache, NOW(), NOW())
+            ON CONFLICT (goal_id) WHERE status = 'queued' DO NOTHING
+            RETURNING id
+            """,
+        )
+        result = await db_session.execute(
+            insert_query,
+            {"job_id": str(uuid4()), "goal_id": goal_id, "use_cache": use_cache},
+        )
+        record = result.mappings().first()
+        if record:
+            job_id = str(record["id"])
+        else:
+            existing = await self.latest_job(db_session, goal_id)
+            job_id = str(existing["id"]) if existing else ""
+        await db_session.commit()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    async def latest_job(
+        self,
+        db_session: AsyncSession,
+        goal_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        query = text(
+            """
+            SELECT id, goal_id, status, attempts, error,
+                   created_at, started_at, finished_at, updated_at
+            FROM task_plan_jobs
+            WHERE goal_id = :goal_id
+            ORDER BY created_at DESC
+            LIMIT 1
+            """,
+        )
+        result = await db_session.execute(query, {"goal_id": goal_id})
+        record = result.mappings().first()
+        return dict(record) if record else None
+
+    def start(self) -> None:
+        if self._workers or self._worker_count == 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker_loop(index), name=f"task-plan-worker-{index}")
+            for index in range(self._worker_count)
+        ]
+        logger.info("Started %s task-plan job workers", self._worker_count)
+
+    async def stop(self) -> None:
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        # Interrupted jobs stay 'running' and are reclaimed once they go stale.
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker_loop(self, worker_index: int) -> None:
+        try:
+            if not await self.ready():
+                return
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Task-plan worker %s could not check the job table", worker_index)
+        while True:
+            try:
+                job = await self._claim_next()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Task-plan worker %s could not claim a job", worker_index)
+                job = None
+            if job is None:
+                await self._wait_for_work()
+                continue
+            await self._run_job(job)
+
+    async def _wait_for_work(self) -> None:
+        if self._wakeup is None:
+            await asyncio.sleep(self._poll_seconds)
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _claim_next(self) -> Optional[Dict[str, Any]]:
+        # A job whose worker died mid-run on its last attempt would otherwise be
+        # reclaimed forever (e.g. one that crashes the process every time).
+        give_up_query = text(
+            """
+            UPDATE task_plan_jobs
+            SET status = 'failed',
+                error = COALESCE(error, 'Worker stopped responding; attempts exhausted.'),
+                finished_at = NOW(),
+                updated_at = NOW()
+            WHERE status = 'running'
+              AND started_at < NOW() - make_interval(secs => :stale_seconds)
+              AND attempts >= :max_attempts
+            """,
+        )
+        # Queued jobs wait while their goal has any running job (stale ones are
+        # reclaimed first, being older), so one goal never runs two generations.
+        claim_query = text(
+            """
+            UPDATE task_plan_jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                started_at = NOW(),
+                updated_at = NOW()
+            WHERE id = (
+                SELECT job.id
+                FROM task_plan_jobs AS job
+                WHERE (
+                        job.status = 'queued'
+                        AND job.available_at <= NOW()
+                        AND NOT EXISTS (
+                            SELECT 1 FROM task_plan_jobs AS running
+                            WHERE running.goal_id = job.goal_id
+                              AND running.status = 'running'
+                        )
+                    )
+                   OR (
+                       job.status = 'running'
+                       AND job.started_at < NOW() - make_interval(secs => :stale_seconds)
+                       AND job.attempts < :max_attempts
+                   )
+                ORDER BY job.created_at
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, goal_id, attempts, use_cache
+            """,
+        )
+        params = {"stale_seconds": self._stale_seconds, "max_attempts": self._max_attempts}
+        async with open_db_session() as db_session:
+            await db_session.execute(give_up_query, params)
+            result = await db_session.execute(claim_query, params)
+            record = result.mappings().first()
+            await db_session.commit()
+        return dict(record) if record else None
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        job_id = str(job["id"])
+        goal_id = str(job["goal_id"])
+        try:
+            async with open_db_session() as db_session:
+                service = PlanTasksService(llm_client=self._llm_client, db_session=db_session)
+                await service.generate_task_plan_for_goal(
+                    goal_id,
+                    use_cache=bool(job.get("use_cache", True)),
+                )
+        except asyncio.CancelledError:
+            raise
+        except PERMANENT_JOB_ERRORS as error:
+            logger.warning("Task-plan job %s for goal %s failed: %s", job_id, goal_id, error)
+            await self._finish_job(job_id, JOB_STATUS_FAILED, str(error), retry=False)
+        except Exception as error:
+            logger.warning("Task-plan job %s for goal %s errored: %s", job_id, goal_id, error)
+            await self._finish_job(job_id, JOB_STATUS_FAILED, str(error), retry=True)
+        else:
+            await self._finish_job(job_id, JOB_STATUS_SUCCEEDED, None, retry=False)
+
+    async def _finish_job(
+        self,
+        job_id: str,
+        status: str,
+        error: Optional[str],
+        retry: bool,
+    ) -> None:
+        # A failed attempt goes back to 'queued' (with a linear backoff) unless attempts
+        # are exhausted or a newer queued job for the same goal already supersedes it.
+        query = text(
+            """
+            UPDATE task_plan_jobs AS job
+            SET status = CASE
+                    WHEN :retry
+                         AND job.attempts < :max_attempts
+                         AND NOT EXISTS (
+                             SELECT 1 FROM task_plan_jobs AS queued
+                             WHERE queued.goal_id = job.goal_id
+                               AND queued.status = 'queued'
+                         )
+                    THEN 'queued'
+                    ELSE :status
+                END,
+                error = :error,
+                available_at = NOW() + make_interval(secs => :retry_delay * job.attempts),
+                finished_at = NOW(),
+                updated_at = NOW()
+            WHERE job.id = :job_id
+            """,
+        )
+        try:
+            async with open_db_session() as db_session:
+                await db_session.execute(
+                    query,
+                    {
+                        "job_id": job_id,
+                        "status": status,
+                        "error": error,
+                        "retry": retry,
+                        "max_attempts": self._max_attempts,
+                        "retry_delay": self._retry_delay_seconds,
+                    },
+                )
+                await db_session.commit()
+        except Exception:
+            logger.exception("Could not record outcome of task-plan job %s", job_id)
+
+
+@lru_cache
+def get_task_plan_job_queue() -> Optional[TaskPlanJobQueue]:
+    """Shared queue for this process, or None when TASK_PLAN_JOBS_ENABLED is off."""
+    settings = get_settings()
+    if not settings.task_plan_jobs_enabled:
+        return None
+    return TaskPlanJobQueue(
+        llm_client=get_llm_client(),
+        workers=settings.task_plan_job_workers,
+        poll_seconds=settings.task_plan_job_poll_seconds,
+        max_attempts=settings.task_plan_job_max_attempts,
+        stale_seconds=settings.task_plan_job_stale_seconds,
+        retry_delay_seconds=settings.task_plan_job_retry_delay_seconds,
+    )
+
+
+async def run_standalone_workers() -> None:
+    """Runs only the worker pool, for deployments that keep LLM work off API processes."""
+    queue = get_task_plan_job_queue()
+    if queue is None or queue.worker_count == 0:
+        raise RuntimeError("Enable TASK_PLAN_JOBS_ENABLED and set TASK_PLAN_JOB_WORKERS > 0.")
+    llm_client = get_llm_client()
+    llm_client.open()
+    queue.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await queue.stop()
+        await llm_client.aclose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run_standalone_workers())
+    except KeyboardInterrupt:
+        pass
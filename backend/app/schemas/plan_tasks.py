@@ -6,9 +6,32 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
+
+MIN_TASK_MINUTES = 5
+MAX_TASK_MINUTES = 60
+
+
+def llm_output_context(expected_days: Optional[int] = None) -> dict:
+    """
+    Validation context for raw LLM output (pass as `context=` to model_validate*).
+
+    Under it, out-of-range or non-numeric task durations are clamped instead of
+    rejected, non-object days/tasks are dropped, and TaskPlanResult days are
+    sorted, renumbered from 0 and trimmed to `expected_days`. Without it the
+    models validate strictly, as for stored plans.
+    """
+    return {"llm_output": True, "expected_days": expected_days}
+
+
+def _is_llm_output(info: ValidationInfo) -> bool:
+    return bool(info.context and info.context.get("llm_output"))
+
+
+def _objects_only(value: Any) -> Any:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else value
 
 
 class TaskPlanTask(BaseModel):
@@ -26,6 +49,15 @@ class TaskPlanTask(BaseModel):
         description="Estimated effort required to finish the task.",
     )
 
+    @field_validator("estimated_minutes", mode="before")
+    @classmethod
+    def _clamp_llm_minutes(cls, value: Any, info: ValidationInfo) -> Any:
+        if not _is_llm_output(info):
+            return value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return MIN_TASK_MINUTES
+        return min(MAX_TASK_MINUTES, max(MIN_TASK_MINUTES, int(value)))
+
 
 class TaskPlanDay(BaseModel):
     """Represents one calendar day in the generated plan."""
@@ -52,9 +84,14 @@ class TaskPlanDay(BaseModel):
         description="Between 1 and 3 actionable tasks for the day.",
     )
 
+    @field_validator("tasks", mode="before")
+    @classmethod
+    def _drop_llm_non_objects(cls, value: Any, info: ValidationInfo) -> Any:
+        return _objects_only(value) if _is_llm_output(info) else value
+
 
 class TaskPlanResult(BaseModel):
-    """Full payload stored into ai_plans.plan_json."""
+    """Full task plan; ai_plans.plan_json stores it without tasks unless PLAN_JSON_STORAGE=full."""
 
     goal_id: str = Field(..., description="Supabase goals.id.")
     plan_id: str = Field(..., description="Supabase ai_plans.id.")
@@ -87,6 +124,27 @@ class TaskPlanResult(BaseModel):
         description="Continuous set of day definitions for the plan.",
     )
 
+    @field_validator("days", mode="before")
+    @classmethod
+    def _drop_llm_non_objects(cls, value: Any, info: ValidationInfo) -> Any:
+        return _objects_only(value) if _is_llm_output(info) else value
+
+    @model_validator(mode="after")
+    def _renumber_llm_days(self, info: ValidationInfo) -> "TaskPlanResult":
+        """Day indexes start at 0 and the plan never exceeds the requested horizon."""
+        if not _is_llm_output(info):
+            return self
+        days = sorted(self.days, key=lambda day: day.day_index)
+        expected_days = info.context.get("expected_days")
+        if expected_days:
+            days = days[:expected_days]
+        # Freshly validated instances, so renumbering in place copies nothing.
+        for index, day in enumerate(days):
+            day.day_index = index
+        self.days = days
+        self.time_horizon_days = len(days)
+        return self
+
 
 class TaskPlanPrompt(BaseModel):
     """
@@ -144,6 +202,13 @@ class TaskPlanPrompt(BaseModel):
         None,
         description="Optional lightweight profile context (age_range, language, etc.).",
     )
+    window_context: Optional[str] = Field(
+        None,
+        description=(
+            "Set when only a slice of a longer plan is requested; describes which "
+            "days of the full horizon and which phase this slice covers."
+        ),
+    )
 
 
 class DailyTaskPayload(BaseModel):
@@ -172,3 +237,52 @@ class TasksForDayResponse(BaseModel):
         default_factory=list,
         description="Ordered list of user-facing tasks.",
     )
+
+
+class TasksForDay(BaseModel):
+    """Tasks stored for one day inside a range response."""
+
+    day_index: int = Field(..., ge=0, description="Zero-based day index.")
+    tasks: List[DailyTaskPayload] = Field(
+        default_factory=list,
+        description="Ordered list of user-facing tasks.",
+    )
+
+
+class TasksForRangeResponse(BaseModel):
+    """API response for GET /goals/{goal_id}/tasks?from=..&to=.."""
+
+    goal_id: str = Field(..., description="Supabase goals.id.")
+    plan_id: str = Field(..., description="ai_plans.id containing the tasks.")
+    from_day: int = Field(..., ge=0, description="First day_index requested (inclusive).")
+    to_day: int = Field(..., ge=0, description="Last day_index requested (inclusive).")
+    days: List[TasksForDay] = Field(
+        default_factory=list,
+        description="Days that have tasks, ordered by day_index.",
+    )
+
+
+class GoalTasksBatchResponse(BaseModel):
+    """API response for GET /goals/tasks (several goals, one day range)."""
+
+    goals: List[TasksForRangeResponse] = Field(default_factory=list)
+    missing_goal_ids: List[str] = Field(
+        default_factory=list,
+        description="Requested goals that have no active plan.",
+    )
+
+
+class TaskPlanJobStatus(BaseModel):
+    """API response for GET /goals/{goal_id}/task_plan/status."""
+
+    goal_id: str = Field(..., description="Supabase goals.id.")
+    job_id: str = Field(..., description="task_plan_jobs.id of the latest job.")
+    status: str = Field(
+        ...,
+        description="One of queued, running, succeeded, failed.",
+    )
+    attempts: int = Field(0, ge=0, description="How many times a worker picked it up.")
+    error: Optional[str] = Field(None, description="Last failure message, if any.")
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
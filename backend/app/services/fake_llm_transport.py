@@ -0,0 +1,241 @@
+# backend/app/services/fake_llm_transport.py
+# In-process stand-in for DeepSeek's /chat/completions used by LlmClient when LLM_FAKE=true.
+# Exists so the backend can be run and benchmarked offline with deterministic, schema-valid output.
+# RELEVANT FILES:backend/app/services/llm_client.py,backend/app/core/settings.py,backend/benchmarks/bench_api.py
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from pydantic import BaseModel
+
+SUMMARY_PHASE_NAMES = ["Foundations", "Practice", "Consolidation", "Stretch"]
+# DeepSeek caches prompt prefixes in 64-token units; at ~4 chars per token.
+PREFIX_CACHE_UNIT_CHARS = 256
+PREFIX_CACHE_MAX_ENTRIES = 50_000
+
+
+class FakeLlmConfig(BaseModel):
+    """Knobs for shaping the fake provider's behaviour."""
+
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    # 0 streams the whole body at once; otherwise SSE chunks are paced at this rate.
+    stream_chars_per_second: float = 0.0
+    stream_chunk_chars: int = 24
+    truncate_rate: float = 0.0
+    truncate_fraction: float = 0.6
+    error_rate: float = 0.0
+    error_status: int = 503
+    retry_after_seconds: Optional[float] = None
+    seed: int = 0
+
+
+class FakeLlmTransport(httpx.AsyncBaseTransport):
+    """
+    Answers chat completions the way DeepSeek would, without the network.
+
+    Content is a pure function of the prompt (same prompt, same plan); latency,
+    truncation and errors are drawn from a seeded RNG so runs are repeatable.
+    """
+
+    def __init__(self, config: Optional[FakeLlmConfig] = None) -> None:
+        self._config = config or FakeLlmConfig()
+        self._rng = random.Random(self._config.seed)
+        self._prefix_cache: "OrderedDict[str, None]" = OrderedDict()
+        self.requests = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        body = json.loads(await request.aread() or b"{}")
+        config = self._config
+        delay = config.latency_seconds + self._rng.uniform(0.0, config.latency_jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._rng.random() < config.error_rate:
+            headers = {}
+            if config.retry_after_seconds is not None:
+                headers["Retry-After"] = str(config.retry_after_seconds)
+            return httpx.Response(
+                config.error_status,
+                json={"error": {"message": "injected failure"}},
+                headers=headers,
+                request=request,
+            )
+
+        messages = body.get("messages") or []
+        user_content = messages[-1].get("content", "") if messages else ""
+        content = json.dumps(self._completion_payload(user_content), ensure_ascii=False)
+        finish_reason = "stop"
+        if self._rng.random() < config.truncate_rate:
+            content = content[: int(len(content) * config.truncate_fraction)]
+            finish_reason = "length"
+        max_tokens = body.get("max_tokens")
+        if isinstance(max_tokens, int) and len(content) // 4 > max_tokens:
+            content = content[: max_tokens * 4]
+            finish_reason = "length"
+        usage = _usage(messages, content, self._cached_prefix_chars(messages))
+
+        if body.get("stream"):
+            stream_options = body.get("stream_options") or {}
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "text/event-stream"},
+                content=self._sse_events(
+                    content,
+                    finish_reason,
+                    usage if stream_options.get("include_usage") else None,
+                ),
+                request=request,
+            )
+        return httpx.Response(
+            200,
+            json={
+                "id": "fake-" + hashlib.sha1(content.encode("utf-8")).hexdigest()[:12],
+                "object": "chat.completion",
+                "model": body.get("model"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": finish_reason,
+                    },
+                ],
+                "usage": usage,
+            },
+            request=request,
+        )
+
+    def _cached_prefix_chars(self, messages: List[Dict[str, Any]]) -> int:
+        """Length of the longest earlier-seen prompt prefix, in whole cache units."""
+        prompt = "".join(
+            f"{message.get('role')}\n{message.get('content') or ''}\n" for message in messages
+        )
+        digest = hashlib.sha1()
+        cached_chars = 0
+        still_hitting = True
+        for end in range(PREFIX_CACHE_UNIT_CHARS, len(prompt) + 1, PREFIX_CACHE_UNIT_CHARS):
+            digest.update(prompt[end - PREFIX_CACHE_UNIT_CHARS:end].encode("utf-8"))
+            key = digest.copy().hexdigest()
+            if still_hitting and key in self._prefix_cache:
+                cached_chars = end
+                self._prefix_cache.move_to_end(key)
+                continue
+            still_hitting = False
+            self._prefix_cache[key] = None
+        while len(self._prefix_cache) > PREFIX_CACHE_MAX_ENTRIES:
+            self._prefix_cache.popitem(last=False)
+        return cached_chars
+
+    async def _sse_events(
+        self,
+        content: str,
+        finish_reason: str,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[bytes]:
+        config = self._config
+        step = max(config.stream_chunk_chars, 1)
+        pause = step / config.stream_chars_per_second if config.stream_chars_per_second > 0 else 0.0
+        for start in range(0, len(content), step):
+            if pause:
+                await asyncio.sleep(pause)
+            event = {"choices": [{"index": 0, "delta": {"content": content[start:start + step]}}]}
+            yield f"data: {json.dumps(event)}\n\n".encode("utf-8")
+        done = {"choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}]}
+        yield f"data: {json.dumps(done)}\n\n".encode("utf-8")
+        if usage is not None:
+            yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode("utf-8")
+        yield b"data: [DONE]\n\n"
+
+    def _completion_payload(self, user_content: str) -> Dict[str, Any]:
+        try:
+            prompt = json.loads(user_content)
+        except json.JSONDecodeError:
+            prompt = None
+        if isinstance(prompt, dict) and "start_date" in prompt and "target_date" in prompt:
+            return _task_plan(prompt)
+        return _plan_summary(user_content)
+
+
+def _usage(messages: List[Dict[str, Any]], content: str, cached_chars: int) -> Dict[str, int]:
+    prompt_tokens = sum(len(message.get("content") or "") for message in messages) // 4
+    completion_tokens = max(len(content) // 4, 1)
+    cache_hit_tokens = min(cached_chars // 4, prompt_tokens)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_cache_hit_tokens": cache_hit_tokens,
+        "prompt_cache_miss_tokens": prompt_tokens - cache_hit_tokens,
+    }
+
+
+def _seeded(text: str) -> random.Random:
+    return random.Random(int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:16], 16))
+
+
+def _plan_summary(user_content: str) -> Dict[str, Any]:
+    rng = _seeded(user_content)
+    duration = rng.choice([14, 21, 30, 45, 60])
+    phase_count = 2 if duration <= 21 else 3
+    bounds = [round(duration * index / phase_count) for index in range(phase_count + 1)]
+    title = "your goal"
+    for line in user_content.splitlines():
+        if line.startswith("Goal title:"):
+            title = line.split(":", 1)[1].strip() or title
+    return {
+        "overview": f"A {duration}-day plan to make steady progress on {title}.",
+        "estimated_duration_days": duration,
+        "phases": [
+            {
+                "name": SUMMARY_PHASE_NAMES[index],
+                "days_range": f"{bounds[index] + 1}-{bounds[index + 1]}",
+                "focus": f"{SUMMARY_PHASE_NAMES[index]} work for {title}.",
+            }
+            for index in range(phase_count)
+        ],
+    }
+
+
+def _task_plan(prompt: Dict[str, Any]) -> Dict[str, Any]:
+    start = date.fromisoformat(prompt["start_date"])
+    target = date.fromisoformat(prompt["target_date"])
+    horizon = max((target - start).days + 1, 1)
+    budget = prompt.get("daily_time_commitment_minutes") or 30
+    rng = _seeded(json.dumps(prompt, sort_keys=True))
+    days = []
+    for day_index in range(horizon):
+        task_count = rng.randint(1, 3)
+        minutes = max(min(budget // task_count, 60), 5)
+        days.append(
+            {
+                "day_index": day_index,
+                "label": f"Day {day_index + 1}",
+                "focus": f"Focus for {(start + timedelta(days=day_index)).isoformat()}",
+                "tasks": [
+                    {
+                        "description": f"Step {task_index + 1} of day {day_index + 1} "
+                        f"towards {prompt.get('goal_title') or 'the goal'}.",
+                        "estimated_minutes": minutes,
+                    }
+                    for task_index in range(task_count)
+                ],
+            },
+        )
+    return {
+        "goal_id": prompt.get("goal_id"),
+        "plan_id": prompt.get("plan_id"),
+        "version": 1,
+        "summary": prompt.get("plan_summary") or "",
+        "time_horizon_days": horizon,
+        "daily_time_commitment_minutes": budget,
+        "start_date": start.isoformat(),
+        "days": days,
+    }
@@ -0,0 +1,203 @@
+# backend/app/services/json_extraction.py
+# Incremental, brace-aware scanning of JSON produced by the LLM.
+# Exists so streamed task plans surface each finished day early and truncated plans keep their complete days.
+# RELEVANT FILES:backend/app/services/llm_client.py,backend/app/services/plan_tasks_service.py,backend/app/schemas/plan_tasks.py
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+_DECODER = json.JSONDecoder()
+
+
+class JsonExtractionError(ValueError):
+    """Raised when no JSON object (complete or recoverable) is found in the text."""
+
+
+def extract_json_object(
+    raw_text: str,
+    array_key: Optional[str] = None,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Returns (payload, truncated) for the first JSON object in `raw_text`.
+
+    The common case is one C-level pass: decoding starts at the first `{` and stops
+    at the matching `}`, so code fences and prose on either side cost nothing.
+    When that object never closes and `array_key` is given, the complete leading
+    elements of that array are recovered and `truncated` is True.
+    """
+    start = raw_text.find("{")
+    if start < 0:
+        raise JsonExtractionError("No JSON object found.")
+    try:
+        payload, _ = _DECODER.raw_decode(raw_text, start)
+    except json.JSONDecodeError:
+        payload = None
+    if isinstance(payload, dict):
+        return payload, False
+    if array_key is not None:
+        recovered = recover_truncated_object(raw_text[start:], array_key)
+        if recovered is not None:
+            return recovered, True
+    raise JsonExtractionError("JSON object is malformed or truncated.")
+
+
+def recover_truncated_object(
+    raw_text: str,
+    array_key: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Rebuilds a cut-off object from the fields before `array_key` plus that array's
+    complete elements; None if the array never started or the root object closed.
+    """
+    parser = StreamingArrayParser(array_key)
+    elements = parser.feed(raw_text)
+    head = parser.array_head
+    if head is None or parser.root_closed:
+        return None
+    try:
+        payload = json.loads(head + "]}")
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    payload[array_key] = elements
+    return payload
+
+
+class StreamingArrayParser:
+    """
+    Emits the elements of one top-level array (e.g. `days`) as soon as each closes.
+
+    Chunks can split tokens anywhere; string literals and escapes are tracked so
+    braces inside task descriptions never confuse the depth counter. Anything
+    before the root object (code fences, prose) is ignored.
+    """
+
+    def __init__(self, array_key: str = "days") -> None:
+        self._array_key = array_key
+        self._chunks: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_parts: Optional[List[str]] = None
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._element_parts: Optional[List[str]] = None
+        self._array_closed = False
+        # Absolute offsets into `text`, used to rebuild truncated output.
+        self._consumed = 0
+        self._root_start: Optional[int] = None
+        self._array_start: Optional[int] = None
+        self._root_closed = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far, used to parse top-level fields once the stream ends."""
+        return "".join(self._chunks)
+
+    @property
+    def root_closed(self) -> bool:
+        return self._root_closed
+
+    @property
+    def array_head(self) -> Optional[str]:
+        """Root-object text up to and including the array's `[`, once it has opened."""
+        if self._root_start is None or self._array_start is None:
+            return None
+        return self.text[self._root_start:self._array_start + 1]
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consumes a chunk and returns the array elements completed by it."""
+        if not chunk:
+            return []
+        self._chunks.append(chunk)
+        completed: List[Dict[str, Any]] = []
+        # Only the new chunk is scanned; partial keys/elements carry over as parts.
+        string_from = 0 if self._string_parts is not None else None
+        element_from = 0 if self._element_parts is not None else None
+        for index, char in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._string_parts is not None and string_from is not None:
+                        self._string_parts.append(chunk[string_from:index])
+                        self._last_string = "".join(self._string_parts)
+                        self._string_parts = None
+                        string_from = None
+                continue
+            if self._depth == 0:
+                # Prose or code fences before the root object are skipped.
+                if char == "{" and not self._root_closed:
+                    self._depth = 1
+                    self._root_start = self._consumed + index
+                continue
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._string_parts = []
+                    string_from = index + 1
+            elif char == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif char == "," and self._depth == 1:
+                self._current_key = None
+            elif char in "{[":
+                if (
+                    char == "["
+                    and self._depth == 1
+                    and self._current_key == self._array_key
+                    and not self._array_closed
+                ):
+                    self._array_depth = self._depth + 1
+                    self._array_start = self._consumed + index
+                elif (
+                    char == "{"
+                    and self._array_depth is not None
+                    and self._depth == self._array_depth
+                ):
+                    self._element_parts = []
+                    element_from = index
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._root_closed = True
+                if self._array_depth is None:
+                    continue
+                if (
+                    char == "}"
+                    and self._depth == self._array_depth
+                    and self._element_parts is not None
+                    and element_from is not None
+                ):
+                    self._element_parts.append(chunk[element_from:index + 1])
+                    element = self._decode_element("".join(self._element_parts))
+                    if element is not None:
+                        completed.append(element)
+                    self._element_parts = None
+                    element_from = None
+                elif char == "]" and self._depth == self._array_depth - 1:
+                    self._array_depth = None
+                    self._array_closed = True
+        if self._string_parts is not None and string_from is not None:
+            self._string_parts.append(chunk[string_from:])
+        if self._element_parts is not None and element_from is not None:
+            self._element_parts.append(chunk[element_from:])
+        self._consumed += len(chunk)
+        return completed
+
+    def _decode_element(self, snippet: str) -> Optional[Dict[str, Any]]:
+        try:
+            element = json.loads(snippet)
+        except json.JSONDecodeError:
+            logger.warning("Skipping malformed streamed %s element", self._array_key)
+            return None
+        return element if isinstance(element, dict) else None
@@ -0,0 +1,169 @@
+# backend/app/services/llm_cache.py
+# Content-addressed cache for validated LLM results (plan summaries, task plans).
+# Exists so identical prompts skip the DeepSeek round trip and its cost.
+# RELEVANT FILES:backend/app/services/llm_client.py,backend/app/core/ttl_cache.py,backend/app/db/migrations/001_llm_response_cache.sql
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from ..core.metrics import record_cache_lookup
+from ..core.settings import Settings
+from ..core.ttl_cache import TtlLruCache
+from ..db.session import open_db_session
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(model: str, system_prompt: str, prompt_json: str) -> str:
+    """Hashes everything that shapes the completion into a stable key."""
+    digest = hashlib.sha256()
+    for part in (model, system_prompt, prompt_json):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class LlmResponseCache:
+    """Base class tracking hit/miss counters; subclasses implement storage."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        payload = await self._load(key)
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        record_cache_lookup("llm_response", payload is not None)
+        return payload
+
+    async def set(self, key: str, payload: Dict[str, Any]) -> None:
+        await self._store(key, payload)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend_name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    @property
+    def backend_name(self) -> str:
+        raise NotImplementedError
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def _store(self, key: str, payload: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class InMemoryLlmResponseCache(LlmResponseCache):
+    """Per-process LRU with TTL; the default backend."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        super().__init__()
+        self._entries: TtlLruCache[str, Dict[str, Any]] = TtlLruCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+
+    @property
+    def backend_name(self) -> str:
+        return "memory"
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(key)
+
+    async def _store(self, key: str, payload: Dict[str, Any]) -> None:
+        self._entries.set(key, payload)
+
+
+class PostgresLlmResponseCache(LlmResponseCache):
+    """Shared across workers via the llm_response_cache table; failures degrade to misses."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        super().__init__()
+        self._ttl_seconds = ttl_seconds
+
+    @property
+    def backend_name(self) -> str:
+        return "postgres"
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        query = text(
+            """
+            SELECT payload
+            FROM llm_response_cache
+            WHERE cache_key = :cache_key AND expires_at > NOW()
+            LIMIT 1
+            """,
+        )
+        try:
+            async with open_db_session() as session:
+                result = await session.execute(query, {"cache_key": key})
+                record = result.mappings().first()
+        except Exception as error:  # pragma: no cover - cache must never break generation
+            logger.warning("LLM cache read failed: %s", error)
+            return None
+        if not record:
+            return None
+        payload = record.get("payload")
+        if isinstance(payload, str):
+            try:
+                payload = json.loads(payload)
+            except json.JSONDecodeError:
+                return None
+        return payload if isinstance(payload, dict) else None
+
+    async def _store(self, key: str, payload: Dict[str, Any]) -> None:
+        query = text(
+            """
+            INSERT INTO llm_response_cache (cache_key, payload, created_at, expires_at)
+            VALUES (:cache_key, CAST(:payload AS jsonb), NOW(), :expires_at)
+            ON CONFLICT (cache_key) DO UPDATE
+            SET payload = EXCLUDED.payload,
+                created_at = EXCLUDED.created_at,
+                expires_at = EXCLUDED.expires_at
+            """,
+        )
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self._ttl_seconds)
+        try:
+            async with open_db_session() as session:
+                await session.execute(
+                    query,
+                    {
+                        "cache_key": key,
+                        "payload": json.dumps(payload),
+                        "expires_at": expires_at,
+                    },
+                )
+                await session.commit()
+        except Exception as error:  # pragma: no cover - cache must never break generation
+            logger.warning("LLM cache write failed: %s", error)
+
+
+def build_llm_response_cache(settings: Settings) -> Optional[LlmResponseCache]:
+    """Returns the configured backend, or None when LLM_CACHE_BACKEND=none."""
+    backend = settings.llm_cache_backend.strip().lower()
+    if backend in {"", "none", "off", "disabled"}:
+        return None
+    if backend == "postgres":
+        return PostgresLlmResponseCache(ttl_seconds=settings.llm_cache_ttl_seconds)
+    if backend != "memory":
+        logger.warning("Unknown LLM_CACHE_BACKEND %r; using the in-memory cache.", backend)
+    return InMemoryLlmResponseCache(
+        max_entries=settings.llm_cache_max_entries,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+    )
@@ -5,17 +5,38 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
-import re
-from typing import List, Optional
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 from pydantic import BaseModel, Field, ValidationError
 
 from functools import lru_cache
 
-from ..core.settings import get_settings
-from ..schemas.plan_tasks import TaskPlanPrompt, TaskPlanResult
+from ..core.metrics import (
+    LLM_REQUEST_SECONDS,
+    LLM_TRUNCATIONS,
+    record_llm_usage,
+    stage_timer,
+    track_in_flight,
+)
+from ..core.settings import Settings, get_settings
+from ..core.tracing import start_detached_span, start_span
+from ..schemas.plan_tasks import (
+    TaskPlanDay,
+    TaskPlanPrompt,
+    TaskPlanResult,
+    llm_output_context,
+)
+from .json_extraction import JsonExtractionError, StreamingArrayParser, extract_json_object
+from .llm_cache import LlmResponseCache, build_llm_response_cache, make_cache_key
+from .llm_resilience import CircuitBreaker, CircuitOpenError, LlmResilience
+from .llm_scheduler import LlmScheduler, Priority
+
+logger = logging.getLogger(__name__)
 
 
 class LlmClientError(Exception):
@@ -51,25 +72,115 @@ class PlanSummaryPrompt(BaseModel):
     language: str = "en"
 
     def to_formatted_string(self) -> str:
-        """Creates the user-facing prompt the LLM expects."""
+        """Creates the user message: only the per-goal fields (instructions live in the system prompt)."""
         context = self.user_context.strip() if self.user_context else "Not provided"
         return (
             f"Language: {self.language}\n"
-            "You help Treespora summarize user goals.\n"
             f"Goal title: {self.goal_title}\n"
             f"Goal description: {self.goal_description}\n"
-            f"User context: {context}\n"
-            "Respond ONLY with JSON matching the schema:\n"
-            "{"
-            '"overview": str, '
-            '"estimated_duration_days": int | null, '
-            '"phases": ['
-            '{"name": str, "days_range": str | null, "focus": str}'
-            "]"
-            "}"
+            f"User context: {context}"
         )
 
 
+class LlmUsage(BaseModel):
+    """Token counts from one response's `usage` block.
+
+    DeepSeek splits the prompt into prompt_cache_hit_tokens (served from its
+    prefix cache, cheaper and faster) and prompt_cache_miss_tokens.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    prompt_cache_hit_tokens: Optional[int] = None
+    prompt_cache_miss_tokens: Optional[int] = None
+
+    @classmethod
+    def from_response(cls, data: Any) -> Optional["LlmUsage"]:
+        usage = data.get("usage") if isinstance(data, dict) else None
+        if not isinstance(usage, dict):
+            return None
+        fields = {
+            key: usage[key]
+            for key in cls.model_fields
+            if isinstance(usage.get(key), int)
+        }
+        # OpenAI-compatible providers report cached tokens under prompt_tokens_details.
+        details = usage.get("prompt_tokens_details")
+        if "prompt_cache_hit_tokens" not in fields and isinstance(details, dict):
+            cached = details.get("cached_tokens")
+            if isinstance(cached, int):
+                fields["prompt_cache_hit_tokens"] = cached
+                fields["prompt_cache_miss_tokens"] = max(
+                    int(fields.get("prompt_tokens", 0)) - cached,
+                    0,
+                )
+        return cls(**fields)
+
+    def token_counts(self) -> Dict[str, int]:
+        """Direction -> tokens, as recorded in treespora_llm_tokens."""
+        counts = {"prompt": self.prompt_tokens, "completion": self.completion_tokens}
+        if self.prompt_cache_hit_tokens is not None:
+            counts["prompt_cache_hit"] = self.prompt_cache_hit_tokens
+        if self.prompt_cache_miss_tokens is not None:
+            counts["prompt_cache_miss"] = self.prompt_cache_miss_tokens
+        return counts
+
+    def span_attributes(self) -> Dict[str, int]:
+        return {f"llm.{key}": value for key, value in self.model_dump(exclude_none=True).items()}
+
+
+class GenerationParams(BaseModel):
+    """Sampling and output limits sent with each chat completion."""
+
+    json_mode: bool = True
+    max_output_tokens: int = 8192
+    summary_max_tokens: int = 1200
+    summary_temperature: Optional[float] = 0.7
+    task_plan_temperature: Optional[float] = 0.3
+    task_plan_base_tokens: int = 300
+    task_plan_tokens_per_day: int = 180
+
+
+# Both system prompts are constants so every request starts with the same bytes and
+# DeepSeek's prefix cache can serve them; per-goal data only ever follows them.
+SUMMARY_SYSTEM_PROMPT = (
+    "You are a planning assistant for Treespora."
+    " Always return structured JSON.\n"
+    "You help Treespora summarize user goals. The user message lists the goal's "
+    "language, title, description and user context.\n"
+    "Respond ONLY with JSON matching the schema:\n"
+    "{"
+    '"overview": str, '
+    '"estimated_duration_days": int | null, '
+    '"phases": ['
+    '{"name": str, "days_range": str | null, "focus": str}'
+    "]"
+    "}"
+)
+
+# Per-goal identifiers never influence the generated content, so they stay out of
+# the cache key and are stamped back onto cached task plans.
+TASK_PLAN_CACHE_EXCLUDED_FIELDS = {"goal_id", "plan_id"}
+
+# Key order of the task-plan user message: fields shared by every window of a goal
+# come first so later windows reuse the cached prefix; window bounds and ids go last.
+TASK_PLAN_PROMPT_FIELD_ORDER = (
+    "user_language",
+    "daily_time_commitment_minutes",
+    "goal_category",
+    "goal_title",
+    "goal_description",
+    "user_context",
+    "plan_summary",
+    "estimated_duration_days",
+    "start_date",
+    "target_date",
+    "window_context",
+    "goal_id",
+    "plan_id",
+)
+
 TASK_PLANNER_SYSTEM_PROMPT = (
     "You are the Treespora Task Planner agent.\n"
     "- The user message will ALWAYS be a JSON payload describing TaskPlanPrompt.\n"
@@ -78,6 +189,8 @@ TASK_PLANNER_SYSTEM_PROMPT = (
     "daily_time_commitment_minutes, start_date, days:[{day_index,label,focus,"
     "tasks:[{description,estimated_minutes}]}]}.\n"
     "- Cover every calendar day from start_date to target_date inclusively.\n"
+    "- If window_context is present, you are writing one slice of a longer plan: "
+    "day_index restarts at 0 on start_date and tasks should fit the described phase.\n"
     "- Each day must include 1-3 actionable tasks with durations between 5 and 60 minutes.\n"
     "- Ensure total daily effort stays within the provided daily_time_commitment_minutes.\n"
     "- NEVER modify plan_summary; keep it identical in the output summary field.\n"
@@ -85,10 +198,30 @@ TASK_PLANNER_SYSTEM_PROMPT = (
 )
 
 
+def _http2_available() -> bool:
+    """httpx only negotiates HTTP/2 when the optional 'h2' package is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
 class LlmClient:
     """Thin wrapper around DeepSeek's OpenAI-compatible chat completions."""
 
-    def __init__(self, base_url: str, api_key: str, model: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        cache: Optional[LlmResponseCache] = None,
+        generation: Optional[GenerationParams] = None,
+        resilience: Optional[LlmResilience] = None,
+        scheduler: Optional[LlmScheduler] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
         if not api_key:
             raise ValueError("DeepSeek API key is missing.")
         self._base_url = base_url.rstrip("/")
@@ -96,166 +229,500 @@ class LlmClient:
         self._model = model
         self._summary_timeout = httpx.Timeout(timeout=30.0, connect=10.0, read=30.0)
         self._task_plan_timeout = httpx.Timeout(timeout=90.0, connect=15.0, read=90.0)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2 and _http2_available()
+        if http2 and not self._http2:
+            logger.warning("LLM_HTTP2 requested but the 'h2' package is missing; using HTTP/1.1.")
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._cache = cache
+        self._generation = generation or GenerationParams()
+        self._resilience = resilience or LlmResilience()
+        self._scheduler = scheduler or LlmScheduler(max_concurrency=max_connections)
+        self._transport = transport
+        self._usage_totals: Dict[str, Dict[str, int]] = {}
 
     @property
     def model_name(self) -> str:
         return self._model
 
+    def cache_stats(self) -> Optional[dict]:
+        return self._cache.stats() if self._cache is not None else None
+
+    def resilience_stats(self) -> dict:
+        return self._resilience.stats()
+
+    def scheduler_stats(self) -> dict:
+        return self._scheduler.stats()
+
+    def usage_stats(self) -> dict:
+        """Reported tokens per call kind since startup, with the prompt-cache hit ratio."""
+        stats = {}
+        for kind, totals in self._usage_totals.items():
+            cached = totals["prompt_cache_hit_tokens"] + totals["prompt_cache_miss_tokens"]
+            stats[kind] = {
+                **totals,
+                "prompt_cache_hit_ratio": (
+                    round(totals["prompt_cache_hit_tokens"] / cached, 4) if cached else None
+                ),
+            }
+        return stats
+
+    def _record_usage(self, kind: str, usage: LlmUsage) -> None:
+        record_llm_usage(kind, usage.token_counts())
+        totals = self._usage_totals.setdefault(
+            kind,
+            {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "prompt_cache_hit_tokens": 0,
+                "prompt_cache_miss_tokens": 0,
+            },
+        )
+        totals["calls"] += 1
+        for key, value in usage.model_dump(exclude_none=True).items():
+            if key in totals:
+                totals[key] += value
+        logger.debug("LLM %s usage: %s", kind, usage.model_dump(exclude_none=True))
+
+    def open(self) -> None:
+        """Creates the pooled HTTP client ahead of the first request."""
+        self._get_http_client()
+
+    async def aclose(self) -> None:
+        """Closes pooled connections; the next request transparently reopens them."""
+        client = self._http_client
+        self._http_client = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers={
+                    "Authorization": f"Bearer {self._api_key}",
+                    "Content-Type": "application/json",
+                },
+                timeout=self._summary_timeout,
+                limits=self._limits,
+                http2=self._http2,
+                transport=self._transport,
+            )
+        return self._http_client
+
     async def generate_plan_summary(
         self,
         prompt: PlanSummaryPrompt,
+        use_cache: bool = True,
     ) -> PlanSummaryResult:
+        user_content = prompt.to_formatted_string()
+        cache_key = self._cache_key(SUMMARY_SYSTEM_PROMPT, user_content, use_cache)
+        if cache_key is not None:
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                return PlanSummaryResult(**cached)
+
         payload = {
             "model": self._model,
             "messages": [
                 {
                     "role": "system",
-                    "content": (
-                        "You are a planning assistant for Treespora."
-                        " Always return structured JSON."
-                    ),
+                    "content": SUMMARY_SYSTEM_PROMPT,
                 },
-                {"role": "user", "content": prompt.to_formatted_string()},
+                {"role": "user", "content": user_content},
             ],
+            **self._generation_fields(
+                max_tokens=self._generation.summary_max_tokens,
+                temperature=self._generation.summary_temperature,
+            ),
         }
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
-        try:
-            async with httpx.AsyncClient(
-                base_url=self._base_url,
-                timeout=self._summary_timeout,
-            ) as client:
-                response = await client.post(
-                    "/chat/completions",
-                    json=payload,
-                    headers=headers,
+        data = await self._post_chat_completion(
+            payload,
+            timeout=self._summary_timeout,
+            timeout_message="LLM request timed out while summarizing plan.",
+            kind="summary",
+            priority=Priority.INTERACTIVE,
+        )
+        content = self._message_content(data)
+        with stage_timer("llm_client", "summary_parse"):
+            parsed_payload, _ = self._extract_json_payload(content)
+            try:
+                result = PlanSummaryResult(**parsed_payload)
+            except ValidationError as error:
+                raise LlmClientError("LLM response payload is invalid.") from error
+        if cache_key is not None:
+            await self._cache.set(cache_key, result.model_dump(mode="json"))
+        return result
+
+    async def generate_task_plan(
+        self,
+        prompt: TaskPlanPrompt,
+        use_cache: bool = True,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> TaskPlanResult:
+        """Generates the full plan_json payload (days + tasks)."""
+        cache_key = self._cache_key(
+            TASK_PLANNER_SYSTEM_PROMPT,
+            prompt.model_dump_json(exclude=TASK_PLAN_CACHE_EXCLUDED_FIELDS),
+            use_cache,
+        )
+        if cache_key is not None:
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                return TaskPlanResult.model_validate(
+                    {**cached, "goal_id": prompt.goal_id, "plan_id": prompt.plan_id},
+                    context=llm_output_context(self._prompt_days(prompt)),
                 )
-            response.raise_for_status()
-        except httpx.ReadTimeout as error:
-            raise LlmClientError("LLM request timed out while summarizing plan.") from error
-        except httpx.HTTPStatusError as error:
-            raise LlmClientError(
-                "LLM responded with an HTTP error.",
-                status_code=error.response.status_code,
-            ) from error
-        except httpx.HTTPError as error:
-            raise LlmClientError("LLM request failed.") from error
 
-        data = response.json()
-        content = (
-            data.get("choices", [{}])[0]
-            .get("message", {})
-            .get("content", "")
-            .strip()
+        payload = self._task_plan_payload(prompt)
+        data = await self._post_chat_completion(
+            payload,
+            timeout=self._task_plan_timeout,
+            timeout_message="LLM request timed out while generating tasks.",
+            kind="task_plan",
+            priority=priority,
         )
-        parsed_payload = self._extract_json_payload(content)
+        content = self._message_content(data)
+        with stage_timer("llm_client", "task_plan_validate"):
+            result, truncated = self._validate_task_plan(content, prompt)
+        if cache_key is not None and not truncated:
+            await self._cache.set(cache_key, result.model_dump(mode="json"))
+        return result
+
+    def _validate_task_plan(
+        self,
+        content: str,
+        prompt: TaskPlanPrompt,
+    ) -> Tuple[TaskPlanResult, bool]:
+        """Validates the completion into a TaskPlanResult; the flag marks a truncated answer.
+
+        JSON mode normally yields a bare object, which Pydantic parses and validates
+        (clamping, renumbering) in one pass. Fenced, prose-wrapped or cut-off
+        content falls back to extraction first.
+        """
+        context = llm_output_context(self._prompt_days(prompt))
+        try:
+            return TaskPlanResult.model_validate_json(content, context=context), False
+        except ValidationError as error:
+            if not any(item["type"] == "json_invalid" for item in error.errors()):
+                raise LlmClientError("Task plan payload is invalid.") from error
+        with stage_timer("llm_client", "task_plan_extract"):
+            parsed_payload, truncated = self._extract_json_payload(content, array_key="days")
+        if truncated:
+            # Keep the complete days; the caller regenerates only the missing tail.
+            LLM_TRUNCATIONS.labels("task_plan").inc()
+            logger.warning(
+                "Task plan response was truncated; kept %s complete days",
+                len(parsed_payload.get("days") or []),
+            )
+            parsed_payload = {**self._task_plan_defaults(prompt), **parsed_payload}
         try:
-            return PlanSummaryResult(**parsed_payload)
+            return TaskPlanResult.model_validate(parsed_payload, context=context), truncated
         except ValidationError as error:
-            raise LlmClientError("LLM response payload is invalid.") from error
+            raise LlmClientError("Task plan payload is invalid.") from error
 
-    async def generate_task_plan(
+    def _prompt_days(self, prompt: TaskPlanPrompt) -> int:
+        return max((prompt.target_date - prompt.start_date).days + 1, 1)
+
+    def _task_plan_defaults(self, prompt: TaskPlanPrompt) -> dict:
+        """Top-level fields a truncated response may not have reached."""
+        return {
+            "goal_id": prompt.goal_id,
+            "plan_id": prompt.plan_id,
+            "version": 1,
+            "summary": prompt.plan_summary,
+            "time_horizon_days": self._prompt_days(prompt),
+            "daily_time_commitment_minutes": prompt.daily_time_commitment_minutes,
+            "start_date": prompt.start_date,
+        }
+
+    def _cache_key(self, system_prompt: str, prompt_json: str, use_cache: bool) -> Optional[str]:
+        if self._cache is None or not use_cache:
+            return None
+        return make_cache_key(self._model, system_prompt, prompt_json)
+
+    async def stream_task_plan_days(
         self,
         prompt: TaskPlanPrompt,
-    ) -> TaskPlanResult:
-        """Generates the full plan_json payload (days + tasks)."""
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[TaskPlanDay]:
+        """Streams the task plan and yields each validated day as soon as it closes.
+
+        The scheduler slot is held for the whole stream.
+        """
         payload = {
+            **self._task_plan_payload(prompt),
+            "stream": True,
+            # The final chunk then carries the usage block (cache hits included).
+            "stream_options": {"include_usage": True},
+        }
+        parser = StreamingArrayParser("days")
+        client = self._get_http_client()
+        # Streams are not retried (days may already be stored) but still feed the breaker.
+        trial = self._resilience.admit()
+        if trial is None:
+            raise LlmClientError("LLM provider is unavailable; try again shortly.", status_code=503)
+        started = time.perf_counter()
+        outcome = "cancelled"
+        response_chars = 0
+        streamed_days = 0
+        usage: Optional[LlmUsage] = None
+        span = start_detached_span(
+            "llm.chat_completion.stream",
+            **self._span_attributes("task_plan_stream", payload),
+        )
+        try:
+            with track_in_flight("llm_stream"):
+                async with self._scheduler.slot(
+                    priority,
+                    self._estimated_tokens(payload),
+                ) as slot, client.stream(
+                    "POST",
+                    "/chat/completions",
+                    json=payload,
+                    timeout=self._task_plan_timeout,
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        event = self._stream_event(line)
+                        if event is None:
+                            break
+                        usage = LlmUsage.from_response(event) or usage
+                        chunk = self._delta_content(event)
+                        response_chars += len(chunk)
+                        for raw_day in parser.feed(chunk):
+                            day = self._validate_streamed_day(raw_day)
+                            if day is not None:
+                                streamed_days += 1
+                                yield day
+                    if usage is not None and usage.total_tokens:
+                        slot.used_tokens = usage.total_tokens
+                    outcome = "ok"
+        except httpx.HTTPError as error:
+            outcome = "error"
+            span.record_exception(error)
+            self._resilience.record_outcome(error)
+            if isinstance(error, httpx.ReadTimeout):
+                raise LlmClientError("LLM stream timed out while generating tasks.") from error
+            if isinstance(error, httpx.HTTPStatusError):
+                raise LlmClientError(
+                    "LLM responded with an HTTP error.",
+                    status_code=error.response.status_code,
+                ) from error
+            raise LlmClientError("LLM stream failed.") from error
+        except Exception as error:
+            outcome = "error"
+            span.record_exception(error)
+            self._resilience.record_outcome(error)
+            raise
+        finally:
+            if outcome == "ok":
+                self._resilience.record_outcome(None)
+            elif outcome == "cancelled":
+                # Closed early or cancelled: no verdict, but free a half-open trial.
+                self._resilience.abandon(trial)
+            LLM_REQUEST_SECONDS.labels("task_plan_stream", outcome).observe(
+                time.perf_counter() - started,
+            )
+            if usage is not None:
+                self._record_usage("task_plan_stream", usage)
+                span.set_attributes(usage.span_attributes())
+            span.set_attributes(
+                {
+                    "llm.outcome": outcome,
+                    "llm.attempts": 1,
+                    "llm.response_chars": response_chars,
+                    "llm.streamed_days": streamed_days,
+                },
+            )
+            span.end()
+
+    def _task_plan_payload(self, prompt: TaskPlanPrompt) -> dict:
+        return {
             "model": self._model,
             "messages": [
                 {
                     "role": "system",
                     "content": TASK_PLANNER_SYSTEM_PROMPT,
                 },
-                {"role": "user", "content": prompt.model_dump_json()},
+                {"role": "user", "content": self._task_plan_user_content(prompt)},
             ],
+            **self._generation_fields(
+                max_tokens=self._task_plan_max_tokens(prompt),
+                temperature=self._generation.task_plan_temperature,
+            ),
         }
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
+
+    def _task_plan_user_content(self, prompt: TaskPlanPrompt) -> str:
+        """The prompt as compact JSON in TASK_PLAN_PROMPT_FIELD_ORDER, byte-stable per input."""
+        fields = prompt.model_dump(mode="json")
+        ordered = {key: fields.pop(key) for key in TASK_PLAN_PROMPT_FIELD_ORDER if key in fields}
+        ordered.update(fields)  # fields added to TaskPlanPrompt later still reach the model
+        return json.dumps(ordered, ensure_ascii=False, separators=(",", ":"))
+
+    def _task_plan_max_tokens(self, prompt: TaskPlanPrompt) -> int:
+        """Output budget grows with the horizon so short windows cannot ramble."""
+        budget = (
+            self._generation.task_plan_base_tokens
+            + self._generation.task_plan_tokens_per_day * self._prompt_days(prompt)
+        )
+        return min(budget, self._generation.max_output_tokens)
+
+    def _generation_fields(self, max_tokens: int, temperature: Optional[float]) -> dict:
+        fields: dict = {"max_tokens": min(max_tokens, self._generation.max_output_tokens)}
+        if temperature is not None:
+            fields["temperature"] = temperature
+        if self._generation.json_mode:
+            # JSON mode needs the word "json" in the prompt; both system prompts have it.
+            fields["response_format"] = {"type": "json_object"}
+        return fields
+
+    def _stream_event(self, line: str) -> Optional[dict]:
+        """Parses one SSE line; returns {} for keep-alives and None at [DONE]."""
+        if not line.startswith("data:"):
+            return {}
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return None
         try:
-            async with httpx.AsyncClient(
-                base_url=self._base_url,
-                timeout=self._task_plan_timeout,
-            ) as client:
-                response = await client.post(
-                    "/chat/completions",
-                    json=payload,
-                    headers=headers,
+            event = json.loads(data)
+        except json.JSONDecodeError:
+            return {}
+        return event if isinstance(event, dict) else {}
+
+    def _delta_content(self, event: dict) -> str:
+        # The usage chunk that closes a stream has an empty choices list.
+        choices = event.get("choices") or [{}]
+        delta = choices[0].get("delta") or {}
+        return delta.get("content") or ""
+
+    def _validate_streamed_day(self, raw_day: dict) -> Optional[TaskPlanDay]:
+        try:
+            return TaskPlanDay.model_validate(raw_day, context=llm_output_context())
+        except ValidationError:
+            logger.warning("Skipping invalid streamed day: %s", raw_day.get("day_index"))
+            return None
+
+    async def _post_chat_completion(
+        self,
+        payload: dict,
+        timeout: httpx.Timeout,
+        timeout_message: str,
+        kind: str,
+        priority: Priority,
+    ) -> dict:
+        """Sends one chat completion (with retries/hedging) and returns the JSON body.
+
+        Every attempt takes its own scheduler slot, so backoff sleeps hold none.
+        """
+        client = self._get_http_client()
+        estimated_tokens = self._estimated_tokens(payload)
+        attempts = 0
+        response_bytes = 0
+
+        async def send() -> dict:
+            nonlocal attempts, response_bytes
+            attempts += 1
+            with start_span("llm.attempt", **{"llm.kind": kind, "llm.attempt": attempts}):
+                async with self._scheduler.slot(priority, estimated_tokens) as slot:
+                    response = await client.post(
+                        "/chat/completions",
+                        json=payload,
+                        timeout=timeout,
+                    )
+                    response.raise_for_status()
+                    response_bytes = len(response.content)
+                    data = response.json()
+                    usage = LlmUsage.from_response(data)
+                    if usage is not None:
+                        if usage.total_tokens:
+                            slot.used_tokens = usage.total_tokens
+                        self._record_usage(kind, usage)
+                    return data
+
+        started = time.perf_counter()
+        outcome = "error"
+        with start_span("llm.chat_completion", **self._span_attributes(kind, payload)) as span:
+            try:
+                with track_in_flight("llm_call"):
+                    data = await self._resilience.call(kind, send)
+                outcome = "ok"
+                usage = LlmUsage.from_response(data)
+                if usage is not None:
+                    span.set_attributes(usage.span_attributes())
+                return data
+            except CircuitOpenError as error:
+                outcome = "circuit_open"
+                raise LlmClientError(
+                    "LLM provider is unavailable; try again shortly.",
+                    status_code=503,
+                ) from error
+            except httpx.TimeoutException as error:
+                outcome = "timeout"
+                raise LlmClientError(timeout_message) from error
+            except httpx.HTTPStatusError as error:
+                outcome = "http_error"
+                raise LlmClientError(
+                    "LLM responded with an HTTP error.",
+                    status_code=error.response.status_code,
+                ) from error
+            except httpx.HTTPError as error:
+                raise LlmClientError("LLM request failed.") from error
+            except ValueError as error:
+                raise LlmClientError("LLM response was not valid JSON.") from error
+            finally:
+                LLM_REQUEST_SECONDS.labels(kind, outcome).observe(time.perf_counter() - started)
+                span.set_attributes(
+                    {
+                        "llm.outcome": outcome,
+                        "llm.attempts": attempts,
+                        "llm.retries": max(attempts - 1, 0),
+                        "llm.response_bytes": response_bytes,
+                    },
                 )
-            response.raise_for_status()
-        except httpx.ReadTimeout as error:
-            raise LlmClientError("LLM request timed out while generating tasks.") from error
-        except httpx.HTTPStatusError as error:
-            raise LlmClientError(
-                "LLM responded with an HTTP error.",
-                status_code=error.response.status_code,
-            ) from error
-        except httpx.HTTPError as error:
-            raise LlmClientError("LLM request failed.") from error
 
-        data = response.json()
-        content = (
+    def _span_attributes(self, kind: str, payload: dict) -> dict:
+        return {
+            "llm.kind": kind,
+            "llm.model": self._model,
+            "llm.prompt_chars": sum(
+                len(message.get("content") or "") for message in payload["messages"]
+            ),
+            "llm.max_tokens": int(payload.get("max_tokens") or 0),
+        }
+
+    def _estimated_tokens(self, payload: dict) -> int:
+        """Rough reservation: ~4 characters per prompt token plus the output budget."""
+        prompt_chars = sum(len(message.get("content") or "") for message in payload["messages"])
+        return prompt_chars // 4 + int(payload.get("max_tokens") or 0)
+
+    def _message_content(self, data: dict) -> str:
+        return (
             data.get("choices", [{}])[0]
             .get("message", {})
             .get("content", "")
             .strip()
         )
-        parsed_payload = self._extract_json_payload(content)
-        normalized_payload = self._normalize_task_plan_payload(parsed_payload)
-        try:
-            return TaskPlanResult(**normalized_payload)
-        except ValidationError as error:
-            raise LlmClientError("Task plan payload is invalid.") from error
 
-    def _extract_json_payload(self, raw_content: str) -> dict:
-        """Extracts JSON even if the LLM wrapped it with prose."""
+    def _extract_json_payload(
+        self,
+        raw_content: str,
+        array_key: Optional[str] = None,
+    ) -> Tuple[dict, bool]:
+        """Extracts JSON even if the LLM wrapped it with prose or code fences.
+
+        With `array_key`, a truncated response still yields the complete leading
+        elements of that array; the flag tells the caller it was cut off.
+        """
         try:
-            return json.loads(raw_content)
-        except json.JSONDecodeError:
-            pass
-        match = re.search(r"\{.*\}", raw_content, re.DOTALL)
-        if match:
-            snippet = match.group(0)
-            try:
-                return json.loads(snippet)
-            except json.JSONDecodeError:
-                pass
-        raise LlmClientError("LLM response did not contain valid JSON.")
-
-    def _normalize_task_plan_payload(self, payload: dict) -> dict:
-        """Clamps task durations so Pydantic validation cannot fail."""
-        if not isinstance(payload, dict):
-            return payload
-        days = payload.get("days")
-        if not isinstance(days, list):
-            return payload
-        normalized_days = []
-        for day in days:
-            if not isinstance(day, dict):
-                continue
-            tasks = day.get("tasks")
-            if isinstance(tasks, list):
-                normalized_tasks = []
-                for task in tasks:
-                    if not isinstance(task, dict):
-                        continue
-                    minutes = task.get("estimated_minutes")
-                    if isinstance(minutes, bool):
-                        coerced_minutes = 5
-                    elif isinstance(minutes, (int, float)):
-                        coerced_minutes = int(minutes)
-                    else:
-                        coerced_minutes = 5
-                    coerced_minutes = min(60, max(5, coerced_minutes))
-                    normalized_tasks.append(
-                        {**task, "estimated_minutes": coerced_minutes},
-                    )
-                day = {**day, "tasks": normalized_tasks}
-            normalized_days.append(day)
-        return {**payload, "days": normalized_days}
+            return extract_json_object(raw_content, array_key=array_key)
+        except JsonExtractionError as error:
+            raise LlmClientError("LLM response did not contain valid JSON.") from error
 
 
 @lru_cache
@@ -265,6 +732,52 @@ def _build_llm_client() -> LlmClient:
         base_url=settings.deepseek_base_url,
         api_key=settings.deepseek_api_key,
         model=settings.deepseek_model,
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+        keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+        http2=settings.llm_http2,
+        cache=build_llm_response_cache(settings),
+        generation=GenerationParams(
+            json_mode=settings.llm_json_mode,
+            max_output_tokens=settings.llm_max_output_tokens,
+            summary_max_tokens=settings.llm_summary_max_tokens,
+            summary_temperature=settings.llm_summary_temperature,
+            task_plan_temperature=settings.llm_task_plan_temperature,
+            task_plan_base_tokens=settings.llm_task_plan_base_tokens,
+            task_plan_tokens_per_day=settings.llm_task_plan_tokens_per_day,
+        ),
+        resilience=LlmResilience(
+            max_retries=settings.llm_max_retries,
+            base_delay_seconds=settings.llm_retry_base_delay_seconds,
+            max_delay_seconds=settings.llm_retry_max_delay_seconds,
+            hedge_enabled=settings.llm_hedge_enabled,
+            hedge_min_samples=settings.llm_hedge_min_samples,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.llm_breaker_failure_threshold,
+                reset_seconds=settings.llm_breaker_reset_seconds,
+            ),
+        ),
+        scheduler=LlmScheduler(
+            max_concurrency=settings.llm_max_concurrency,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+        ),
+        transport=_build_fake_transport(settings) if settings.llm_fake else None,
+    )
+
+
+def _build_fake_transport(settings: Settings) -> httpx.AsyncBaseTransport:
+    from .fake_llm_transport import FakeLlmConfig, FakeLlmTransport
+
+    logger.warning("LLM_FAKE is enabled; DeepSeek calls are served by the offline fake.")
+    return FakeLlmTransport(
+        FakeLlmConfig(
+            latency_seconds=settings.llm_fake_latency_seconds,
+            latency_jitter_seconds=settings.llm_fake_latency_jitter_seconds,
+            stream_chars_per_second=settings.llm_fake_stream_chars_per_second,
+            truncate_rate=settings.llm_fake_truncate_rate,
+            error_rate=settings.llm_fake_error_rate,
+            seed=settings.llm_fake_seed,
+        ),
     )
 
 
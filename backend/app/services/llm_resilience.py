@@ -0,0 +1,310 @@
+# backend/app/services/llm_resilience.py
+# Retries, request hedging and a circuit breaker around individual DeepSeek calls.
+# Exists so transient provider errors are absorbed and a degraded provider fails fast.
+# RELEVANT FILES:backend/app/services/llm_client.py,backend/app/core/settings.py,backend/app/main.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the breaker is open."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transport failures, timeouts and 429/5xx are worth another attempt; other 4xx are not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+def describe_error(error: BaseException) -> str:
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}"
+    return type(error).__name__
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Parses Retry-After (delta-seconds or HTTP-date) from an HTTP error, if present."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    header = error.response.headers.get("retry-after")
+    if not header:
+        return None
+    try:
+        return max(float(header), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive provider failures.
+
+    While open every call is rejected; after `reset_seconds` one trial call is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = max(failure_threshold, 1)
+        self._reset_seconds = reset_seconds
+        self._clock = clock
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self._reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def release_trial(self) -> None:
+        """Frees the half-open slot when the trial call ended without an outcome (cancelled)."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        reopen = self._trial_in_flight
+        self._trial_in_flight = False
+        if reopen or (
+            self._opened_at is None and self._consecutive_failures >= self._failure_threshold
+        ):
+            self.times_opened += 1
+            self._opened_at = self._clock()
+
+
+class LatencyWindow:
+    """Rolling sample of successful call durations, used to pick the hedge delay."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(int(fraction * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+
+class LlmResilience:
+    """
+    Runs one provider call with bounded retries, optional hedging and a breaker.
+
+    `call(kind, send)` invokes `send()` (one HTTP round trip) and re-raises the
+    last underlying exception once retries are exhausted, so the caller keeps
+    mapping errors to LlmClientError as before.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        base_delay_seconds: float = 0.5,
+        max_delay_seconds: float = 10.0,
+        hedge_enabled: bool = False,
+        hedge_min_samples: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self._max_retries = max(max_retries, 0)
+        self._base_delay = max(base_delay_seconds, 0.0)
+        self._max_delay = max(max_delay_seconds, 0.0)
+        self._hedge_enabled = hedge_enabled
+        self._hedge_min_samples = max(hedge_min_samples, 1)
+        self._breaker = breaker or CircuitBreaker(failure_threshold=5, reset_seconds=30.0)
+        self._latencies: Dict[str, LatencyWindow] = {}
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    async def call(self, kind: str, send: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        attempt = 0
+        while True:
+            trial = self._breaker.state == "half_open"
+            if not self._breaker.allow():
+                self.failures += 1
+                raise CircuitOpenError("LLM provider circuit is open.")
+            started = time.monotonic()
+            try:
+                result = await self._hedged(kind, send)
+            except Exception as error:
+                if not is_retryable(error):
+                    # The provider answered; a bad request says nothing about its health.
+                    self._breaker.record_success()
+                    self.failures += 1
+                    raise
+                self._breaker.record_failure()
+                if attempt >= self._max_retries:
+                    self.failures += 1
+                    raise
+                delay = self._retry_delay(error, attempt)
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    "LLM %s call failed (%s); retry %s/%s in %.2fs",
+                    kind,
+                    describe_error(error),
+                    attempt,
+                    self._max_retries,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (client gone, hedge or single-flight loser): no verdict on
+                # the provider, but a trial must not keep the half-open slot forever.
+                if trial:
+                    self._breaker.release_trial()
+                raise
+            self._breaker.record_success()
+            self._latency(kind).record(time.monotonic() - started)
+            return result
+
+    def admit(self) -> Optional[bool]:
+        """Breaker check for calls that cannot go through call(), e.g. streams.
+
+        Returns None when rejected, otherwise whether this call is the half-open
+        trial; the caller must then end it with record_outcome() or abandon().
+        """
+        trial = self._breaker.state == "half_open"
+        if self._breaker.allow():
+            self.calls += 1
+            return trial
+        self.failures += 1
+        return None
+
+    def abandon(self, trial: bool) -> None:
+        """Ends an admitted call that produced no outcome (cancelled or closed early)."""
+        if trial:
+            self._breaker.release_trial()
+
+    def record_outcome(self, error: Optional[BaseException]) -> None:
+        if error is None or not is_retryable(error):
+            self._breaker.record_success()
+        else:
+            self._breaker.record_failure()
+        if error is not None:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "breaker_state": self._breaker.state,
+            "breaker_opened": self._breaker.times_opened,
+            "breaker_rejected": self._breaker.rejected,
+            "p95_seconds": {
+                kind: round(window.percentile(0.95) or 0.0, 3)
+                for kind, window in self._latencies.items()
+            },
+        }
+
+    def _latency(self, kind: str) -> LatencyWindow:
+        window = self._latencies.get(kind)
+        if window is None:
+            window = self._latencies[kind] = LatencyWindow()
+        return window
+
+    def _retry_delay(self, error: BaseException, attempt: int) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return min(retry_after, self._max_delay)
+        # Full jitter keeps many workers from retrying in lockstep.
+        return random.uniform(0.0, min(self._max_delay, self._base_delay * (2 ** attempt)))
+
+    def _hedge_delay(self, kind: str) -> Optional[float]:
+        if not self._hedge_enabled:
+            return None
+        window = self._latencies.get(kind)
+        if window is None or len(window) < self._hedge_min_samples:
+            return None
+        return window.percentile(0.95)
+
+    async def _hedged(self, kind: str, send: Callable[[], Awaitable[T]]) -> T:
+        """Fires a second identical request if the first is slower than the p95."""
+        delay = self._hedge_delay(kind)
+        if delay is None:
+            return await send()
+        tasks = [asyncio.ensure_future(send())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedges += 1
+                tasks.append(asyncio.ensure_future(send()))
+            pending = set(tasks)
+            last_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if len(tasks) > 1 and task is tasks[1]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+            assert last_error is not None
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
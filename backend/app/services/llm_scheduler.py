@@ -0,0 +1,176 @@
+# backend/app/services/llm_scheduler.py
+# Per-process admission control for DeepSeek calls: concurrency cap, token budget, priorities.
+# Exists so bulk task-plan work cannot starve interactive summaries or trip provider rate limits.
+# RELEVANT FILES:backend/app/services/llm_client.py,backend/app/services/llm_resilience.py,backend/app/core/settings.py,backend/app/core/metrics.py
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from ..core.metrics import record_llm_queue_wait, track_llm_queued
+from .llm_resilience import LatencyWindow
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class SchedulerSlot:
+    """Handed to the caller while it holds a slot; set `used_tokens` from the response usage."""
+
+    __slots__ = ("priority", "reserved_tokens", "used_tokens", "queued_seconds")
+
+    def __init__(self, priority: Priority, reserved_tokens: int, queued_seconds: float) -> None:
+        self.priority = priority
+        self.reserved_tokens = reserved_tokens
+        self.used_tokens: Optional[int] = None
+        self.queued_seconds = queued_seconds
+
+
+class _Waiter:
+    __slots__ = ("priority", "tokens", "future", "enqueued_at", "abandoned")
+
+    def __init__(self, priority: Priority, tokens: int, future: "asyncio.Future[None]", now: float) -> None:
+        self.priority = priority
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = now
+        self.abandoned = False
+
+
+class LlmScheduler:
+    """
+    Grants slots in strict priority order (FIFO within a class).
+
+    A slot needs a free concurrency unit and, when `tokens_per_minute` > 0, enough
+    tokens in a bucket refilled continuously at that rate. Reservations are the
+    caller's estimate and are reconciled with actual usage on release. The head
+    waiter blocks those behind it so large background requests are not starved.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        tokens_per_minute: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_concurrency = max(max_concurrency, 1)
+        self._capacity = max(tokens_per_minute, 0)
+        self._refill_per_second = self._capacity / 60.0
+        self._clock = clock
+        self._tokens = float(self._capacity)
+        self._refilled_at = clock()
+        self._active = 0
+        self._sequence = itertools.count()
+        self._waiting: List[Tuple[int, int, _Waiter]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._queue_times: Dict[Priority, LatencyWindow] = {p: LatencyWindow() for p in Priority}
+        self._granted: Dict[Priority, int] = {p: 0 for p in Priority}
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, estimated_tokens: int) -> AsyncIterator[SchedulerSlot]:
+        reserved = self._clamp_tokens(estimated_tokens)
+        queued_seconds = await self._acquire(priority, reserved)
+        slot = SchedulerSlot(priority, reserved, queued_seconds)
+        try:
+            yield slot
+        finally:
+            self._release(reserved, slot.used_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        queued = {p: 0 for p in Priority}
+        for _, _, waiter in self._waiting:
+            if not waiter.abandoned:
+                queued[waiter.priority] += 1
+        return {
+            "active": self._active,
+            "max_concurrency": self._max_concurrency,
+            "tokens_available": int(self._tokens) if self._capacity else None,
+            "tokens_per_minute": self._capacity or None,
+            "priorities": {
+                priority.name.lower(): {
+                    "queued": queued[priority],
+                    "granted": self._granted[priority],
+                    "queue_p50_seconds": round(self._queue_times[priority].percentile(0.5) or 0.0, 3),
+                    "queue_p95_seconds": round(self._queue_times[priority].percentile(0.95) or 0.0, 3),
+                }
+                for priority in Priority
+            },
+        }
+
+    def _clamp_tokens(self, estimated_tokens: int) -> int:
+        if not self._capacity:
+            return 0
+        # A request bigger than the whole bucket still runs once the bucket is full.
+        return min(max(estimated_tokens, 0), self._capacity)
+
+    async def _acquire(self, priority: Priority, tokens: int) -> float:
+        now = self._clock()
+        waiter = _Waiter(priority, tokens, asyncio.get_running_loop().create_future(), now)
+        heapq.heappush(self._waiting, (int(priority), next(self._sequence), waiter))
+        self._dispatch()
+        label = priority.name.lower()
+        try:
+            with track_llm_queued(label):
+                await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(tokens, None)
+            else:
+                waiter.abandoned = True
+                self._dispatch()
+            raise
+        queued_seconds = self._clock() - now
+        # stats() only keeps a per-process window; the histogram aggregates across workers.
+        record_llm_queue_wait(label, queued_seconds)
+        return queued_seconds
+
+    def _release(self, reserved: int, used: Optional[int]) -> None:
+        self._active -= 1
+        if self._capacity and used is not None:
+            self._refill()
+            self._tokens = min(self._tokens + reserved - used, float(self._capacity))
+        self._dispatch()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self._capacity:
+            elapsed = now - self._refilled_at
+            self._tokens = min(self._tokens + elapsed * self._refill_per_second, float(self._capacity))
+        self._refilled_at = now
+
+    def _dispatch(self) -> None:
+        self._refill()
+        while self._waiting and self._active < self._max_concurrency:
+            _, _, waiter = self._waiting[0]
+            if waiter.abandoned or waiter.future.done():
+                heapq.heappop(self._waiting)
+                continue
+            if self._capacity and self._tokens < waiter.tokens:
+                self._schedule_refill((waiter.tokens - self._tokens) / self._refill_per_second)
+                return
+            heapq.heappop(self._waiting)
+            self._active += 1
+            self._tokens -= waiter.tokens
+            self._granted[waiter.priority] += 1
+            self._queue_times[waiter.priority].record(self._clock() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _schedule_refill(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(max(delay, 0.001), self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
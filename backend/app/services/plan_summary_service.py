@@ -15,40 +15,143 @@ from uuid import uuid4
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.metrics import stage_timer, track_in_flight
+from ..db.active_plan import invalidate_active_plan_id
+from ..db.goal_context import fetch_goal_context
+from ..db.locks import advisory_xact_lock
+from ..db.session import open_db_session
+from ..queue.task_plan_jobs import TaskPlanJobQueue
 from ..schemas.plan_summary import PlanPhase, PlanSummary
 from .llm_client import LlmClient, LlmClientError, PlanSummaryPrompt
 from .plan_tasks_service import PlanTasksService
+from .single_flight import SingleFlight
 
-ALLOWED_LANGUAGES = {"en", "es", "zh", "hi", "ar", "ro"}
 DEFAULT_PLAN_DURATION_DAYS = 30
 logger = logging.getLogger(__name__)
 
+# Process-wide: concurrent requests for one goal share a single generation.
+_summary_flights: SingleFlight[PlanSummary] = SingleFlight()
+
 
 class GoalNotFoundError(Exception):
     """Raised when the requested goal does not exist."""  # simple marker
 
 
 class PlanSummaryService:
-    def __init__(self, llm_client: LlmClient, db_session: AsyncSession) -> None:
+    def __init__(
+        self,
+        llm_client: LlmClient,
+        db_session: AsyncSession,
+        task_plan_jobs: Optional[TaskPlanJobQueue] = None,
+    ) -> None:
         self._llm_client = llm_client
         self._db_session = db_session
+        self._task_plan_jobs = task_plan_jobs
 
-    async def get_or_generate_plan_summary(self, goal_id: str) -> PlanSummary:
-        cached_plan = await self._fetch_cached_plan_summary(goal_id)
+    async def get_or_generate_plan_summary(
+        self,
+        goal_id: str,
+        use_cache: bool = True,
+    ) -> PlanSummary:
+        context = await self._fetch_goal_context(goal_id)
+        cached_plan = self._summary_from_context(goal_id, context)
         if cached_plan:
             return cached_plan
+        # Release the connection while waiting on the (long) shared generation.
+        await self._db_session.rollback()
+        return await _summary_flights.run(
+            goal_id,
+            lambda: self._generate_plan_summary_detached(goal_id, use_cache),
+        )
+
+    async def regenerate_plan_summary(
+        self,
+        goal_id: str,
+        use_cache: bool = True,
+        generate_tasks: bool = True,
+    ) -> PlanSummary:
+        """Writes a new plan version even when one is stored (after a model or prompt change).
 
-        goal = await self._fetch_goal(goal_id)
-        user_context = await self._fetch_user_context(goal.get("user_id"))
-        language = await self._fetch_user_language(goal.get("user_id"))
+        Unlike first-time generation, an LLM failure is raised instead of replacing
+        a good plan with the fallback summary. With generate_tasks=False the caller
+        generates (or skips) the new version's tasks itself and sees their errors.
+        """
+        with track_in_flight("summary_generation"):
+            context = await self._fetch_goal_context(goal_id)
+            summary = await self._draft_plan_summary(
+                goal_id,
+                context,
+                use_cache,
+                fallback_on_error=False,
+            )
+            async with advisory_xact_lock("plan_summary", goal_id):
+                await self._store_plan_summary(goal_id, context["goal"], summary)
+            if generate_tasks:
+                with stage_timer("plan_summary", "task_plan"):
+                    await self._generate_task_plan(goal_id, use_cache)
+            return summary
+
+    async def _generate_plan_summary_detached(
+        self,
+        goal_id: str,
+        use_cache: bool = True,
+    ) -> PlanSummary:
+        """Shared single-flight run; it may outlive the request that started it, so it owns its session."""
+        async with open_db_session() as db_session:
+            service = PlanSummaryService(self._llm_client, db_session, self._task_plan_jobs)
+            return await service._generate_plan_summary_exclusive(goal_id, use_cache)
+
+    async def _generate_plan_summary_exclusive(
+        self,
+        goal_id: str,
+        use_cache: bool = True,
+    ) -> PlanSummary:
+        """Generates without holding a lock, then stores under the per-goal advisory lock.
+
+        The lock only covers the re-check and the write, so no pooled connection
+        idles in a transaction across the LLM call. A worker in another process
+        that stored a plan first wins; ours is discarded.
+        """
+        with track_in_flight("summary_generation"):
+            context = await self._fetch_goal_context(goal_id)
+            cached_plan = self._summary_from_context(goal_id, context)
+            if cached_plan:
+                return cached_plan
+            summary = await self._draft_plan_summary(goal_id, context, use_cache)
+            async with advisory_xact_lock("plan_summary", goal_id):
+                context = await self._fetch_goal_context(goal_id)
+                cached_plan = self._summary_from_context(goal_id, context)
+                if cached_plan:
+                    await self._db_session.rollback()
+                    return cached_plan
+                await self._store_plan_summary(goal_id, context["goal"], summary)
+            with stage_timer("plan_summary", "task_plan"):
+                await self._generate_task_plan(goal_id, use_cache)
+            return summary
+
+    async def _draft_plan_summary(
+        self,
+        goal_id: str,
+        context: Dict[str, Any],
+        use_cache: bool = True,
+        fallback_on_error: bool = True,
+    ) -> PlanSummary:
+        """Asks the LLM for a summary; writes nothing."""
+        # End the read transaction so this session holds no connection during the call.
+        await self._db_session.rollback()
+        goal = context["goal"]
         prompt = PlanSummaryPrompt(
             goal_title=goal.get("title") or "Untitled goal",
             goal_description=goal.get("description") or "",
-            user_context=user_context,
-            language=language or "en",
+            user_context=context.get("user_context"),
+            language=context.get("user_language") or "en",
         )
         try:
-            llm_result = await self._llm_client.generate_plan_summary(prompt)
+            with stage_timer("plan_summary", "llm"):
+                llm_result = await self._llm_client.generate_plan_summary(
+                    prompt,
+                    use_cache=use_cache,
+                )
             summary = PlanSummary(
                 goal_id=goal_id,
                 overview=llm_result.overview,
@@ -56,6 +159,8 @@ class PlanSummaryService:
                 estimated_duration_days=llm_result.estimated_duration_days,
             )
         except LlmClientError as error:
+            if not fallback_on_error:
+                raise
             logger.warning(
                 "Plan summary LLM failure for goal %s; falling back: %s",
                 goal_id,
@@ -73,6 +178,14 @@ class PlanSummaryService:
                 phases=[],
                 estimated_duration_days=DEFAULT_PLAN_DURATION_DAYS,
             )
+        return summary
+
+    async def _store_plan_summary(
+        self,
+        goal_id: str,
+        goal: Dict[str, Any],
+        summary: PlanSummary,
+    ) -> None:
         target_date = self._resolve_target_date(goal, summary)
         if not self._coerce_date(goal.get("target_date")) and target_date:
             await self._update_goal_target_date(goal_id, target_date)
@@ -82,117 +195,33 @@ class PlanSummaryService:
             goal.get("description") or ""
         )
         
-        await self._persist_plan_summary(
-            goal_id=goal_id,
-            summary=summary,
-            model_name=self._llm_client.model_name,
-            target_date=target_date,
-            daily_time_commitment_minutes=daily_time_minutes,
-        )
-        await self._generate_task_plan(goal_id)
-        return summary
+        with stage_timer("plan_summary", "persist"):
+            await self._persist_plan_summary(
+                goal_id=goal_id,
+                summary=summary,
+                model_name=self._llm_client.model_name,
+                target_date=target_date,
+                daily_time_commitment_minutes=daily_time_minutes,
+            )
 
-    async def _fetch_goal(self, goal_id: str) -> dict:
-        query = text(
-            """
-            SELECT id, user_id, title, description, target_date
-            FROM goals
-            WHERE id = :goal_id
-            LIMIT 1
-            """,
-        )
-        result = await self._db_session.execute(query, {"goal_id": goal_id})
-        record = result.mappings().first()
-        if not record:
+    async def _fetch_goal_context(self, goal_id: str) -> Dict[str, Any]:
+        with stage_timer("plan_summary", "fetch_context"):
+            context = await fetch_goal_context(self._db_session, goal_id)
+        if context is None:
             raise GoalNotFoundError("Goal not found.")
-        return dict(record)
+        return context
 
-    async def _fetch_user_language(self, user_id: Optional[str]) -> Optional[str]:
-        if not user_id:
-            return None
-        query = text(
-            """
-            SELECT language_code
-            FROM profiles
-            WHERE id = :user_id
-            LIMIT 1
-            """,
-        )
-        result = await self._db_session.execute(query, {"user_id": user_id})
-        record = result.mappings().first()
-        language = record.get("language_code") if record else None
-        if isinstance(language, str) and language.strip():
-            normalized = language.strip().lower()
-            if normalized in ALLOWED_LANGUAGES:
-                return normalized
-        return None
-
-    async def _fetch_user_context(self, user_id: Optional[str]) -> Optional[str]:
-        if not user_id:
-            return None
-        query = text(
-            """
-            SELECT age, language_code
-            FROM profiles
-            WHERE id = :user_id
-            LIMIT 1
-            """,
-        )
-        result = await self._db_session.execute(query, {"user_id": user_id})
-        record = result.mappings().first()
-        if not record:
-            return None
-        parts = []
-        age = record.get("age")
-        language_code = record.get("language_code")
-        if age is not None:
-            parts.append(f"age: {age}")
-        if isinstance(language_code, str) and language_code.strip():
-            parts.append(f"language: {language_code.strip().lower()}")
-        if not parts:
-            return None
-        return ", ".join(parts)
-
-    async def _fetch_cached_plan_summary(self, goal_id: str) -> Optional[PlanSummary]:
-        payload = await self._select_plan_payload(goal_id)
+    def _summary_from_context(
+        self,
+        goal_id: str,
+        context: Dict[str, Any],
+    ) -> Optional[PlanSummary]:
+        plan = context.get("plan")
+        payload = plan.get("plan_json") if plan else None
         if not payload:
             return None
         return self._build_summary_from_payload(goal_id, payload)
 
-    async def _select_plan_payload(self, goal_id: str) -> Optional[Dict[str, Any]]:
-        cached_plan_query = text(
-            """
-            SELECT ap.plan_json
-            FROM goals g
-            LEFT JOIN ai_plans ap ON g.current_plan_id = ap.id
-            WHERE g.id = :goal_id
-            LIMIT 1
-            """,
-        )
-        cached_plan_result = await self._db_session.execute(
-            cached_plan_query,
-            {"goal_id": goal_id},
-        )
-        cached_plan_record = cached_plan_result.mappings().first()
-        plan_payload = cached_plan_record.get("plan_json") if cached_plan_record else None
-        if plan_payload:
-            return plan_payload
-
-        fallback_query = text(
-            """
-            SELECT plan_json
-            FROM ai_plans
-            WHERE goal_id = :goal_id
-            ORDER BY is_active DESC, version DESC, created_at DESC
-            LIMIT 1
-            """,
-        )
-        fallback_result = await self._db_session.execute(fallback_query, {"goal_id": goal_id})
-        fallback_record = fallback_result.mappings().first()
-        if fallback_record:
-            return fallback_record.get("plan_json")
-        return None
-
     async def _persist_plan_summary(
         self,
         goal_id: str,
@@ -256,6 +285,7 @@ class PlanSummaryService:
             {"plan_id": plan_id, "goal_id": goal_id},
         )
         await self._db_session.commit()
+        invalidate_active_plan_id(goal_id)
 
     async def _next_plan_version(self, goal_id: str) -> int:
         query = text(
@@ -342,12 +372,32 @@ class PlanSummaryService:
             estimated_duration_days=payload.get("estimated_duration_days"),
         )
 
-    async def _generate_task_plan(self, goal_id: str) -> None:
-        """Ensures the freshly generated summary also has daily tasks."""
+    async def _generate_task_plan(self, goal_id: str, use_cache: bool = True) -> None:
+        """Ensures the freshly generated summary also has daily tasks.
+
+        With a job queue the tasks are generated in the background; without one
+        (scripts, tests), or when the job cannot be queued (e.g. the jobs table
+        is not migrated), they are generated inline as before. The summary is
+        already committed, so rolling back only discards the failed statement
+        and leaves the session usable for the caller's follow-up reads.
+        """
+        if self._task_plan_jobs is not None:
+            try:
+                if await self._task_plan_jobs.ready():
+                    await self._task_plan_jobs.enqueue(self._db_session, goal_id, use_cache)
+                    return
+            except Exception as error:  # pragma: no cover - best-effort logging
+                await self._db_session.rollback()
+                logger.warning(
+                    "Task plan enqueue failed for goal %s, generating inline: %s",
+                    goal_id,
+                    error,
+                )
         service = PlanTasksService(llm_client=self._llm_client, db_session=self._db_session)
         try:
-            await service.generate_task_plan_for_goal(goal_id)
+            await service.generate_task_plan_for_goal(goal_id, use_cache=use_cache)
         except Exception as error:  # pragma: no cover - best-effort logging
+            await self._db_session.rollback()
             logger.warning("Task plan generation failed for goal %s: %s", goal_id, error)
 
     def _coerce_date(self, value: Any) -> Optional[date]:
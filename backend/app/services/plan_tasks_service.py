@@ -5,25 +5,76 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import re
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
+from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..schemas.plan_tasks import (
+    TaskPlanDay,
     TaskPlanPrompt,
     TaskPlanResult,
+    TaskPlanTask,
     TasksForDayResponse,
+    TasksForRangeResponse,
 )
-from .llm_client import LlmClient
+from ..core.metrics import stage_timer, track_in_flight
+from ..core.settings import get_settings
+from ..db.active_plan import resolve_active_plan_id
+from ..db.goal_context import decode_plan_json, fetch_goal_context
+from .llm_client import LlmClient, LlmClientError
 
-ALLOWED_LANGUAGES = {"en", "es", "zh", "hi", "ar", "ro"}
 DEFAULT_PLAN_DURATION_DAYS = 30
+MAX_TASK_RANGE_DAYS = 366
+MAX_TASKS_PER_DAY = 3
+DAYS_RANGE_PATTERN = re.compile(r"(\d+)\s*[-\u2013\u2014]\s*(\d+)")
+PLAN_JSON_STORAGE_FULL = "full"
 logger = logging.getLogger(__name__)
 
+# A stored plan in one round trip: plan_json minus days, [day_index, label, focus] per
+# stored day and [day_index, description, estimated_minutes] per task row, in order.
+# Works for plan_json written in either storage mode; embedded tasks are never sent.
+STORED_TASK_PLAN_QUERY = text(
+    """
+    SELECT
+        ap.version,
+        ap.summary,
+        ap.plan_json - 'days' AS plan_meta,
+        COALESCE(
+            (
+                SELECT jsonb_agg(jsonb_build_array(day->'day_index', day->'label', day->'focus'))
+                FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(ap.plan_json->'days') = 'array'
+                         THEN ap.plan_json->'days'
+                         ELSE '[]'::jsonb
+                    END
+                ) AS day
+                WHERE jsonb_typeof(day) = 'object'
+            ),
+            '[]'::jsonb
+        ) AS day_labels,
+        COALESCE(
+            (
+                SELECT jsonb_agg(
+                    jsonb_build_array(t.day_index, t.description, t.estimated_minutes)
+                    ORDER BY t.day_index, t.order_in_day
+                )
+                FROM tasks t
+                WHERE t.plan_id = ap.id
+            ),
+            '[]'::jsonb
+        ) AS tasks
+    FROM ai_plans ap
+    WHERE ap.id = :plan_id
+    """,
+)
+
 
 class ActivePlanNotFoundError(Exception):
     """Raised when no active ai_plan exists for the requested goal."""
@@ -37,79 +88,56 @@ class TaskPlanValidationError(Exception):
     """Raised when the task-plan payload is invalid."""
 
 
+class PreparedTaskPlan(BaseModel):
+    """Prompt plus the bookkeeping needed to persist whatever the LLM returns."""
+
+    prompt: TaskPlanPrompt
+    expected_days: int
+    plan_version: int = 1
+    phases: List[Dict[str, Any]] = Field(default_factory=list)
+
+
+class TaskPlanWindow(BaseModel):
+    """Slice of the horizon generated by its own, smaller LLM call."""
+
+    offset: int
+    length: int
+    phase_name: Optional[str] = None
+    phase_focus: Optional[str] = None
+
+
 class PlanTasksService:
     """Generates actionable tasks for a goal by leveraging the LLM agent."""
 
     def __init__(self, llm_client: LlmClient, db_session: AsyncSession) -> None:
+        settings = get_settings()
         self._llm_client = llm_client
         self._db_session = db_session
         self._tasks_extended_schema: Optional[bool] = None
+        self._window_days = max(settings.task_plan_window_days, 1)
+        self._window_concurrency = max(settings.task_plan_window_concurrency, 1)
+        self._window_retries = max(settings.task_plan_window_retries, 0)
+        self._plan_json_tasks = (
+            settings.plan_json_storage.strip().lower() == PLAN_JSON_STORAGE_FULL
+        )
 
     async def generate_task_plan_for_goal(
         self,
         goal_id: str,
         start_date_override: Optional[date] = None,
+        use_cache: bool = True,
     ) -> TaskPlanResult:
         try:
-            goal = await self._fetch_goal(goal_id)
-            plan = await self._fetch_active_plan(goal_id)
-            if not plan:
-                logger.warning("Task plan aborted: no active plan for goal %s", goal_id)
-                raise ActivePlanNotFoundError("Goal has no active AI plan.")
-
-            current_plan_payload = plan.get("plan_json") or {}
-            plan_summary_text = plan.get("summary") or current_plan_payload.get("overview") or ""
-            user_language = await self._fetch_user_language(goal.get("user_id"))
-            user_context = await self._fetch_user_context(goal.get("user_id"))
-            plan_target_date = self._coerce_date(plan.get("target_date"))
-            goal_target_date = self._coerce_date(goal.get("target_date"))
-            horizon_from_payload = self._positive_int(
-                current_plan_payload.get("time_horizon_days")
-            ) or self._positive_int(current_plan_payload.get("estimated_duration_days"))
-            start_date_value = (
-                start_date_override
-                or self._coerce_date(goal.get("start_date"))
-                or self._coerce_date(current_plan_payload.get("start_date"))
-            )
-            target_date = plan_target_date or goal_target_date
-            if start_date_value is None and target_date and horizon_from_payload:
-                start_date_value = target_date - timedelta(days=horizon_from_payload - 1)
-            if start_date_value is None:
-                start_date_value = date.today()
-            if target_date is None:
-                fallback_horizon = horizon_from_payload or DEFAULT_PLAN_DURATION_DAYS
-                target_date = start_date_value + timedelta(days=fallback_horizon - 1)
-            if not target_date:
-                logger.warning("Task plan aborted: missing target_date for goal %s", goal_id)
-                raise GoalTargetDateMissingError("Plan target_date is required.")
-
-            goal_id_str = str(goal["id"])
-            plan_id_str = str(plan["id"])
-            prompt = TaskPlanPrompt(
-                goal_id=goal_id_str,
-                plan_id=plan_id_str,
-                goal_title=goal.get("title") or "Untitled goal",
-                goal_description=goal.get("description"),
-                goal_category=goal.get("category"),
-                start_date=start_date_value,
-                target_date=target_date,
-                plan_summary=plan_summary_text,
-                estimated_duration_days=current_plan_payload.get("estimated_duration_days"),
-                daily_time_commitment_minutes=current_plan_payload.get(
-                    "daily_time_commitment_minutes",
-                    30,
-                ),
-                user_language=user_language,
-                user_context=user_context,
-            )
-
-            expected_days = max((target_date - start_date_value).days + 1, 1)
-            task_plan_raw = await self._llm_client.generate_task_plan(prompt)
-            task_plan = self._normalize_task_plan(task_plan_raw, expected_days)
-
-            await self._persist_plan_json(plan_id_str, task_plan)
-            await self._replace_plan_tasks(plan_id_str, goal_id_str, task_plan)
-            await self._db_session.commit()
+            with track_in_flight("task_plan_generation"):
+                with stage_timer("plan_tasks", "prepare"):
+                    prepared = await self.prepare_task_plan(goal_id, start_date_override)
+                prompt = prepared.prompt
+                with stage_timer("plan_tasks", "llm"):
+                    task_plan = await self._generate_task_plan(prepared, use_cache)
+                with stage_timer("plan_tasks", "persist"):
+                    await self._persist_plan_json(prompt.plan_id, task_plan)
+                    await self._replace_plan_tasks(prompt.plan_id, prompt.goal_id, task_plan)
+                    await self._db_session.commit()
             return task_plan
         except (ActivePlanNotFoundError, GoalTargetDateMissingError, TaskPlanValidationError):
             raise
@@ -117,105 +145,528 @@ class PlanTasksService:
             logger.exception("Task plan generation crashed for goal %s", goal_id)
             raise
 
-    async def _fetch_goal(self, goal_id: str) -> Dict[str, Any]:
-        query = text(
-            """
-            SELECT id, user_id, title, description, target_date, start_date
-            FROM goals
-            WHERE id = :goal_id
-            LIMIT 1
-            """,
+    async def regenerate_task_plan_from_day(
+        self,
+        goal_id: str,
+        from_day: int,
+        use_cache: bool = True,
+    ) -> TaskPlanResult:
+        """
+        Regenerates days from_day..end of the active plan and keeps everything else.
+
+        Days before from_day and every completed task stay untouched; only the
+        pending tasks of the regenerated days and that slice of plan_json.days
+        are rewritten, and the LLM is asked for the remaining window only.
+        """
+        if from_day < 0:
+            raise TaskPlanValidationError("from_day must be >= 0")
+        with track_in_flight("task_plan_generation"):
+            with stage_timer("plan_tasks", "prepare"):
+                prepared = await self.prepare_task_plan(goal_id)
+                stored_plan = await self._load_stored_task_plan(
+                    goal_id,
+                    prepared.prompt.plan_id,
+                )
+            if from_day >= prepared.expected_days:
+                raise TaskPlanValidationError(
+                    f"from_day must be < {prepared.expected_days} (the plan horizon).",
+                )
+            kept_days = self._stored_days_before(
+                stored_plan.days if stored_plan is not None else [],
+                from_day,
+            )
+            if len(kept_days) < from_day:
+                # Nothing (or only part) of the earlier days was stored: regenerate
+                # from the first missing day so the plan stays contiguous.
+                logger.warning(
+                    "Partial regeneration for goal %s: stored plan stops at day %s, not %s",
+                    goal_id,
+                    len(kept_days),
+                    from_day,
+                )
+                from_day = len(kept_days)
+
+            prompt = prepared.prompt
+            with stage_timer("plan_tasks", "llm"):
+                generated = await self._generate_windows(
+                    prepared,
+                    self._windows_from(prepared, from_day),
+                    use_cache,
+                )
+            if not generated:
+                raise TaskPlanValidationError("LLM did not return any days to regenerate.")
+            with stage_timer("plan_tasks", "persist"):
+                completed = await self._completed_tasks_from(prompt.plan_id, from_day)
+                new_days, rows = self._merge_completed_tasks(
+                    prompt.start_date,
+                    generated,
+                    completed,
+                )
+                task_plan = TaskPlanResult(
+                    goal_id=prompt.goal_id,
+                    plan_id=prompt.plan_id,
+                    version=prepared.plan_version,
+                    summary=prompt.plan_summary,
+                    time_horizon_days=len(kept_days) + len(new_days),
+                    daily_time_commitment_minutes=prompt.daily_time_commitment_minutes,
+                    start_date=prompt.start_date,
+                    days=[*kept_days, *new_days],
+                )
+                await self._db_session.execute(
+                    text(
+                        """
+                        DELETE FROM tasks
+                        WHERE plan_id = :plan_id
+                          AND day_index >= :from_day
+                          AND completed_at IS NULL
+                        """,
+                    ),
+                    {"plan_id": prompt.plan_id, "from_day": from_day},
+                )
+                await self._insert_task_rows(prompt.plan_id, prompt.goal_id, rows)
+                await self._persist_plan_days_from(prompt.plan_id, from_day, task_plan, new_days)
+                await self._db_session.commit()
+        return task_plan
+
+    def _stored_days_before(
+        self,
+        stored_days: Sequence[TaskPlanDay],
+        from_day: int,
+    ) -> List[TaskPlanDay]:
+        """The contiguous run of stored days 0..from_day-1 that can be kept as is."""
+        kept: List[TaskPlanDay] = []
+        for day in stored_days:
+            if day.day_index != len(kept) or day.day_index >= from_day:
+                break
+            kept.append(day)
+        return kept
+
+    def _windows_from(self, prepared: PreparedTaskPlan, from_day: int) -> List[TaskPlanWindow]:
+        """The usual phase/fixed windows, clipped to start at from_day."""
+        windows: List[TaskPlanWindow] = []
+        for window in self._plan_windows(prepared):
+            end = window.offset + window.length
+            if end <= from_day:
+                continue
+            offset = max(window.offset, from_day)
+            windows.append(window.model_copy(update={"offset": offset, "length": end - offset}))
+        return windows
+
+    async def _completed_tasks_from(
+        self,
+        plan_id: str,
+        from_day: int,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        result = await self._db_session.execute(
+            text(
+                """
+                SELECT day_index, order_in_day, description, estimated_minutes
+                FROM tasks
+                WHERE plan_id = :plan_id
+                  AND day_index >= :from_day
+                  AND completed_at IS NOT NULL
+                ORDER BY day_index, order_in_day
+                """,
+            ),
+            {"plan_id": plan_id, "from_day": from_day},
         )
-        result = await self._db_session.execute(query, {"goal_id": goal_id})
-        record = result.mappings().first()
-        if not record:
+        completed: Dict[int, List[Dict[str, Any]]] = {}
+        for row in result.mappings():
+            completed.setdefault(row["day_index"], []).append(dict(row))
+        return completed
+
+    def _merge_completed_tasks(
+        self,
+        start_date: date,
+        generated: Sequence[TaskPlanDay],
+        completed: Dict[int, List[Dict[str, Any]]],
+    ) -> Tuple[List[TaskPlanDay], List[Dict[str, Any]]]:
+        """
+        Puts each day's completed tasks (still stored) ahead of the new ones.
+
+        Returns the days for plan_json and the rows to insert: only the new tasks,
+        numbered after the completed ones so order_in_day never collides.
+        """
+        days: List[TaskPlanDay] = []
+        rows: List[Dict[str, Any]] = []
+        for day in generated:
+            done_rows = completed.get(day.day_index, [])
+            done = [
+                TaskPlanTask(
+                    description=row["description"] or "Completed task",
+                    estimated_minutes=min(60, max(5, row["estimated_minutes"] or 5)),
+                )
+                for row in done_rows
+            ]
+            fresh = day.tasks[: max(MAX_TASKS_PER_DAY - len(done), 0)]
+            first_order = max((row["order_in_day"] for row in done_rows), default=0) + 1
+            days.append(day.model_copy(update={"tasks": [*done, *fresh]}))
+            rows.extend(
+                {
+                    "day_index": day.day_index,
+                    "order_in_day": order_in_day,
+                    "description": task.description,
+                    "estimated_minutes": task.estimated_minutes,
+                    "planned_date": start_date + timedelta(days=day.day_index),
+                }
+                for order_in_day, task in enumerate(fresh, start=first_order)
+            )
+        return days, rows
+
+    async def _generate_task_plan(
+        self,
+        prepared: PreparedTaskPlan,
+        use_cache: bool,
+    ) -> TaskPlanResult:
+        if prepared.expected_days > self._window_days:
+            return await self._generate_windowed_task_plan(prepared, use_cache)
+        # Already renumbered from 0 and trimmed to the prompt's horizon by the client.
+        task_plan = await self._llm_client.generate_task_plan(
+            prepared.prompt,
+            use_cache=use_cache,
+        )
+        tail = await self._generate_missing_tail(prepared, task_plan.days, use_cache)
+        if tail:
+            days = [*task_plan.days, *tail]
+            task_plan = task_plan.model_copy(
+                update={"days": days, "time_horizon_days": len(days)},
+            )
+        return task_plan
+
+    async def prepare_task_plan(
+        self,
+        goal_id: str,
+        start_date_override: Optional[date] = None,
+    ) -> PreparedTaskPlan:
+        """Loads goal + active plan and builds the prompt for the LLM."""
+        context = await fetch_goal_context(self._db_session, goal_id)
+        if context is None:
             raise ActivePlanNotFoundError("Goal not found.")
-        goal = dict(record)
-        goal["target_date"] = self._coerce_date(goal.get("target_date"))
-        goal["start_date"] = self._coerce_date(goal.get("start_date"))
-        return goal
+        goal = context["goal"]
+        plan = context["plan"]
+        if not plan:
+            logger.warning("Task plan aborted: no active plan for goal %s", goal_id)
+            raise ActivePlanNotFoundError("Goal has no active AI plan.")
 
-    async def _fetch_active_plan(self, goal_id: str) -> Optional[Dict[str, Any]]:
-        query = text(
-            """
-            SELECT id, summary, plan_json, target_date
-            FROM ai_plans
-            WHERE goal_id = :goal_id
-            ORDER BY is_active DESC, version DESC, created_at DESC
-            LIMIT 1
-            """,
+        current_plan_payload = plan.get("plan_json") or {}
+        plan_summary_text = plan.get("summary") or current_plan_payload.get("overview") or ""
+        user_language = context["user_language"]
+        user_context = context["user_context"]
+        plan_target_date = self._coerce_date(plan.get("target_date"))
+        goal_target_date = self._coerce_date(goal.get("target_date"))
+        horizon_from_payload = self._positive_int(
+            current_plan_payload.get("time_horizon_days")
+        ) or self._positive_int(current_plan_payload.get("estimated_duration_days"))
+        start_date_value = (
+            start_date_override
+            or self._coerce_date(goal.get("start_date"))
+            or self._coerce_date(current_plan_payload.get("start_date"))
         )
-        result = await self._db_session.execute(query, {"goal_id": goal_id})
-        record = result.mappings().first()
-        if not record:
-            return None
-        row = dict(record)
-        payload = row.get("plan_json")
-        if isinstance(payload, str) and payload:
+        target_date = plan_target_date or goal_target_date
+        if start_date_value is None and target_date and horizon_from_payload:
+            start_date_value = target_date - timedelta(days=horizon_from_payload - 1)
+        if start_date_value is None:
+            start_date_value = date.today()
+        if target_date is None:
+            fallback_horizon = horizon_from_payload or DEFAULT_PLAN_DURATION_DAYS
+            target_date = start_date_value + timedelta(days=fallback_horizon - 1)
+        if not target_date:
+            logger.warning("Task plan aborted: missing target_date for goal %s", goal_id)
+            raise GoalTargetDateMissingError("Plan target_date is required.")
+
+        prompt = TaskPlanPrompt(
+            goal_id=str(goal["id"]),
+            plan_id=str(plan["id"]),
+            goal_title=goal.get("title") or "Untitled goal",
+            goal_description=goal.get("description"),
+            goal_category=goal.get("category"),
+            start_date=start_date_value,
+            target_date=target_date,
+            plan_summary=plan_summary_text,
+            estimated_duration_days=current_plan_payload.get("estimated_duration_days"),
+            daily_time_commitment_minutes=current_plan_payload.get(
+                "daily_time_commitment_minutes",
+                30,
+            ),
+            user_language=user_language,
+            user_context=user_context,
+        )
+        return PreparedTaskPlan(
+            prompt=prompt,
+            expected_days=max((target_date - start_date_value).days + 1, 1),
+            plan_version=self._positive_int(plan.get("version")) or 1,
+            phases=[
+                phase
+                for phase in current_plan_payload.get("phases") or []
+                if isinstance(phase, dict)
+            ],
+        )
+
+    async def _generate_windowed_task_plan(
+        self,
+        prepared: PreparedTaskPlan,
+        use_cache: bool = True,
+    ) -> TaskPlanResult:
+        """Generates each window concurrently and stitches them into one plan."""
+        days = await self._generate_windows(prepared, self._plan_windows(prepared), use_cache)
+        prompt = prepared.prompt
+        return TaskPlanResult(
+            goal_id=prompt.goal_id,
+            plan_id=prompt.plan_id,
+            version=prepared.plan_version,
+            summary=prompt.plan_summary,
+            time_horizon_days=len(days),
+            daily_time_commitment_minutes=prompt.daily_time_commitment_minutes,
+            start_date=prompt.start_date,
+            days=days,
+        )
+
+    async def _generate_windows(
+        self,
+        prepared: PreparedTaskPlan,
+        windows: Sequence[TaskPlanWindow],
+        use_cache: bool = True,
+    ) -> List[TaskPlanDay]:
+        """Runs the windows concurrently and joins them into one contiguous run of days.
+
+        The first failure cancels the other windows so they stop holding scheduler
+        slots and spending tokens on a plan that is already lost. Only the last
+        window may come back short; a short one elsewhere would leave a gap in
+        day_index, so it fails the whole plan instead.
+        """
+        semaphore = asyncio.Semaphore(self._window_concurrency)
+
+        async def run(window: TaskPlanWindow) -> List[TaskPlanDay]:
+            async with semaphore:
+                return await self._generate_window(prepared, window, use_cache)
+
+        tasks = [asyncio.ensure_future(run(window)) for window in windows]
+        try:
+            window_days = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        days: List[TaskPlanDay] = []
+        for position, (window, chunk) in enumerate(zip(windows, window_days)):
+            if len(chunk) < window.length and position < len(windows) - 1:
+                raise LlmClientError(
+                    f"Task plan window at day {window.offset} returned only "
+                    f"{len(chunk)}/{window.length} days after retries.",
+                )
+            days.extend(chunk[: window.length])
+        return days
+
+    async def _generate_window(
+        self,
+        prepared: PreparedTaskPlan,
+        window: TaskPlanWindow,
+        use_cache: bool = True,
+    ) -> List[TaskPlanDay]:
+        """Generates one window; retries only regenerate the days still missing.
+
+        A failed call is retried as is, a short (e.g. truncated) answer is kept and
+        the next attempt asks for the remaining tail only.
+        """
+        days: List[TaskPlanDay] = []
+        attempts = self._window_retries + 1
+        for attempt in range(1, attempts + 1):
+            remaining = window.model_copy(
+                update={
+                    "offset": window.offset + len(days),
+                    "length": window.length - len(days),
+                },
+            )
             try:
-                row["plan_json"] = json.loads(payload)
-            except json.JSONDecodeError:
-                logger.warning("Malformed plan_json for plan %s; defaulting to {}", row.get("id"))
-                row["plan_json"] = {}
-        elif not isinstance(payload, dict):
-            row["plan_json"] = {}
-        row["target_date"] = self._coerce_date(row.get("target_date"))
-        return row
-
-    async def _fetch_user_language(self, user_id: Optional[str]) -> Optional[str]:
-        if not user_id:
-            return None
-        query = text(
-            """
-            SELECT language_code
-            FROM profiles
-            WHERE id = :user_id
-            LIMIT 1
-            """,
+                # Retries must not replay a cached short answer.
+                result = await self._llm_client.generate_task_plan(
+                    self._window_prompt(prepared, remaining),
+                    use_cache=use_cache and attempt == 1,
+                )
+            except LlmClientError as error:
+                if attempt >= attempts and not days:
+                    raise
+                logger.warning(
+                    "Task plan window at day %s failed (attempt %s/%s): %s",
+                    remaining.offset,
+                    attempt,
+                    attempts,
+                    error,
+                )
+                continue
+            # The client numbered the window's days from 0; shift them into the plan.
+            for day in result.days:
+                day.day_index += remaining.offset
+            days.extend(result.days)
+            if len(days) >= window.length:
+                break
+            logger.warning(
+                "Task plan window at day %s returned %s/%s days; regenerating the tail",
+                window.offset,
+                len(days),
+                window.length,
+            )
+        return days
+
+    def _window_prompt(self, prepared: PreparedTaskPlan, window: TaskPlanWindow) -> TaskPlanPrompt:
+        prompt = prepared.prompt
+        window_start = prompt.start_date + timedelta(days=window.offset)
+        context = (
+            f"Days {window.offset + 1}-{window.offset + window.length} "
+            f"of a {prepared.expected_days}-day plan."
+        )
+        if window.phase_name:
+            context += f" Phase: {window.phase_name}."
+        if window.phase_focus:
+            context += f" Phase focus: {window.phase_focus}."
+        return prompt.model_copy(
+            update={
+                "start_date": window_start,
+                "target_date": window_start + timedelta(days=window.length - 1),
+                "estimated_duration_days": window.length,
+                "window_context": context,
+            },
         )
-        result = await self._db_session.execute(query, {"user_id": user_id})
-        record = result.mappings().first()
-        language = record.get("language_code") if record else None
-        if isinstance(language, str) and language.strip():
-            normalized = language.strip().lower()
-            if normalized in ALLOWED_LANGUAGES:
-                return normalized
-        return None
 
-    async def _fetch_user_context(self, user_id: Optional[str]) -> Optional[str]:
-        if not user_id:
-            return None
-        query = text(
-            """
-            SELECT age, language_code
-            FROM profiles
-            WHERE id = :user_id
-            LIMIT 1
-            """,
+    async def _generate_missing_tail(
+        self,
+        prepared: PreparedTaskPlan,
+        days: Sequence[TaskPlanDay],
+        use_cache: bool = True,
+    ) -> List[TaskPlanDay]:
+        """Fills days len(days)..expected_days-1 after a short or truncated answer."""
+        missing = prepared.expected_days - len(days)
+        if missing <= 0 or not days:
+            return []
+        logger.warning(
+            "Task plan for goal %s stopped after %s/%s days; generating the rest",
+            prepared.prompt.goal_id,
+            len(days),
+            prepared.expected_days,
         )
-        result = await self._db_session.execute(query, {"user_id": user_id})
-        record = result.mappings().first()
-        if not record:
-            return None
-        parts = []
-        age = record.get("age")
-        language_code = record.get("language_code")
-        if age is not None:
-            parts.append(f"age: {age}")
-        if isinstance(language_code, str) and language_code.strip():
-            parts.append(f"language: {language_code.strip().lower()}")
-        if not parts:
-            return None
-        return ", ".join(parts)
+        tail = TaskPlanWindow(offset=len(days), length=missing)
+        try:
+            return await self._generate_window(prepared, tail, use_cache)
+        except LlmClientError as error:
+            # A partial plan is still better than none; keep what we have.
+            logger.warning("Could not generate the missing tail: %s", error)
+            return []
+
+    def _plan_windows(self, prepared: PreparedTaskPlan) -> List[TaskPlanWindow]:
+        """Splits the horizon per stored phase when phases tile it, else per fixed window."""
+        horizon = prepared.expected_days
+        segments = self._phase_segments(prepared.phases, horizon) or [
+            TaskPlanWindow(offset=0, length=horizon)
+        ]
+        windows: List[TaskPlanWindow] = []
+        for segment in segments:
+            for offset in range(0, segment.length, self._window_days):
+                windows.append(
+                    segment.model_copy(
+                        update={
+                            "offset": segment.offset + offset,
+                            "length": min(self._window_days, segment.length - offset),
+                        },
+                    ),
+                )
+        return windows
+
+    def _phase_segments(
+        self,
+        phases: List[Dict[str, Any]],
+        horizon: int,
+    ) -> List[TaskPlanWindow]:
+        """Maps `days_range` strings like "1-14" onto a contiguous cover of the horizon."""
+        segments: List[TaskPlanWindow] = []
+        next_offset = 0
+        for phase in phases:
+            match = DAYS_RANGE_PATTERN.search(str(phase.get("days_range") or ""))
+            if not match:
+                return []
+            first_day, last_day = int(match.group(1)), int(match.group(2))
+            if first_day - 1 != next_offset or last_day < first_day:
+                return []
+            last_day = min(last_day, horizon)
+            segments.append(
+                TaskPlanWindow(
+                    offset=next_offset,
+                    length=last_day - next_offset,
+                    phase_name=phase.get("name"),
+                    phase_focus=phase.get("focus"),
+                ),
+            )
+            next_offset = last_day
+            if next_offset >= horizon:
+                break
+        if next_offset < horizon and segments:
+            # The summary's phases may undershoot a later target_date; stretch the last one.
+            last = segments[-1]
+            segments[-1] = last.model_copy(update={"length": horizon - last.offset})
+        return [segment for segment in segments if segment.length > 0]
+
+    async def stream_task_plan(self, prepared: PreparedTaskPlan) -> AsyncIterator[TaskPlanDay]:
+        """
+        Streams days from the LLM, committing each day's tasks before yielding it.
+
+        Each day is synced like _replace_plan_tasks, scoped to that day, so
+        unchanged tasks keep their completion state and GET /tasks serves day 0
+        while later days are still generating. plan_json is rewritten, and rows
+        past the new horizon dropped, only once the stream completes; an
+        interrupted stream keeps the days stored so far next to the previous
+        plan's later days.
+        """
+        prompt = prepared.prompt
+        days: List[TaskPlanDay] = []
+        async for streamed_day in self._llm_client.stream_task_plan_days(prompt):
+            if len(days) >= prepared.expected_days:
+                break
+            day = streamed_day.model_copy(update={"day_index": len(days)})
+            await self._store_streamed_day(prompt, day)
+            days.append(day)
+            yield day
+
+        for day in await self._generate_missing_tail(prepared, days):
+            await self._store_streamed_day(prompt, day)
+            days.append(day)
+            yield day
+
+        if not days:
+            raise TaskPlanValidationError("LLM stream did not contain any valid days.")
+        task_plan = TaskPlanResult(
+            goal_id=prompt.goal_id,
+            plan_id=prompt.plan_id,
+            version=prepared.plan_version,
+            summary=prompt.plan_summary,
+            time_horizon_days=len(days),
+            daily_time_commitment_minutes=prompt.daily_time_commitment_minutes,
+            start_date=prompt.start_date,
+            days=days,
+        )
+        with stage_timer("plan_tasks", "persist"):
+            await self._persist_plan_json(prompt.plan_id, task_plan)
+            await self._trim_plan_tasks(prompt.plan_id, task_plan.time_horizon_days)
+            await self._db_session.commit()
+
+    async def _store_streamed_day(self, prompt: TaskPlanPrompt, day: TaskPlanDay) -> None:
+        with stage_timer("plan_tasks", "persist_day"):
+            await self._replace_day_tasks(prompt.plan_id, prompt.goal_id, prompt.start_date, day)
+            await self._db_session.commit()
 
     async def _persist_plan_json(self, plan_id: str, task_plan: TaskPlanResult) -> None:
-        """Replace ai_plans.plan_json with the freshly generated payload."""
+        """Merge the freshly generated payload into ai_plans.plan_json.
+
+        Top-level keys from the summary (overview, phases, ...) survive so later
+        regenerations can still window by phase. Tasks are left to the tasks table
+        unless PLAN_JSON_STORAGE=full.
+        """
         target_date = self._compute_task_plan_target_date(task_plan)
         await self._db_session.execute(
             text(
                 """
                 UPDATE ai_plans
-                SET plan_json = CAST(:plan_json AS jsonb),
+                SET plan_json = COALESCE(plan_json, '{}'::jsonb) || CAST(:plan_json AS jsonb),
                     target_date = :target_date,
                     updated_at = NOW()
                 WHERE id = :plan_id
@@ -223,23 +674,182 @@ class PlanTasksService:
             ),
             {
                 "plan_id": plan_id,
-                "plan_json": json.dumps(task_plan.model_dump(mode="json")),
+                "plan_json": self._plan_json_payload(task_plan),
                 "target_date": target_date,
             },
         )
 
+    async def _persist_plan_days_from(
+        self,
+        plan_id: str,
+        from_day: int,
+        task_plan: TaskPlanResult,
+        new_days: Sequence[TaskPlanDay],
+    ) -> None:
+        """Replaces plan_json.days[from_day:] in place; only the new slice is sent."""
+        await self._db_session.execute(
+            text(
+                """
+                UPDATE ai_plans
+                SET plan_json = jsonb_set(
+                        COALESCE(plan_json, '{}'::jsonb),
+                        '{days}',
+                        COALESCE(
+                            (
+                                SELECT jsonb_agg(day ORDER BY (day->>'day_index')::int)
+                                FROM jsonb_array_elements(
+                                    COALESCE(plan_json->'days', '[]'::jsonb)
+                                ) AS day
+                                WHERE (day->>'day_index')::int < :from_day
+                            ),
+                            '[]'::jsonb
+                        ) || CAST(:days AS jsonb)
+                    ) || jsonb_build_object(
+                        'time_horizon_days', CAST(:time_horizon_days AS integer)
+                    ),
+                    target_date = :target_date,
+                    updated_at = NOW()
+                WHERE id = :plan_id
+                """,
+            ),
+            {
+                "plan_id": plan_id,
+                "from_day": from_day,
+                "days": "[" + ",".join(self._plan_json_day(day) for day in new_days) + "]",
+                "time_horizon_days": task_plan.time_horizon_days,
+                "target_date": self._compute_task_plan_target_date(task_plan),
+            },
+        )
+
+    def _plan_json_payload(self, task_plan: TaskPlanResult) -> str:
+        if self._plan_json_tasks:
+            return task_plan.model_dump_json()
+        return task_plan.model_dump_json(exclude={"days": {"__all__": {"tasks"}}})
+
+    def _plan_json_day(self, day: TaskPlanDay) -> str:
+        return day.model_dump_json(exclude=None if self._plan_json_tasks else {"tasks"})
+
     async def _replace_plan_tasks(
         self,
         plan_id: str,
         goal_id: str,
         task_plan: TaskPlanResult,
     ) -> None:
-        """Stores each generated task into the tasks table."""
+        """Syncs the tasks table with the plan, touching only rows that changed.
+
+        Rows are matched on (day_index, order_in_day). Unchanged rows keep their id
+        and completion state, edited rows are reset to pending, and the remainder
+        is deleted or bulk-inserted: at most four statements for any plan size.
+        """
+        await self._sync_task_rows(plan_id, goal_id, task_plan.start_date, task_plan.days)
+
+    async def _replace_day_tasks(
+        self,
+        plan_id: str,
+        goal_id: str,
+        start_date: date,
+        day: TaskPlanDay,
+    ) -> None:
+        """_replace_plan_tasks for a single day; other days' rows are not read or touched."""
+        await self._sync_task_rows(plan_id, goal_id, start_date, [day], day_index=day.day_index)
+
+    async def _sync_task_rows(
+        self,
+        plan_id: str,
+        goal_id: str,
+        start_date: date,
+        days: Sequence[TaskPlanDay],
+        day_index: Optional[int] = None,
+    ) -> None:
+        extended = await self._supports_extended_task_schema()
+        existing_query = text(
+            f"""
+            SELECT id, day_index, order_in_day, description, estimated_minutes
+                {", planned_date" if extended else ""}
+            FROM tasks
+            WHERE plan_id = :plan_id
+            {"AND day_index = :day_index" if day_index is not None else ""}
+            """,
+        )
+        params: Dict[str, Any] = {"plan_id": plan_id}
+        if day_index is not None:
+            params["day_index"] = day_index
+        result = await self._db_session.execute(existing_query, params)
+        existing: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        stale_ids: List[str] = []
+        for row in result.mappings():
+            key = (row["day_index"], row["order_in_day"])
+            if key in existing:
+                stale_ids.append(str(row["id"]))
+            else:
+                existing[key] = dict(row)
+
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        for task_row in self._task_rows(start_date, days):
+            row = existing.pop((task_row["day_index"], task_row["order_in_day"]), None)
+            if row is None:
+                inserts.append(task_row)
+            elif (
+                row.get("description") != task_row["description"]
+                or row.get("estimated_minutes") != task_row["estimated_minutes"]
+                or (
+                    extended
+                    and self._coerce_date(row.get("planned_date")) != task_row["planned_date"]
+                )
+            ):
+                updates.append({**task_row, "id": str(row["id"])})
+        stale_ids.extend(str(row["id"]) for row in existing.values())
+
+        if stale_ids:
+            await self._db_session.execute(
+                text("DELETE FROM tasks WHERE id = ANY(CAST(:task_ids AS uuid[]))"),
+                {"task_ids": stale_ids},
+            )
+        if updates:
+            await self._update_task_rows(updates, extended)
+        if inserts:
+            await self._insert_task_rows(plan_id, goal_id, inserts)
+
+    async def _trim_plan_tasks(self, plan_id: str, time_horizon_days: int) -> None:
+        """Drops rows for days past the horizon (left over from a longer earlier plan)."""
         await self._db_session.execute(
-            text("DELETE FROM tasks WHERE plan_id = :plan_id"),
-            {"plan_id": plan_id},
+            text("DELETE FROM tasks WHERE plan_id = :plan_id AND day_index >= :time_horizon_days"),
+            {"plan_id": plan_id, "time_horizon_days": time_horizon_days},
         )
+
+    def _task_rows(self, start_date: date, days: Sequence[TaskPlanDay]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "day_index": day.day_index,
+                "order_in_day": order_in_day,
+                "description": task.description,
+                "estimated_minutes": task.estimated_minutes,
+                "planned_date": start_date + timedelta(days=day.day_index),
+            }
+            for day in days
+            for order_in_day, task in enumerate(day.tasks, start=1)
+        ]
+
+    async def _insert_task_rows(
+        self,
+        plan_id: str,
+        goal_id: str,
+        rows: Sequence[Dict[str, Any]],
+    ) -> None:
+        """Inserts every row in one round trip by unnesting parallel arrays."""
+        if not rows:
+            return
+        params: Dict[str, Any] = {
+            "goal_id": goal_id,
+            "plan_id": plan_id,
+            "day_indexes": [row["day_index"] for row in rows],
+            "orders_in_day": [row["order_in_day"] for row in rows],
+            "descriptions": [row["description"] for row in rows],
+            "estimated_minutes": [row["estimated_minutes"] for row in rows],
+        }
         if await self._supports_extended_task_schema():
+            params["planned_dates"] = [row["planned_date"] for row in rows]
             insert_query = text(
                 """
                 INSERT INTO tasks (
@@ -256,40 +866,30 @@ class PlanTasksService:
                     created_at,
                     updated_at
                 )
-                VALUES (
+                SELECT
                     gen_random_uuid(),
                     :goal_id,
                     :plan_id,
-                    :day_index,
-                    :order_in_day,
-                    :description,
-                    :estimated_minutes,
-                    :planned_date,
-                    :task_type,
-                    :status,
+                    item.day_index,
+                    item.order_in_day,
+                    item.description,
+                    item.estimated_minutes,
+                    item.planned_date,
+                    'core',
+                    'pending',
                     NOW(),
                     NOW()
-                )
+                FROM unnest(
+                    CAST(:day_indexes AS integer[]),
+                    CAST(:orders_in_day AS integer[]),
+                    CAST(:descriptions AS text[]),
+                    CAST(:estimated_minutes AS integer[]),
+                    CAST(:planned_dates AS date[])
+                ) AS item(day_index, order_in_day, description, estimated_minutes, planned_date)
                 """,
             )
-            for day in task_plan.days:
-                planned_date = task_plan.start_date + timedelta(days=day.day_index)
-                for order_in_day, task in enumerate(day.tasks, start=1):
-                    await self._db_session.execute(
-                        insert_query,
-                        {
-                            "goal_id": goal_id,
-                            "plan_id": plan_id,
-                            "day_index": day.day_index,
-                            "order_in_day": order_in_day,
-                            "description": task.description,
-                            "estimated_minutes": task.estimated_minutes,
-                            "planned_date": planned_date,
-                            "task_type": "core",
-                            "status": "pending",
-                        },
-                    )
         else:
+            params.pop("goal_id")
             insert_query = text(
                 """
                 INSERT INTO tasks (
@@ -301,29 +901,135 @@ class PlanTasksService:
                     estimated_minutes,
                     created_at
                 )
-                VALUES (
+                SELECT
                     gen_random_uuid(),
                     :plan_id,
-                    :day_index,
-                    :order_in_day,
-                    :description,
-                    :estimated_minutes,
+                    item.day_index,
+                    item.order_in_day,
+                    item.description,
+                    item.estimated_minutes,
                     NOW()
-                )
+                FROM unnest(
+                    CAST(:day_indexes AS integer[]),
+                    CAST(:orders_in_day AS integer[]),
+                    CAST(:descriptions AS text[]),
+                    CAST(:estimated_minutes AS integer[])
+                ) AS item(day_index, order_in_day, description, estimated_minutes)
                 """,
             )
-            for day in task_plan.days:
-                for order_in_day, task in enumerate(day.tasks, start=1):
-                    await self._db_session.execute(
-                        insert_query,
-                        {
-                            "plan_id": plan_id,
-                            "day_index": day.day_index,
-                            "order_in_day": order_in_day,
-                            "description": task.description,
-                            "estimated_minutes": task.estimated_minutes,
-                        },
-                    )
+        await self._db_session.execute(insert_query, params)
+
+    async def _update_task_rows(self, rows: Sequence[Dict[str, Any]], extended: bool) -> None:
+        """Rewrites edited tasks in place; a changed task is no longer completed."""
+        params: Dict[str, Any] = {
+            "task_ids": [row["id"] for row in rows],
+            "descriptions": [row["description"] for row in rows],
+            "estimated_minutes": [row["estimated_minutes"] for row in rows],
+        }
+        if extended:
+            params["planned_dates"] = [row["planned_date"] for row in rows]
+            update_query = text(
+                """
+                UPDATE tasks
+                SET description = item.description,
+                    estimated_minutes = item.estimated_minutes,
+                    planned_date = item.planned_date,
+                    status = 'pending',
+                    completed_at = NULL,
+                    updated_at = NOW()
+                FROM unnest(
+                    CAST(:task_ids AS uuid[]),
+                    CAST(:descriptions AS text[]),
+                    CAST(:estimated_minutes AS integer[]),
+                    CAST(:planned_dates AS date[])
+                ) AS item(id, description, estimated_minutes, planned_date)
+                WHERE tasks.id = item.id
+                """,
+            )
+        else:
+            update_query = text(
+                """
+                UPDATE tasks
+                SET description = item.description,
+                    estimated_minutes = item.estimated_minutes,
+                    completed_at = NULL
+                FROM unnest(
+                    CAST(:task_ids AS uuid[]),
+                    CAST(:descriptions AS text[]),
+                    CAST(:estimated_minutes AS integer[])
+                ) AS item(id, description, estimated_minutes)
+                WHERE tasks.id = item.id
+                """,
+            )
+        await self._db_session.execute(update_query, params)
+
+    async def fetch_task_plan(self, goal_id: str) -> TaskPlanResult:
+        """The active plan's stored task plan, rebuilt from plan_json metadata and task rows."""
+        plan_id = await resolve_active_plan_id(self._db_session, goal_id)
+        if not plan_id:
+            raise ActivePlanNotFoundError("No active plan found for goal.")
+        task_plan = await self._load_stored_task_plan(goal_id, plan_id)
+        if task_plan is None:
+            raise ActivePlanNotFoundError("The active plan has no tasks yet.")
+        return task_plan
+
+    async def _load_stored_task_plan(self, goal_id: str, plan_id: str) -> Optional[TaskPlanResult]:
+        """None when the plan has no task rows or no task-plan metadata (start_date) yet."""
+        result = await self._db_session.execute(STORED_TASK_PLAN_QUERY, {"plan_id": plan_id})
+        record = result.mappings().first()
+        if record is None:
+            return None
+        plan_meta = decode_plan_json(record["plan_meta"], plan_id)
+        start_date = self._coerce_date(plan_meta.get("start_date"))
+        if start_date is None:
+            return None
+        labels: Dict[int, Tuple[Any, Any]] = {}
+        for day_index, label, focus in self._decode_json_rows(record["day_labels"]):
+            if isinstance(day_index, int):
+                labels.setdefault(day_index, (label, focus))
+        tasks_by_day: Dict[int, List[TaskPlanTask]] = {}
+        for day_index, description, estimated_minutes in self._decode_json_rows(record["tasks"]):
+            tasks_by_day.setdefault(day_index, []).append(
+                TaskPlanTask(
+                    description=description or "Task",
+                    estimated_minutes=min(60, max(5, estimated_minutes or 5)),
+                ),
+            )
+        if not tasks_by_day:
+            return None
+        days: List[TaskPlanDay] = []
+        for day_index, tasks in tasks_by_day.items():
+            label, focus = labels.get(day_index, (None, None))
+            label = label if isinstance(label, str) and label else f"Day {day_index + 1}"
+            days.append(
+                TaskPlanDay(
+                    day_index=day_index,
+                    label=label,
+                    focus=focus if isinstance(focus, str) and focus else label,
+                    tasks=tasks[:MAX_TASKS_PER_DAY],
+                ),
+            )
+        return TaskPlanResult(
+            goal_id=goal_id,
+            plan_id=plan_id,
+            version=self._positive_int(record["version"]) or 1,
+            summary=record["summary"] or plan_meta.get("summary") or "",
+            time_horizon_days=self._positive_int(plan_meta.get("time_horizon_days")) or len(days),
+            daily_time_commitment_minutes=max(
+                self._positive_int(plan_meta.get("daily_time_commitment_minutes")) or 30,
+                5,
+            ),
+            start_date=start_date,
+            days=days,
+        )
+
+    def _decode_json_rows(self, value: Any) -> List[List[Any]]:
+        """Three-element rows of a jsonb array (text unless a codec is registered)."""
+        if isinstance(value, str):
+            value = json.loads(value)
+        if not isinstance(value, list):
+            return []
+        return [row for row in value if isinstance(row, list) and len(row) == 3]
 
     async def fetch_tasks_for_day(
         self,
@@ -331,12 +1037,15 @@ class PlanTasksService:
         day_index: int,
     ) -> TasksForDayResponse:
         """Returns ordered tasks for the selected day."""
+        return TasksForDayResponse(**await self.load_tasks_for_day(goal_id, day_index))
+
+    async def load_tasks_for_day(self, goal_id: str, day_index: int) -> Dict[str, Any]:
+        """Plain-dict form of fetch_tasks_for_day, for callers that may skip the model."""
         if day_index < 0:
             raise TaskPlanValidationError("day_index must be >= 0")
-        plan = await self._fetch_active_plan(goal_id)
-        if not plan:
+        plan_id = await resolve_active_plan_id(self._db_session, goal_id)
+        if not plan_id:
             raise ActivePlanNotFoundError("No active plan found for goal.")
-        plan_id = str(plan["id"])
         tasks_query = text(
             """
             SELECT id, description, estimated_minutes, completed_at
@@ -349,21 +1058,123 @@ class PlanTasksService:
             tasks_query,
             {"plan_id": plan_id, "day_index": day_index},
         )
-        rows = result.mappings().all()
-        return TasksForDayResponse(
-            goal_id=goal_id,
-            plan_id=plan_id,
-            day_index=day_index,
-            tasks=[
-                {
-                    "id": str(row["id"]),
-                    "description": row.get("description") or "",
-                    "estimated_minutes": row.get("estimated_minutes") or 0,
-                    "completed_at": row.get("completed_at"),
-                }
-                for row in rows
-            ],
+        return {
+            "goal_id": goal_id,
+            "plan_id": plan_id,
+            "day_index": day_index,
+            "tasks": [self._task_payload(row) for row in result.mappings()],
+        }
+
+    async def fetch_tasks_for_range(
+        self,
+        goal_id: str,
+        from_day: int,
+        to_day: int,
+    ) -> TasksForRangeResponse:
+        """Returns tasks for days from_day..to_day grouped by day, in one query."""
+        return TasksForRangeResponse(**await self.load_tasks_for_range(goal_id, from_day, to_day))
+
+    async def load_tasks_for_range(
+        self,
+        goal_id: str,
+        from_day: int,
+        to_day: int,
+    ) -> Dict[str, Any]:
+        payloads = await self.load_tasks_for_goals([goal_id], from_day, to_day)
+        if not payloads:
+            raise ActivePlanNotFoundError("No active plan found for goal.")
+        return payloads[0]
+
+    async def fetch_tasks_for_goals(
+        self,
+        goal_ids: Sequence[str],
+        from_day: int,
+        to_day: int,
+    ) -> List[TasksForRangeResponse]:
+        """Resolves every goal's active plan and loads its tasks in one round trip.
+
+        Goals without an active plan are left out of the result.
+        """
+        payloads = await self.load_tasks_for_goals(goal_ids, from_day, to_day)
+        return [TasksForRangeResponse(**payload) for payload in payloads]
+
+    async def load_tasks_for_goals(
+        self,
+        goal_ids: Sequence[str],
+        from_day: int,
+        to_day: int,
+    ) -> List[Dict[str, Any]]:
+        if from_day < 0 or to_day < from_day:
+            raise TaskPlanValidationError("Expected 0 <= from <= to.")
+        if to_day - from_day + 1 > MAX_TASK_RANGE_DAYS:
+            raise TaskPlanValidationError(
+                f"A range may cover at most {MAX_TASK_RANGE_DAYS} days.",
+            )
+        if not goal_ids:
+            return []
+        query = text(
+            """
+            WITH active_plans AS (
+                SELECT DISTINCT ON (ap.goal_id) ap.goal_id, ap.id AS plan_id
+                FROM ai_plans ap
+                JOIN goals g ON g.id = ap.goal_id
+                WHERE ap.goal_id = ANY(CAST(:goal_ids AS uuid[]))
+                ORDER BY ap.goal_id,
+                         (ap.id = g.current_plan_id) IS TRUE DESC,
+                         ap.is_active DESC,
+                         ap.version DESC,
+                         ap.created_at DESC
+            )
+            SELECT
+                p.goal_id,
+                p.plan_id,
+                t.id,
+                t.day_index,
+                t.description,
+                t.estimated_minutes,
+                t.completed_at
+            FROM active_plans p
+            LEFT JOIN tasks t
+                ON t.plan_id = p.plan_id
+               AND t.day_index BETWEEN :from_day AND :to_day
+            ORDER BY p.goal_id, t.day_index, t.order_in_day
+            """,
         )
+        result = await self._db_session.execute(
+            query,
+            {"goal_ids": list(goal_ids), "from_day": from_day, "to_day": to_day},
+        )
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for row in result.mappings():
+            goal_key = str(row["goal_id"])
+            entry = grouped.setdefault(
+                goal_key,
+                {"plan_id": str(row["plan_id"]), "days": {}},
+            )
+            if row["id"] is None:
+                continue
+            entry["days"].setdefault(row["day_index"], []).append(self._task_payload(row))
+        return [
+            {
+                "goal_id": goal_key,
+                "plan_id": entry["plan_id"],
+                "from_day": from_day,
+                "to_day": to_day,
+                "days": [
+                    {"day_index": day_index, "tasks": tasks}
+                    for day_index, tasks in entry["days"].items()
+                ],
+            }
+            for goal_key, entry in grouped.items()
+        ]
+
+    def _task_payload(self, row: Any) -> Dict[str, Any]:
+        return {
+            "id": str(row["id"]),
+            "description": row.get("description") or "",
+            "estimated_minutes": row.get("estimated_minutes") or 0,
+            "completed_at": row.get("completed_at"),
+        }
 
     def _coerce_date(self, value: Any) -> Optional[date]:
         if value is None:
@@ -396,28 +1207,6 @@ class PlanTasksService:
             last_day_index = horizon - 1
         return task_plan.start_date + timedelta(days=last_day_index)
 
-    def _normalize_task_plan(
-        self,
-        task_plan: TaskPlanResult,
-        expected_days: int,
-    ) -> TaskPlanResult:
-        """Ensures day indexes start at 0 and align with the requested horizon."""
-        if not task_plan.days:
-            return task_plan
-        sorted_days = sorted(task_plan.days, key=lambda day: day.day_index)
-        normalized_days = [
-            day.model_copy(update={"day_index": index})
-            for index, day in enumerate(sorted_days)
-        ]
-        horizon = expected_days if expected_days > 0 else len(normalized_days)
-        trimmed_days = normalized_days[:horizon]
-        return task_plan.model_copy(
-            update={
-                "days": trimmed_days,
-                "time_horizon_days": len(trimmed_days),
-            },
-        )
-
     async def _supports_extended_task_schema(self) -> bool:
         if self._tasks_extended_schema is not None:
             return self._tasks_extended_schema
@@ -0,0 +1,43 @@
+# backend/app/services/single_flight.py
+# Coalesces concurrent calls for the same key onto one in-flight coroutine.
+# Exists so retried/double-fired requests share one expensive LLM generation.
+# RELEVANT FILES:backend/app/services/plan_summary_service.py,backend/app/db/locks.py
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    The first caller for a key starts `factory` in a task owned by the flight;
+    every caller, the first included, awaits that task's outcome (result or
+    exception). No caller owns the work, so any of them disconnecting leaves
+    the shared run going for the others.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[str, "asyncio.Task[T]"] = {}
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        # Shield so a cancelled caller only stops waiting, never the shared run.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task[T]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark as retrieved so a failure nobody awaited does not warn at GC time.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,260 @@
+# backend/benchmarks/bench_api.py
+# End-to-end benchmark of the plan/task endpoints against a local Postgres and the fake LLM.
+# Exists so latency, throughput and DB round trips can be compared before and after a change.
+# RELEVANT FILES:backend/benchmarks/schema.sql,backend/app/services/fake_llm_transport.py,backend/app/main.py
+#
+# Run from backend/ against a throwaway database (the schema is dropped and recreated):
+#   DATABASE_URL=postgresql+asyncpg://postgres@localhost/bench python -m benchmarks.bench_api \
+#       --goals 50 --concurrency 10 --llm-latency 0.2
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_FILES = [Path(__file__).with_name("schema.sql")] + sorted(
+    (BACKEND_DIR / "app" / "db" / "migrations").glob("*.sql"),
+)
+
+# Statements + BEGIN/COMMIT/ROLLBACK issued while serving the current request.
+_round_trips: ContextVar[Optional[List[int]]] = ContextVar("bench_round_trips", default=None)
+
+
+@dataclass
+class PhaseResult:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    round_trips: List[int] = field(default_factory=list)
+    errors: int = 0
+    wall_seconds: float = 0.0
+
+    def row(self) -> str:
+        count = len(self.latencies)
+        throughput = count / self.wall_seconds if self.wall_seconds else 0.0
+        trips = sum(self.round_trips) / len(self.round_trips) if self.round_trips else 0.0
+        return (
+            f"{self.name:<18} {count:>6} {self.errors:>6} {throughput:>9.1f} "
+            f"{_percentile(self.latencies, 0.50):>8.1f} {_percentile(self.latencies, 0.95):>8.1f} "
+            f"{_percentile(self.latencies, 0.99):>8.1f} {trips:>9.1f}"
+        )
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile in milliseconds."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(max(int(round(fraction * len(ordered) + 0.5)) - 1, 0), len(ordered) - 1)
+    return ordered[index] * 1000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the Treespora plan/task API.")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--goals", type=int, default=20)
+    parser.add_argument("--horizon-days", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--task-reads", type=int, default=500, help="GET /tasks requests per phase.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM latency (s).")
+    parser.add_argument("--llm-jitter", type=float, default=0.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-truncate-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("Set DATABASE_URL or pass --database-url (a throwaway database).")
+    return args
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Must run before `app` is imported: Settings and the LLM client read it once."""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["LLM_FAKE"] = "true"
+    os.environ["LLM_FAKE_LATENCY_SECONDS"] = str(args.llm_latency)
+    os.environ["LLM_FAKE_LATENCY_JITTER_SECONDS"] = str(args.llm_jitter)
+    os.environ["LLM_FAKE_ERROR_RATE"] = str(args.llm_error_rate)
+    os.environ["LLM_FAKE_TRUNCATE_RATE"] = str(args.llm_truncate_rate)
+    os.environ["LLM_FAKE_SEED"] = str(args.seed)
+    os.environ.setdefault("DEEPSEEK_BASE_URL", "http://fake-llm.local")
+    os.environ.setdefault("DEEPSEEK_API_KEY", "benchmark")
+    os.environ.setdefault("DEEPSEEK_MODEL", "deepseek-chat")
+    # Jobs are enqueued as in production but not drained, so phases stay independent.
+    os.environ.setdefault("TASK_PLAN_JOB_WORKERS", "0")
+
+
+async def reset_database(goal_count: int, horizon_days: int) -> List[str]:
+    from sqlalchemy import text
+
+    from app.db.session import get_engine, open_db_session
+
+    async with get_engine().connect() as connection:
+        raw = (await connection.get_raw_connection()).driver_connection
+        for path in SCHEMA_FILES:
+            # One statement at a time: CREATE INDEX CONCURRENTLY refuses implicit transactions.
+            for statement in _split_sql(path.read_text()):
+                await raw.execute(statement)
+    goal_ids = [str(uuid4()) for _ in range(goal_count)]
+    start = date.today()
+    async with open_db_session() as session:
+        for index, goal_id in enumerate(goal_ids):
+            profile_id = str(uuid4())
+            await session.execute(
+                text("INSERT INTO profiles (id, age, language_code) VALUES (:id, :age, 'en')"),
+                {"id": profile_id, "age": 20 + index % 40},
+            )
+            await session.execute(
+                text(
+                    """
+                    INSERT INTO goals (id, user_id, title, description, start_date, target_date)
+                    VALUES (:id, :user_id, :title, :description, :start_date, :target_date)
+                    """,
+                ),
+                {
+                    "id": goal_id,
+                    "user_id": profile_id,
+                    "title": f"Benchmark goal {index + 1}",
+                    "description": "Daily time: 30–60 minutes",
+                    "start_date": start,
+                    "target_date": start + timedelta(days=horizon_days - 1),
+                },
+            )
+        await session.commit()
+    return goal_ids
+
+
+def _split_sql(script: str) -> List[str]:
+    lines = [line for line in script.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def install_round_trip_counter() -> None:
+    from sqlalchemy import event
+
+    from app.db.session import get_engine
+
+    def count(*_: Any, **__: Any) -> None:
+        counter = _round_trips.get()
+        if counter is not None:
+            counter[0] += 1
+
+    sync_engine = get_engine().sync_engine
+    for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+        event.listen(sync_engine, name, count)
+
+
+async def run_phase(
+    name: str,
+    requests: List[Callable[[], Awaitable[Any]]],
+    concurrency: int,
+) -> PhaseResult:
+    result = PhaseResult(name)
+    queue: "asyncio.Queue[Callable[[], Awaitable[Any]]]" = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def worker() -> None:
+        while not queue.empty():
+            request = queue.get_nowait()
+            counter = [0]
+            token = _round_trips.set(counter)
+            started = time.perf_counter()
+            try:
+                response = await request()
+                if response.status_code >= 400:
+                    result.errors += 1
+            except Exception:
+                result.errors += 1
+            finally:
+                _round_trips.reset(token)
+            result.latencies.append(time.perf_counter() - started)
+            result.round_trips.append(counter[0])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    result.wall_seconds = time.perf_counter() - started
+    return result
+
+
+async def main(args: argparse.Namespace) -> None:
+    import httpx
+
+    from app.main import app
+    from app.services.llm_client import get_llm_client
+
+    goal_ids = await reset_database(args.goals, args.horizon_days)
+    install_round_trip_counter()
+    rng = random.Random(args.seed)
+    etags: Dict[str, str] = {}
+    results: List[PhaseResult] = []
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            def summary(goal_id: str, conditional: bool = False) -> Callable[[], Awaitable[Any]]:
+                async def call() -> Any:
+                    headers = {"If-None-Match": etags[goal_id]} if conditional and goal_id in etags else {}
+                    response = await client.get(f"/v1/goals/{goal_id}/plan/summary", headers=headers)
+                    if "etag" in response.headers:
+                        etags[goal_id] = response.headers["etag"]
+                    return response
+
+                return call
+
+            def task_plan(goal_id: str) -> Callable[[], Awaitable[Any]]:
+                return lambda: client.post(f"/v1/goals/{goal_id}/task_plan")
+
+            def tasks(params: Dict[str, Any], conditional: bool = False) -> Callable[[], Awaitable[Any]]:
+                goal_id = rng.choice(goal_ids)
+                key = f"{goal_id}:{sorted(params.items())}"
+
+                async def call() -> Any:
+                    headers = {"If-None-Match": etags[key]} if conditional and key in etags else {}
+                    response = await client.get(f"/v1/goals/{goal_id}/tasks", params=params, headers=headers)
+                    if "etag" in response.headers:
+                        etags[key] = response.headers["etag"]
+                    return response
+
+                return call
+
+            day_params = [{"day_index": rng.randrange(args.horizon_days)} for _ in range(args.task_reads)]
+            range_params = [{"from": 0, "to": 6} for _ in range(args.task_reads)]
+            phases = [
+                ("summary cold", [summary(goal_id) for goal_id in goal_ids]),
+                ("summary warm", [summary(goal_id) for goal_id in goal_ids]),
+                ("summary 304", [summary(goal_id, conditional=True) for goal_id in goal_ids]),
+                ("task_plan", [task_plan(goal_id) for goal_id in goal_ids]),
+                ("tasks day", [tasks(params) for params in day_params]),
+                ("tasks range", [tasks(params) for params in range_params]),
+            ]
+            for name, requests in phases:
+                results.append(await run_phase(name, requests, args.concurrency))
+
+    print(
+        f"goals={args.goals} horizon={args.horizon_days}d concurrency={args.concurrency} "
+        f"llm_latency={args.llm_latency}s",
+    )
+    print(f"{'phase':<18} {'reqs':>6} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'db trips':>9}")
+    for result in results:
+        print(result.row())
+    for kind, usage in get_llm_client().usage_stats().items():
+        print(
+            f"llm {kind}: {usage['calls']} calls, {usage['prompt_tokens']} prompt tokens, "
+            f"prompt cache hit ratio {usage['prompt_cache_hit_ratio']}",
+        )
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment(arguments)
+    asyncio.run(main(arguments))
@@ -0,0 +1,120 @@
+# backend/benchmarks/bench_json.py
+# Times the JSON paths used for a 90-day task plan: plan_json writes and API bodies.
+# Exists to back the model_dump_json switch (and keeping FastAPI's default response class) with numbers.
+# RELEVANT FILES:backend/app/main.py,backend/app/services/plan_tasks_service.py,backend/app/schemas/plan_tasks.py
+#
+# Run from backend/:  python -m benchmarks.bench_json [--days 90] [--rounds 200]
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import time
+from datetime import date
+from typing import Callable, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+from app.schemas.plan_tasks import TaskPlanDay, TaskPlanResult, TaskPlanTask
+
+
+def orjson_available() -> bool:
+    return importlib.util.find_spec("orjson") is not None
+
+
+def build_task_plan(days: int, tasks_per_day: int = 3) -> TaskPlanResult:
+    return TaskPlanResult(
+        goal_id="00000000-0000-0000-0000-000000000001",
+        plan_id="00000000-0000-0000-0000-000000000002",
+        version=1,
+        summary="Learn conversational Spanish in three months. " * 4,
+        time_horizon_days=days,
+        daily_time_commitment_minutes=45,
+        start_date=date(2025, 1, 1),
+        days=[
+            TaskPlanDay(
+                day_index=day_index,
+                label=f"Day {day_index + 1}",
+                focus="Listening and speaking practice around everyday situations.",
+                tasks=[
+                    TaskPlanTask(
+                        description=(
+                            f"Day {day_index} task {task_index}: review vocabulary, "
+                            "shadow a short dialogue and write five example sentences."
+                        ),
+                        estimated_minutes=10 + task_index,
+                    )
+                    for task_index in range(tasks_per_day)
+                ],
+            )
+            for day_index in range(days)
+        ],
+    )
+
+
+def measure(label: str, func: Callable[[], object], rounds: int) -> Tuple[str, float, int]:
+    func()  # warm-up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        output = func()
+    elapsed = (time.perf_counter() - started) / rounds
+    size = len(output) if isinstance(output, (bytes, str)) else 0
+    return label, elapsed * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    plan = build_task_plan(args.days)
+    adapter = TypeAdapter(TaskPlanResult)
+    results: List[Tuple[str, float, int]] = [
+        measure(
+            "plan_json: json.dumps(model_dump(mode='json'))  [before]",
+            lambda: json.dumps(plan.model_dump(mode="json")),
+            args.rounds,
+        ),
+        measure(
+            "plan_json: model_dump_json()                    [after]",
+            plan.model_dump_json,
+            args.rounds,
+        ),
+        measure(
+            "response: JSONResponse(jsonable_encoder(...))   [before]",
+            lambda: JSONResponse(jsonable_encoder(plan)).body,
+            args.rounds,
+        ),
+    ]
+    # What FastAPI itself does for endpoints with a response model / return type.
+    results.append(
+        measure(
+            "response: TypeAdapter.dump_json(...)            [after]",
+            lambda: Response(adapter.dump_json(plan), media_type="application/json").body,
+            args.rounds,
+        ),
+    )
+    if orjson_available():
+        # For reference: as a default_response_class, ORJSONResponse sends every
+        # body through jsonable_encoder first and skips the native path above.
+        results.append(
+            measure(
+                "response: ORJSONResponse(jsonable_encoder(...)) [rejected]",
+                lambda: ORJSONResponse(jsonable_encoder(plan)).body,
+                args.rounds,
+            ),
+        )
+    print(
+        f"{args.days}-day plan, {args.rounds} rounds, "
+        f"orjson={'yes' if orjson_available() else 'no'}",
+    )
+    for label, millis, size in results:
+        print(f"  {label:<62} {millis:8.3f} ms  {size:>8} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# backend/benchmarks/bench_validation.py
+# Times turning a raw task-plan completion into the persisted plan_json, old pipeline vs single pass.
+# Exists to back the model_validate_json + validation-context switch with CPU and allocation numbers.
+# RELEVANT FILES:backend/app/schemas/plan_tasks.py,backend/app/services/llm_client.py,backend/benchmarks/bench_json.py
+#
+# Run from backend/:  python -m benchmarks.bench_validation [--days 30 90 365] [--rounds 100]
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from app.schemas.plan_tasks import TaskPlanResult, llm_output_context
+from benchmarks.bench_json import build_task_plan
+
+
+def completion_content(days: int) -> str:
+    """A completion as the LLM sends it: unsorted days, some out-of-range durations."""
+    payload = build_task_plan(days).model_dump(mode="json")
+    payload["days"].reverse()
+    for index, day in enumerate(payload["days"]):
+        day["tasks"][0]["estimated_minutes"] = 90 if index % 2 else 2
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def before(content: str, expected_days: int) -> str:
+    """json.loads -> dict normalisation -> TaskPlanResult(**) -> model_copy per day -> dump."""
+    payload = json.loads(content)
+    days = []
+    for day in payload["days"]:
+        tasks = []
+        for task in day["tasks"]:
+            minutes = task.get("estimated_minutes")
+            if isinstance(minutes, bool) or not isinstance(minutes, (int, float)):
+                minutes = 5
+            tasks.append({**task, "estimated_minutes": min(60, max(5, int(minutes)))})
+        days.append({**day, "tasks": tasks})
+    plan = TaskPlanResult(**{**payload, "days": days})
+    ordered = sorted(plan.days, key=lambda day: day.day_index)
+    renumbered = [day.model_copy(update={"day_index": index}) for index, day in enumerate(ordered)]
+    trimmed = renumbered[:expected_days]
+    plan = plan.model_copy(update={"days": trimmed, "time_horizon_days": len(trimmed)})
+    return plan.model_dump_json()
+
+
+def after(content: str, expected_days: int) -> str:
+    plan = TaskPlanResult.model_validate_json(content, context=llm_output_context(expected_days))
+    return plan.model_dump_json()
+
+
+def measure(func: Callable[[], str], rounds: int) -> Tuple[float, float, int]:
+    """(wall ms, CPU ms, peak traced KiB) per round; tracing runs separately from timing."""
+    func()  # warm-up
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    for _ in range(rounds):
+        func()
+    wall = (time.perf_counter() - wall_started) / rounds
+    cpu = (time.process_time() - cpu_started) / rounds
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wall * 1000, cpu * 1000, peak // 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 90, 365])
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{args.rounds} rounds per case")
+    print(f"  {'case':<34} {'wall ms':>9} {'cpu ms':>9} {'peak KiB':>9}")
+    for days in args.days:
+        content = completion_content(days)
+        assert json.loads(before(content, days)) == json.loads(after(content, days))
+        rows: List[Tuple[str, Tuple[float, float, int]]] = [
+            (f"{days}-day plan [before]", measure(lambda: before(content, days), args.rounds)),
+            (f"{days}-day plan [after]", measure(lambda: after(content, days), args.rounds)),
+        ]
+        for label, (wall, cpu, peak) in rows:
+            print(f"  {label:<34} {wall:9.3f} {cpu:9.3f} {peak:9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+-- backend/benchmarks/schema.sql
+-- Minimal local copy of the Supabase tables the backend reads and writes.
+-- bench_api.py loads it (then app/db/migrations/*.sql) into a throwaway Postgres database.
+-- RELEVANT FILES:backend/benchmarks/bench_api.py,backend/app/db/goal_context.py,backend/app/services/plan_tasks_service.py
+
+DROP TABLE IF EXISTS tasks, ai_plans, goals, profiles, task_plan_jobs, llm_response_cache CASCADE;
+
+CREATE TABLE profiles (
+    id uuid PRIMARY KEY,
+    age integer,
+    language_code text
+);
+
+CREATE TABLE goals (
+    id uuid PRIMARY KEY,
+    user_id uuid REFERENCES profiles(id),
+    title text NOT NULL,
+    description text,
+    category text,
+    start_date date,
+    target_date date,
+    current_plan_id uuid,
+    created_at timestamptz NOT NULL DEFAULT NOW(),
+    updated_at timestamptz NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE ai_plans (
+    id uuid PRIMARY KEY,
+    goal_id uuid NOT NULL REFERENCES goals(id) ON DELETE CASCADE,
+    version integer NOT NULL DEFAULT 1,
+    model_name text,
+    plan_json jsonb,
+    summary text,
+    target_date date,
+    is_active boolean NOT NULL DEFAULT true,
+    created_at timestamptz NOT NULL DEFAULT NOW(),
+    updated_at timestamptz NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE tasks (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    goal_id uuid REFERENCES goals(id) ON DELETE CASCADE,
+    plan_id uuid REFERENCES ai_plans(id) ON DELETE CASCADE,
+    day_index integer NOT NULL,
+    order_in_day integer NOT NULL,
+    description text NOT NULL,
+    estimated_minutes integer,
+    planned_date date,
+    task_type text,
+    status text,
+    completed_at timestamptz,
+    created_at timestamptz NOT NULL DEFAULT NOW(),
+    updated_at timestamptz NOT NULL DEFAULT NOW()
+);
@@ -4,6 +4,7 @@
 // RELEVANT FILES:lib/app/features/tasks/models/daily_task.dart,lib/app/features/tasks/presentation/widgets/task_section.dart,lib/app/features/home/presentation/screens/journey_goal_tab.dart
 
 import 'dart:convert';
+import 'dart:typed_data';
 
 import 'package:http/http.dart' as http;
 import 'package:treespora/app/core/config/app_config.dart';
@@ -31,6 +32,8 @@ class TaskApiClient {
 
   final String _baseUrl;
   final http.Client _client;
+  // Last 200 body per URL, replayed when the backend answers 304 Not Modified.
+  final Map<Uri, _CachedBody> _etagCache = {};
 
   bool get isConfigured => _baseUrl.isNotEmpty;
 
@@ -48,8 +51,43 @@ class TaskApiClient {
     );
   }
 
-  Uri _taskPlanUri(String goalId) {
-    return _buildUri('/v1/goals/$goalId/task_plan');
+  Uri _tasksRangeUri(String goalId, int fromDay, int toDay) {
+    return _buildUri('/v1/goals/$goalId/tasks').replace(
+      queryParameters: {
+        'from': fromDay.toString(),
+        'to': toDay.toString(),
+      },
+    );
+  }
+
+  Uri _taskPlanUri(String goalId, {int? fromDay}) {
+    final uri = _buildUri('/v1/goals/$goalId/task_plan');
+    if (fromDay == null) {
+      return uri;
+    }
+    return uri.replace(queryParameters: {'from_day': fromDay.toString()});
+  }
+
+  /// GET with If-None-Match; a 304 is turned back into the cached 200 response.
+  ///
+  /// The raw bytes and the original 200 headers are replayed, so the body is
+  /// decoded with the same charset (UTF-8) as the first response.
+  Future<http.Response> _getRevalidated(Uri uri) async {
+    final cached = _etagCache[uri];
+    final response = await _client.get(
+      uri,
+      headers: cached == null ? null : {'If-None-Match': cached.etag},
+    );
+    if (response.statusCode == 304 && cached != null) {
+      return http.Response.bytes(cached.bodyBytes, 200, headers: cached.headers);
+    }
+    final etag = response.headers['etag'];
+    if (response.statusCode == 200 && etag != null) {
+      _etagCache[uri] = _CachedBody(etag, response.bodyBytes, response.headers);
+    } else {
+      _etagCache.remove(uri);
+    }
+    return response;
   }
 
   Future<TasksForDayResponse> fetchTasksForDay({
@@ -62,7 +100,7 @@ class TaskApiClient {
       );
     }
     final uri = _tasksUri(goalId, dayIndex);
-    final response = await _client.get(uri);
+    final response = await _getRevalidated(uri);
     if (response.statusCode != 200) {
       if (response.statusCode == 404) {
         throw const TaskPlanPendingException(
@@ -77,13 +115,42 @@ class TaskApiClient {
     return TasksForDayResponse.fromJson(payload);
   }
 
-  Future<void> generateTaskPlan({required String goalId}) async {
+  /// Loads every day in [fromDay]..[toDay] (inclusive) with a single request.
+  Future<TasksForRangeResponse> fetchTasksForRange({
+    required String goalId,
+    required int fromDay,
+    required int toDay,
+  }) async {
+    if (!isConfigured) {
+      throw const TaskApiException(
+        'API base URL missing. Provide API_BASE_URL via --dart-define.',
+      );
+    }
+    final uri = _tasksRangeUri(goalId, fromDay, toDay);
+    final response = await _getRevalidated(uri);
+    if (response.statusCode != 200) {
+      if (response.statusCode == 404) {
+        throw const TaskPlanPendingException(
+          'Tasks are not ready yet for this plan.',
+        );
+      }
+      throw TaskApiException(
+        'Failed to load tasks (status ${response.statusCode}).',
+      );
+    }
+    final payload = jsonDecode(response.body) as Map<String, dynamic>;
+    return TasksForRangeResponse.fromJson(payload);
+  }
+
+  /// Generates the goal's tasks. With [fromDay], days before it and completed
+  /// tasks are kept and only the rest of the plan is regenerated.
+  Future<void> generateTaskPlan({required String goalId, int? fromDay}) async {
     if (!isConfigured) {
       throw const TaskApiException(
         'API base URL missing. Provide API_BASE_URL via --dart-define.',
       );
     }
-    final uri = _taskPlanUri(goalId);
+    final uri = _taskPlanUri(goalId, fromDay: fromDay);
     final response = await _client.post(uri);
     if (response.statusCode != 200) {
       throw TaskApiException(
@@ -92,3 +159,10 @@ class TaskApiClient {
     }
   }
 }
+
+class _CachedBody {
+  const _CachedBody(this.etag, this.bodyBytes, this.headers);
+  final String etag;
+  final Uint8List bodyBytes;
+  final Map<String, String> headers;
+}
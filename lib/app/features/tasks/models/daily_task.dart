@@ -51,3 +51,41 @@ class TasksForDayResponse {
     );
   }
 }
+
+class TasksForRangeResponse {
+  const TasksForRangeResponse({
+    required this.goalId,
+    required this.fromDay,
+    required this.toDay,
+    required this.days,
+  });
+
+  final String goalId;
+  final int fromDay;
+  final int toDay;
+  final List<TasksForDayResponse> days;
+
+  /// Tasks for [dayIndex]; days the backend omitted simply have no tasks.
+  TasksForDayResponse dayAt(int dayIndex) {
+    for (final day in days) {
+      if (day.dayIndex == dayIndex) {
+        return day;
+      }
+    }
+    return TasksForDayResponse(goalId: goalId, dayIndex: dayIndex, tasks: const []);
+  }
+
+  factory TasksForRangeResponse.fromJson(Map<String, dynamic> json) {
+    final goalId = json['goal_id'] as String? ?? '';
+    final daysJson = json['days'] as List<dynamic>? ?? const [];
+    return TasksForRangeResponse(
+      goalId: goalId,
+      fromDay: (json['from_day'] as int?) ?? 0,
+      toDay: (json['to_day'] as int?) ?? 0,
+      days: daysJson
+          .whereType<Map<String, dynamic>>()
+          .map((day) => TasksForDayResponse.fromJson({...day, 'goal_id': goalId}))
+          .toList(),
+    );
+  }
+}